@@ -0,0 +1,288 @@
+"""Benchmark cases for the per-frame hot path and the controller backends."""
+
+import importlib.util
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Iterator, List, Optional
+
+import numpy as np
+
+from src.controllers.brightness_controller import BrightnessController
+from src.controllers.volume_controller import VolumeController
+from src.core.frame_preparer import MIRROR_LANDMARKS, MIRROR_PIXELS, FramePreparer
+from src.core.hand_tracker import Hand
+from src.core.landmark_recording import LandmarkRecording
+from src.filters.smoothing import ExponentialMovingAverage, KalmanFilter, OneEuroFilter
+from src.gestures.claw_detector import ClawDetector
+from src.gestures.features import (FINGERTIPS, INDEX_MCP, MIDDLE_MCP, PINKY_MCP, FeatureExtractor,
+                                   extract_features, stack_hands)
+from src.gestures.registry import build_default_registry
+from src.gestures.rotation_calculator import RotationCalculator
+from src.ui.renderer import Renderer
+from src.utils.config import GestureConfig
+from src.utils.geometry import distance_3d, landmark_to_array, landmarks_to_array
+
+FAKES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fakes')
+
+RENDER_RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+SYNTHETIC_FRAMES = 256
+SYNTHETIC_SEED = 0
+
+FAKE_MAX_BRIGHTNESS = 1000
+
+# The 6 unique non-thumb fingertip pairs (per-hand reference path)
+_SPREAD_ROWS, _SPREAD_COLS = np.triu_indices(len(FINGERTIPS), k=1)
+
+
+@dataclass
+class Case:
+    """One benchmark: a name and a zero-argument operation."""
+    name: str
+    func: Callable[[], object]
+
+
+class FrameCycler:
+    """Hands one frame's hands at a time, cycling through the input."""
+
+    def __init__(self, frames: List[List[Hand]]):
+        self._frames = frames
+        self._index = 0
+
+    def next(self) -> List[Hand]:
+        hands = self._frames[self._index]
+        self._index = (self._index + 1) % len(self._frames)
+        return hands
+
+
+def synthetic_frames(count: int = SYNTHETIC_FRAMES, seed: int = SYNTHETIC_SEED) -> List[List[Hand]]:
+    """Two jittered hands per frame, alternating between open and claw poses."""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, size=(21, 3)).astype(np.float32)
+    base[:, 2] *= 0.1
+    claw = base.copy()
+    claw[[4, 8, 12, 16, 20]] = base[9] + rng.normal(0, 0.02, size=(5, 3)).astype(np.float32)
+
+    frames = []
+    for idx in range(count):
+        pose = claw if (idx // 32) % 2 else base
+        hands = []
+        for handedness, shift in (('Right', 0.0), ('Left', 0.3)):
+            points = pose + rng.normal(0, 0.003, size=pose.shape).astype(np.float32)
+            points[:, 0] = np.clip(points[:, 0] + shift - 0.15, 0, 1)
+            hands.append(Hand(points=points, handedness=handedness, confidence=0.95))
+        frames.append(hands)
+    return frames
+
+
+def recorded_frames(path: str) -> List[List[Hand]]:
+    """All frames of a landmark recording that contain at least one hand."""
+    recording = LandmarkRecording(path)
+    frames = [recording.hands(idx) for idx in range(len(recording))]
+    frames = [hands for hands in frames if hands]
+    if not frames:
+        raise ValueError(f"Recording has no hands: {path}")
+    return frames
+
+
+def gesture_cases(frames: List[List[Hand]]) -> Iterator[Case]:
+    """Per-hand detectors, feature extraction and geometry helpers."""
+    hands = FrameCycler([[hand] for frame in frames for hand in frame])
+    batches = FrameCycler(frames)
+    config = GestureConfig()
+
+    detector = ClawDetector(config.max_fingertip_spread, config.max_palm_distance,
+                            config.min_fingers_close)
+    yield Case('claw_detector.detect', lambda: detector.detect(hands.next()[0]))
+
+    rotation = RotationCalculator()
+    yield Case('rotation.calculate_roll', lambda: rotation.calculate_roll(hands.next()[0]))
+
+    yield Case('features.extract_features',
+               lambda: extract_features(stack_hands(batches.next())))
+    yield from feature_path_cases(frames)
+
+    evaluator = build_default_registry(config).compile()
+    extractor = FeatureExtractor(evaluator.fields)
+    state = {'active': evaluator.initial_state(0)}
+
+    def evaluate_frame():
+        matrix = evaluator.feature_matrix(extractor(stack_hands(batches.next())))
+        previous = state['active']
+        if previous.shape[0] != matrix.shape[0]:
+            previous = evaluator.initial_state(matrix.shape[0])
+        state['active'] = evaluator.evaluate(matrix, previous)
+
+    yield Case('registry.evaluate_frame', evaluate_frame)
+
+    points = frames[0][0].points
+    yield Case('geometry.distance_3d', lambda: distance_3d(points[4], points[8]))
+
+    landmarks = [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points]
+    yield Case('geometry.landmark_to_array', lambda: landmark_to_array(landmarks[8]))
+    yield Case('geometry.landmarks_to_array', lambda: landmarks_to_array(landmarks))
+
+
+def per_hand_claw_roll(hands: List[Hand]) -> list:
+    """
+    The per-hand path batching replaced: claw quantities and raw roll, one hand at a time.
+
+    Kept as the reference the batched extractor is measured against.
+    """
+    results = []
+    for hand in hands:
+        points = hand.points
+        fingertips = points[FINGERTIPS]
+        diff = fingertips[:, np.newaxis, :] - fingertips[np.newaxis, :, :]
+        spread = float(np.linalg.norm(diff, axis=-1)[_SPREAD_ROWS, _SPREAD_COLS].mean())
+        palm_distances = np.linalg.norm(fingertips - points[MIDDLE_MCP], axis=-1)
+        across = points[INDEX_MCP] - points[PINKY_MCP]
+        roll = float(np.degrees(np.arctan2(across[1], across[0])))
+        results.append((spread, palm_distances, roll))
+    return results
+
+
+def feature_path_cases(frames: List[List[Hand]]) -> Iterator[Case]:
+    """Per-hand against batched extraction of the same features at 1 and 2 hands."""
+    extractor = FeatureExtractor(('fingertip_spread', 'palm_distances', 'roll'))
+    for count in (1, 2):
+        batches = [frame[:count] for frame in frames if len(frame) >= count]
+        if not batches:
+            continue  # Recording never shows this many hands
+        per_hand = FrameCycler(batches)
+        batched = FrameCycler(batches)
+        yield Case(f'features.per_hand_{count}',
+                   lambda per_hand=per_hand: per_hand_claw_roll(per_hand.next()))
+        yield Case(f'features.batched_{count}',
+                   lambda batched=batched: extractor(stack_hands(batched.next())))
+
+
+def filter_cases() -> Iterator[Case]:
+    """Smoothing filters on a scalar axis and on a full (21, 3) landmark set."""
+    rng = np.random.default_rng(SYNTHETIC_SEED)
+    values = rng.normal(0, 30, size=1024)
+    points = rng.random((64, 21, 3), dtype=np.float32)
+
+    def stepper(filter_obj, samples):
+        step = {'i': 0}
+
+        def run():
+            i = step['i']
+            step['i'] = i + 1
+            return filter_obj.update(samples[i % len(samples)], i / 30.0)
+        return run
+
+    yield Case('filter.ema_scalar', stepper(ExponentialMovingAverage(0.3), values))
+    yield Case('filter.one_euro_scalar', stepper(OneEuroFilter(), values))
+    yield Case('filter.kalman_scalar', stepper(KalmanFilter(), values))
+    yield Case('filter.ema_landmarks', stepper(ExponentialMovingAverage(0.5), points))
+    yield Case('filter.one_euro_landmarks', stepper(OneEuroFilter(beta=20.0), points))
+    yield Case('filter.kalman_landmarks',
+               stepper(KalmanFilter(10.0, 1e-5), points))
+
+
+def render_cases(frames: List[List[Hand]]) -> Iterator[Case]:
+    """Full overlay rendering at several resolutions."""
+    renderer = Renderer()
+    batches = FrameCycler(frames)
+    hand_states = {0: {'is_claw': True, 'rotation': 12.5}, 1: {'is_claw': False}}
+
+    for width, height in RENDER_RESOLUTIONS:
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        yield Case(
+            f'renderer.render_frame_{width}x{height}',
+            lambda frame=frame: renderer.render_frame(
+                frame, batches.next(), hand_states, 50, 75, 30.0
+            )
+        )
+
+
+def prepare_cases() -> Iterator[Case]:
+    """Colour conversion and mirroring of a camera frame, headless and rendered."""
+    for width, height in RENDER_RESOLUTIONS:
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        for mirror in (MIRROR_PIXELS, MIRROR_LANDMARKS):
+            for display in (False, True):
+                preparer = FramePreparer(mirror, display=display)
+                suffix = '_display' if display else ''
+                yield Case(f'prepare.{mirror}{suffix}_{width}x{height}',
+                           lambda preparer=preparer, frame=frame: preparer.prepare(frame))
+
+
+class FakeSystem:
+    """
+    Temporary fake pactl/brightnessctl on PATH and a fake sysfs backlight.
+
+    Used as a context manager; restores PATH and removes its files on exit.
+    """
+
+    def __init__(self):
+        self.state_dir = ''
+        self.sysfs_root = ''
+        self.controllers = []  # Closed on exit
+        self._saved_env = {}
+
+    def __enter__(self) -> 'FakeSystem':
+        self.state_dir = tempfile.mkdtemp(prefix='handctl-bench-')
+        self.sysfs_root = os.path.join(self.state_dir, 'backlight')
+        device_dir = os.path.join(self.sysfs_root, 'fake_backlight')
+        os.makedirs(device_dir)
+        for name, value in (('max_brightness', FAKE_MAX_BRIGHTNESS),
+                            ('brightness', FAKE_MAX_BRIGHTNESS // 2),
+                            ('actual_brightness', FAKE_MAX_BRIGHTNESS // 2)):
+            with open(os.path.join(device_dir, name), 'w') as f:
+                f.write(f"{value}\n")
+
+        for key in ('PATH', 'FAKE_STATE_DIR'):
+            self._saved_env[key] = os.environ.get(key)
+        os.environ['PATH'] = FAKES_DIR + os.pathsep + os.environ.get('PATH', '')
+        os.environ['FAKE_STATE_DIR'] = self.state_dir
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for controller in self.controllers:
+            controller.close()
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+
+def controller_cases(fake: FakeSystem) -> Iterator[Case]:
+    """get/set for every controller backend against the fakes."""
+    controllers = [
+        ('volume.pactl', VolumeController(backend='pactl')),
+        ('brightness.brightnessctl',
+         BrightnessController(backend='brightnessctl', sysfs_root=fake.sysfs_root)),
+        ('brightness.sysfs', BrightnessController(backend='sysfs', sysfs_root=fake.sysfs_root)),
+    ]
+    if importlib.util.find_spec('pulsectl') is not None:
+        try:
+            controllers.append(('volume.native', VolumeController(backend='native')))
+        except RuntimeError:
+            pass  # No sound server to talk to
+
+    for name, controller in controllers:
+        fake.controllers.append(controller)
+        levels = {'i': 0}
+
+        def set_level(controller=controller, levels=levels):
+            levels['i'] += 1
+            controller.set_level(20 + levels['i'] % 60)
+
+        yield Case(f'{name}.get_level', controller.get_level)
+        yield Case(f'{name}.set_level', set_level)
+
+
+def all_cases(recording: Optional[str], fake: FakeSystem) -> Iterator[Case]:
+    """Every benchmark, with landmarks from a recording or synthetic hands."""
+    frames = recorded_frames(recording) if recording else synthetic_frames()
+    yield from gesture_cases(frames)
+    yield from filter_cases()
+    yield from render_cases(frames)
+    yield from prepare_cases()
+    yield from controller_cases(fake)
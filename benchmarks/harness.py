@@ -0,0 +1,141 @@
+"""Timing, allocation tracking and baseline comparison for benchmarks."""
+
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Timing configuration
+DEFAULT_MIN_TIME_S = 0.2   # Per timing round
+DEFAULT_ROUNDS = 5         # Best round is reported
+ALLOCATION_CALLS = 20      # Calls traced by tracemalloc (slow, so few)
+
+DEFAULT_TOLERANCE = 0.25   # Allowed slowdown against the baseline
+
+
+@dataclass
+class BenchResult:
+    """Measurements for one benchmark."""
+    name: str
+    calls: int               # Calls in the best round
+    us_per_call: float       # Best round's mean time per call
+    peak_bytes: float        # Mean transient memory high-water mark per call
+    retained_blocks: float   # Memory blocks left allocated per call
+
+
+def _calibrate(func: Callable[[], object], min_time_s: float) -> int:
+    """Find a call count that takes at least min_time_s."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time_s:
+            return number
+        number *= 2
+
+
+def _measure_allocations(func: Callable[[], object]) -> Tuple[float, float]:
+    """
+    Peak transient memory and retained memory blocks per call.
+
+    The peak is the high-water mark above the starting point during one
+    call, so it includes temporaries that are freed before returning.
+    Retained blocks are those still allocated after the calls, which
+    exposes caches or buffers that grow per call.
+    """
+    func()  # One-time allocations (lazy buffers, caches) are not counted
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        peak_total = 0
+        for _ in range(ALLOCATION_CALLS):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - current
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    retained = sum(stat.count_diff for stat in after.compare_to(before, 'lineno'))
+    return peak_total / ALLOCATION_CALLS, max(0, retained) / ALLOCATION_CALLS
+
+
+def run_benchmark(name: str, func: Callable[[], object],
+                  min_time_s: float = DEFAULT_MIN_TIME_S,
+                  rounds: int = DEFAULT_ROUNDS,
+                  track_allocations: bool = True) -> BenchResult:
+    """
+    Time one operation.
+
+    Args:
+        name: Benchmark name
+        func: Performs one operation per call
+        min_time_s: Minimum duration of each timing round
+        rounds: Timing rounds; the fastest is kept to reduce noise
+        track_allocations: Also measure allocations with tracemalloc
+
+    Returns:
+        The benchmark result
+    """
+    number = _calibrate(func, min_time_s)
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    peak_bytes, retained_blocks = 0.0, 0.0
+    if track_allocations:
+        peak_bytes, retained_blocks = _measure_allocations(func)
+
+    return BenchResult(name, number, best * 1e6, peak_bytes, retained_blocks)
+
+
+def load_baseline(path: str) -> Dict[str, BenchResult]:
+    """Read stored results keyed by name (empty if the file does not exist)."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {entry['name']: BenchResult(**entry) for entry in data['results']}
+
+
+def save_baseline(path: str, results: List[BenchResult]) -> None:
+    """Store results as the new baseline."""
+    with open(path, 'w') as f:
+        json.dump({'results': [asdict(result) for result in results]}, f, indent=2)
+        f.write('\n')
+
+
+def format_results(results: List[BenchResult],
+                   baseline: Optional[Dict[str, BenchResult]] = None,
+                   tolerance: float = DEFAULT_TOLERANCE) -> Tuple[str, List[str]]:
+    """
+    Render a results table, comparing against a baseline when given.
+
+    Returns:
+        (table text, names of benchmarks slower than tolerance allows)
+    """
+    baseline = baseline or {}
+    width = max([len(result.name) for result in results] + [9])
+    lines = [f"{'benchmark':<{width}}  {'us/call':>10}  {'peak B':>10}  "
+             f"{'retained':>8}  {'vs base':>8}"]
+    regressions = []
+    for result in results:
+        change = ""
+        base = baseline.get(result.name)
+        if base is not None and base.us_per_call > 0:
+            ratio = result.us_per_call / base.us_per_call
+            change = f"{ratio - 1:+.0%}"
+            if ratio > 1 + tolerance:
+                change += " !"
+                regressions.append(result.name)
+        lines.append(f"{result.name:<{width}}  {result.us_per_call:>10.2f}  "
+                     f"{result.peak_bytes:>10.0f}  {result.retained_blocks:>8.1f}  {change:>8}")
+    return "\n".join(lines), regressions
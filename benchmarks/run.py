@@ -0,0 +1,101 @@
+"""
+Run the benchmark suite and compare against the stored baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.run                    # all benchmarks vs baseline
+    python -m benchmarks.run --check            # fail on regressions against the baseline
+    python -m benchmarks.run -k filter          # only names containing "filter"
+    python -m benchmarks.run --recording s.lmk  # landmarks from a recording
+    python -m benchmarks.run --save-baseline    # store results as the new baseline
+    python -m benchmarks.run --sweep clip.mp4   # inference width vs claw stability
+
+The comparison is informational by default. With --check, exits non-zero
+if any benchmark is slower than the baseline by more than the tolerance.
+Baselines are machine-specific, so only check against one saved on the
+machine that does the comparison.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from benchmarks.cases import FakeSystem, all_cases
+from benchmarks.harness import (DEFAULT_MIN_TIME_S, DEFAULT_TOLERANCE, format_results,
+                                load_baseline, run_benchmark, save_baseline)
+from benchmarks.sweep import DEFAULT_SWEEP_WIDTHS, format_sweep, run_sweep
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="LinuxHandController benchmarks")
+    parser.add_argument('-k', '--filter', default='',
+                        help='only run benchmarks whose name contains this string')
+    parser.add_argument('--recording', metavar='PATH',
+                        help='landmark recording to use instead of synthetic hands')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='baseline JSON file (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write the results to the baseline file')
+    parser.add_argument('--check', action='store_true',
+                        help='exit non-zero on regressions against the baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed slowdown before failing (default: %(default)s)')
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME_S,
+                        help='seconds per timing round (default: %(default)s)')
+    parser.add_argument('--no-alloc', action='store_true',
+                        help='skip tracemalloc allocation measurements')
+    parser.add_argument('--sweep', metavar='CLIP',
+                        help='instead of the suite, sweep inference widths over a video clip')
+    parser.add_argument('--widths', type=int, nargs='+', default=list(DEFAULT_SWEEP_WIDTHS),
+                        help='inference widths for --sweep (default: %(default)s)')
+    parser.add_argument('--model', default='hand_landmarker.task',
+                        help='landmarker model for --sweep (default: %(default)s)')
+    parser.add_argument('--max-frames', type=int,
+                        help='only use the first N frames of the --sweep clip')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    # Controller errors against the fakes would otherwise flood the output
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.sweep:
+        print(format_sweep(run_sweep(args.sweep, args.model, args.widths, args.max_frames)))
+        return 0
+
+    results = []
+    with FakeSystem() as fake:
+        for case in all_cases(args.recording, fake):
+            if args.filter not in case.name:
+                continue
+            result = run_benchmark(case.name, case.func, args.min_time,
+                                   track_allocations=not args.no_alloc)
+            print(f"  {case.name}: {result.us_per_call:.2f} us", file=sys.stderr)
+            results.append(result)
+
+    if not results:
+        print("No benchmarks matched", file=sys.stderr)
+        return 1
+
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+    table, regressions = format_results(results, baseline, args.tolerance)
+    print(table)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+    if regressions:
+        print(f"Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
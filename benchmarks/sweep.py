@@ -0,0 +1,150 @@
+"""
+Inference resolution sweep: landmarker latency against claw-detection stability.
+
+Runs the hand landmarker over a recorded video clip once per inference
+width. Latency covers frame preparation (downscale, colour conversion,
+mirror) plus inference. Stability is measured by how often the claw state
+of a tracked hand flips, and by agreement with the full-resolution run.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.frame_preparer import MIRROR_PIXELS, FramePreparer
+from src.core.hand_id_tracker import HandIdTracker
+from src.core.hand_tracker import HandTracker
+from src.core.video_capture import FileFrameReader
+from src.gestures.claw_detector import ClawDetector
+from src.gestures.features import stack_hands
+from src.utils.config import GestureConfig
+
+DEFAULT_SWEEP_WIDTHS = (160, 256, 320, 480, 640)
+FULL_RESOLUTION = 0  # Width entry meaning "no downscale"
+HAND_SLOTS = 4
+
+# Claw state of each hand in one frame, ordered by handedness
+FrameClaws = Tuple[Tuple[str, bool], ...]
+
+
+@dataclass
+class SweepResult:
+    """Latency and claw stability at one inference width."""
+    width: int               # Inference width (0 = full resolution)
+    frames: int
+    p50_ms: float            # Prepare + inference latency
+    p95_ms: float
+    detection_rate: float    # Frames with at least one hand
+    claw_flips_per_s: float  # Claw on/off changes of tracked hands (lower is steadier)
+    agreement: float         # Frames whose claw states match the full-resolution run
+
+
+def load_clip(path: str, max_frames: Optional[int] = None) -> Tuple[List[np.ndarray], float]:
+    """
+    Decode a clip into memory so decoding is not part of the timings.
+
+    Returns:
+        (BGR frames, frame rate)
+    """
+    reader = FileFrameReader(path)
+    frames = []
+    try:
+        while max_frames is None or len(frames) < max_frames:
+            item = reader.read()
+            if item is None:
+                break
+            frames.append(item[0].copy())
+    finally:
+        reader.release()
+    if not frames:
+        raise ValueError(f"No frames in {path}")
+    return frames, reader.fps
+
+
+def _run_width(frames: List[np.ndarray], fps: float, width: int,
+               model_path: str) -> Tuple[SweepResult, List[FrameClaws]]:
+    """Track the whole clip at one inference width."""
+    config = GestureConfig()
+    tracker = HandTracker(model_path, num_hands=2)
+    preparer = FramePreparer(MIRROR_PIXELS, display=False, ring_size=2,
+                             inference_width=width or None)
+    hand_ids = HandIdTracker(HAND_SLOTS)
+    detector = ClawDetector(config.max_fingertip_spread, config.max_palm_distance,
+                            config.min_fingers_close, HAND_SLOTS)
+    slot_claw = np.zeros(HAND_SLOTS, dtype=bool)
+
+    latencies = np.empty(len(frames))
+    detected = 0
+    flips = 0
+    claws: List[FrameClaws] = []
+    try:
+        for idx, frame in enumerate(frames):
+            timestamp_ms = int(idx * 1000.0 / fps)  # Media time
+            start = time.perf_counter()
+            rgb, _ = preparer.prepare(frame)
+            hands = tracker.process_frame(rgb, timestamp_ms)
+            latencies[idx] = time.perf_counter() - start
+
+            detected += bool(hands)
+            slots = hand_ids.update(stack_hands(hands), [hand.handedness for hand in hands])
+            frame_claws = []
+            for hand_idx, slot in enumerate(slots):
+                if hand_ids.started[hand_idx]:
+                    detector.reset(slot)
+                    slot_claw[slot] = False
+                is_claw = detector.detect(hands[hand_idx], slot)
+                flips += is_claw != slot_claw[slot]
+                slot_claw[slot] = is_claw
+                frame_claws.append((hands[hand_idx].handedness, is_claw))
+            claws.append(tuple(sorted(frame_claws)))
+    finally:
+        tracker.close()
+
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+    result = SweepResult(
+        width=width,
+        frames=len(frames),
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        detection_rate=detected / len(frames),
+        claw_flips_per_s=flips / (len(frames) / fps),
+        agreement=1.0,
+    )
+    return result, claws
+
+
+def run_sweep(clip_path: str, model_path: str, widths: Sequence[int] = DEFAULT_SWEEP_WIDTHS,
+              max_frames: Optional[int] = None) -> List[SweepResult]:
+    """
+    Sweep inference widths over a clip.
+
+    The full-resolution run is always included and is the reference for
+    agreement. Widths at or above the clip's width are skipped.
+    """
+    frames, fps = load_clip(clip_path, max_frames)
+    clip_width = frames[0].shape[1]
+    reference, reference_claws = _run_width(frames, fps, FULL_RESOLUTION, model_path)
+
+    results = []
+    for width in sorted(set(widths)):
+        if width >= clip_width:
+            continue
+        result, claws = _run_width(frames, fps, width, model_path)
+        result.agreement = sum(a == b for a, b in zip(claws, reference_claws)) / len(frames)
+        results.append(result)
+    results.append(reference)
+    return results
+
+
+def format_sweep(results: List[SweepResult]) -> str:
+    """Render sweep results as a table."""
+    lines = [f"{'width':>6}  {'p50 ms':>8}  {'p95 ms':>8}  {'hands':>6}  "
+             f"{'flips/s':>8}  {'agree':>6}"]
+    for result in results:
+        width = str(result.width) if result.width else "full"
+        lines.append(f"{width:>6}  {result.p50_ms:>8.2f}  {result.p95_ms:>8.2f}  "
+                     f"{result.detection_rate:>6.0%}  {result.claw_flips_per_s:>8.2f}  "
+                     f"{result.agreement:>6.0%}")
+    return "\n".join(lines)
@@ -1,24 +1,37 @@
 #!/usr/bin/env python3
 """LinuxHandController - Control volume and brightness with hand gestures."""
 
+import argparse
 import logging
+import signal
+import threading
 import time
-from typing import Optional
 
 import cv2
 
+from src.core.camera_modes import CameraMode
+from src.core.frame_preparer import MIRROR_NONE, FramePreparer
+from src.core.hand_id_tracker import HandIdTracker
 from src.core.hand_tracker import HandTracker
+from src.core.inference_pool import InferencePool
+from src.core.inference_scheduler import AdaptiveInferenceScheduler
+from src.core.pipeline import BLOCK, Pipeline, Stage, max_items_in_flight
+from src.core.landmark_recording import LandmarkRecorder, LandmarkRecording
+from src.core.stages import CaptureSource, ControlStage, GestureStage, InferenceStage, ReplaySource
 from src.core.video_capture import VideoCapture
-from src.gestures.claw_detector import ClawDetector
+from src.gestures.registry import build_default_registry
 from src.gestures.rotation_calculator import RotationCalculator
-from src.controllers.volume_controller import VolumeController
-from src.controllers.brightness_controller import BrightnessController
-from src.filters.smoothing import ExponentialMovingAverage, RateLimiter
+from src.controllers.actuator import AsyncActuator
+from src.controllers.dispatcher import ControlDispatcher
+from src.controllers.volume_controller import DEFAULT_VOLUME_LEVEL, VolumeController
+from src.controllers.brightness_controller import (DEFAULT_BRIGHTNESS_LEVEL, MAX_BRIGHTNESS_PERCENT,
+                                                   MIN_BRIGHTNESS_PERCENT, BrightnessController)
+from src.controllers.cached_controller import CachedController
+from src.controllers.recording_controller import RecordingController
 from src.ui.renderer import Renderer
+from src.utils.clock import MonotonicClock
 from src.utils.config import AppConfig
-
-# Angle to percentage conversion constants
-DEGREES_PER_10_PERCENT = 10.0
+from src.utils.metrics import RATE_OUTPUT, STAGE_END_TO_END, STAGE_RENDER, PipelineMetrics, StatsReporter
 
 # Logging configuration
 logging.basicConfig(
@@ -27,213 +40,322 @@ logging.basicConfig(
 )
 
 
+# How often the main loop re-checks for a shutdown signal while no frame arrives
+OUTPUT_POLL_TIMEOUT_S = 0.5
+
+# Inference, gesture and control
+CAMERA_PIPELINE_STAGES = 3
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line overrides for the configuration."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--headless', action='store_true',
+                        help='run without the preview window or any rendering')
+    parser.add_argument('--input', metavar='PATH',
+                        help='read frames from a video file or image directory instead of the camera')
+    parser.add_argument('--no-pacing', action='store_true',
+                        help='process --input frames as fast as possible')
+    parser.add_argument('--record', metavar='PATH',
+                        help='record detected hand landmarks to PATH')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='replay a landmark recording instead of camera + inference')
+    parser.add_argument('--replay-fast', action='store_true',
+                        help='replay as fast as possible instead of at recorded speed')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='record control writes in memory instead of changing volume '
+                             'and brightness (always on for --replay unless --live-controls)')
+    parser.add_argument('--live-controls', action='store_true',
+                        help='let --replay drive the real volume and brightness')
+    return parser.parse_args()
+
+
+def install_signal_handlers(stop_event: threading.Event) -> None:
+    """Turn SIGINT/SIGTERM into a clean shutdown request."""
+    def handle_signal(signum, _frame) -> None:
+        logging.getLogger(__name__).info(f"Received {signal.Signals(signum).name}, shutting down")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+
 def main() -> None:
     """Main application entry point."""
     config = AppConfig()
     logger = logging.getLogger(__name__)
 
-    try:
-        camera = VideoCapture(config.camera.index, config.camera.flip_horizontal)
-    except RuntimeError as e:
-        logger.error(f"Failed to initialize camera: {e}")
-        return
-
-    tracker = HandTracker('hand_landmarker.task')
-    claw_detector = ClawDetector(
-        config.gesture.max_fingertip_spread,
-        config.gesture.max_palm_distance,
-        config.gesture.min_fingers_close
+    args = parse_args()
+    if args.headless:
+        config.ui.headless = True
+    if args.input:
+        config.camera.input_path = args.input
+    if args.no_pacing:
+        config.camera.paced = False
+
+    stop_event = threading.Event()
+    install_signal_handlers(stop_event)
+
+    # Single monotonic time source for frame timestamps and rate limiting
+    clock = MonotonicClock()
+    metrics = PipelineMetrics(clock, enabled=config.metrics.enabled)
+
+    camera = None
+    tracker = None
+    scheduler = None
+    recorder = None
+    if args.replay:
+        try:
+            recording = LandmarkRecording(args.replay)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to open recording: {e}")
+            return
+        logger.info(f"Replaying {len(recording)} frames ({recording.duration_ms} ms) "
+                    f"from {args.replay}")
+        source = ReplaySource(recording, realtime=not args.replay_fast, clock=clock)
+    else:
+        try:
+            # Mirroring is done by the frame preparer, fused with colour conversion
+            camera = VideoCapture(
+                config.camera.input_path or config.camera.index,
+                False,
+                threaded=config.camera.threaded,
+                ring_size=config.camera.ring_size,
+                clock=clock,
+                backend_timestamps=config.camera.backend_timestamps,
+                decode_ahead=config.camera.decode_ahead,
+                paced=config.camera.paced,
+                file_fps=config.camera.file_fps,
+                backend=config.camera.backend,
+                mode=CameraMode(config.camera.width or 0, config.camera.height or 0,
+                                config.camera.fps or 0.0, config.camera.fourcc or ""),
+                buffer_size=config.camera.buffer_size,
+                probe=config.camera.probe_modes
+            )
+        except RuntimeError as e:
+            logger.error(f"Failed to initialize camera: {e}")
+            return
+
+        # A frame buffer is reused only once no packet can still hold it
+        preparer = FramePreparer(
+            config.camera.mirror_mode if config.camera.flip_horizontal else MIRROR_NONE,
+            display=not config.ui.headless,
+            ring_size=max_items_in_flight(CAMERA_PIPELINE_STAGES, config.pipeline.queue_size) + 1,
+            inference_width=config.tracker.inference_width
+        )
+        tracker_kwargs = dict(
+            model_path=config.tracker.model_path,
+            num_hands=config.tracker.num_hands,
+            roi_enabled=config.tracker.roi_enabled,
+            roi_size=config.tracker.roi_size,
+            roi_padding=config.tracker.roi_padding,
+            roi_refresh_frames=config.tracker.roi_refresh_frames,
+            mirror_landmarks=preparer.mirror_landmarks
+        )
+        if config.tracker.inference_workers > 0:
+            # File input is lossless: every frame waits for its own result
+            tracker = InferencePool(config.tracker.inference_workers, tracker_kwargs,
+                                    block=camera.is_file)
+        else:
+            tracker = HandTracker(running_mode=config.tracker.running_mode, **tracker_kwargs)
+        if config.tracker.adaptive_inference:
+            scheduler = AdaptiveInferenceScheduler(
+                config.tracker.idle_interval_ms,
+                config.tracker.tracking_interval_ms,
+                config.tracker.max_extrapolation_ms
+            )
+        if args.record:
+            recorder = LandmarkRecorder(args.record)
+        source = CaptureSource(camera, metrics, preparer)
+
+    gesture_registry = build_default_registry(config.gesture)
+    gesture_evaluator = gesture_registry.compile()
+    logger.info(f"Gestures: {', '.join(gesture_registry.names)}")
+    # Gesture hysteresis and rotation are tracked per hand ID
+    hand_ids = HandIdTracker(
+        max(config.tracker.hand_slots, config.tracker.num_hands),
+        config.tracker.max_hand_match_distance,
+        config.tracker.max_missed_frames
     )
-    rotation_calc = RotationCalculator()
-
-    volume_ctrl = VolumeController()
-    brightness_ctrl = BrightnessController()
+    rotation_calc = RotationCalculator(hand_ids.num_slots)
+
+    dry_run = args.dry_run or (args.replay is not None and not args.live_controls)
+    if dry_run:
+        # Writes applied synchronously in memory, so a replay is reproducible
+        # and leaves the machine's volume and backlight alone
+        volume_ctrl = RecordingController(DEFAULT_VOLUME_LEVEL)
+        brightness_ctrl = RecordingController(DEFAULT_BRIGHTNESS_LEVEL, MIN_BRIGHTNESS_PERCENT,
+                                              MAX_BRIGHTNESS_PERCENT)
+        logger.info("Dry run: control writes are recorded, not applied")
+    else:
+        # Cached wrappers keep the per-frame level reads off the sound server
+        # and backlight; background watchers pick up external changes.
+        # Actuators move the writes off the frame loop entirely.
+        volume_ctrl = AsyncActuator(CachedController(
+            VolumeController(backend=config.control.volume_backend),
+            config.control.level_poll_interval_ms / 1000.0
+        ), metrics, "volume_io")
+        brightness_ctrl = AsyncActuator(CachedController(
+            BrightnessController(backend=config.control.brightness_backend),
+            config.control.level_poll_interval_ms / 1000.0
+        ), metrics, "brightness_io")
 
     logger.info("LinuxHandController starting...")
     if not volume_ctrl.is_available():
         logger.warning("Volume control unavailable (PulseAudio not found)")
     if not brightness_ctrl.is_available():
-        logger.warning("Brightness control unavailable (brightnessctl not found)")
+        logger.warning("Brightness control unavailable (no backlight device or brightnessctl)")
         logger.info("Install: sudo apt install brightnessctl")
         logger.info("Add user to video group: sudo usermod -a -G video $USER")
 
-    volume_smoother = ExponentialMovingAverage(config.control.smoothing_alpha)
-    brightness_smoother = ExponentialMovingAverage(config.control.smoothing_alpha)
-    volume_limiter = RateLimiter(config.control.update_interval_ms)
-    brightness_limiter = RateLimiter(config.control.update_interval_ms)
-
-    renderer = Renderer()
+    # Controllers the binding table can refer to by name
+    controllers = {
+        'volume': volume_ctrl,
+        'brightness': brightness_ctrl,
+    }
+    dispatcher = ControlDispatcher(
+        config.control.bindings,
+        controllers,
+        gesture_evaluator.index,
+        config.control.update_interval_ms,
+        config.control.axis_filter,
+        clock
+    )
 
-    # Previous angles for delta-based control
-    prev_volume_angle = None
-    prev_brightness_angle = None
+    renderer = None if config.ui.headless else Renderer()
+
+    # Capture, inference (skipped on replay), gesture detection and control each run on their
+    # own thread; rendering stays on the main thread for the OpenCV GUI
+    stages = [
+        Stage("gesture", GestureStage(
+            gesture_evaluator, rotation_calc, config.gesture, scheduler,
+            config.landmark_filter, metrics, hand_ids, dispatcher.bound_gestures(),
+            dispatcher.bound_gestures('roll')
+        )),
+        Stage("control", ControlStage(dispatcher, volume_ctrl, brightness_ctrl, metrics)),
+    ]
+    inference = None
+    if tracker is not None:
+        inference = InferenceStage(tracker, scheduler, metrics, recorder)
+        stages.insert(0, Stage("inference", inference))
+    # Replays and file input are lossless so runs over the same input are reproducible
+    lossless = args.replay or (camera is not None and camera.is_file)
+    pipeline = Pipeline(
+        source,
+        stages,
+        queue_size=config.pipeline.queue_size,
+        policy=BLOCK if lossless else config.pipeline.backpressure
+    )
 
     logger.info("Controls:")
-    logger.info("  Right hand claw + rotate: Control volume")
-    logger.info("  Left hand claw + rotate: Control brightness")
-    logger.info("  Press 'q' to quit")
+    for binding in config.control.bindings:
+        logger.info(f"  {binding.handedness} hand {binding.gesture} + {binding.axis}: "
+                    f"Control {binding.controller}")
+    if config.ui.headless:
+        logger.info("  Headless mode: send SIGINT/SIGTERM to quit")
+    else:
+        logger.info("  Press 'q' to quit")
     logger.info("Debug mode enabled - watch console for detection details")
 
-    try:
-        while True:
-            frame = camera.read_frame()
-            if frame is None:
-                logger.error("Failed to grab frame")
-                break
-
-            timestamp_ms = int(time.time() * 1000)
-            hands = tracker.process_frame(frame, timestamp_ms)
-
-            hand_states = {}
-
-            if not hands:
-                rotation_calc.reset()
-
-            if hands:
-                logger.debug("="*60)
-
-            for idx, hand in enumerate(hands):
-                is_claw = claw_detector.detect(hand)
-                debug_info = claw_detector.get_debug_info()
-
-                logger.debug(f"{hand.handedness} hand:")
-                logger.debug(f"  Fingertip spread: {debug_info.get('fingertip_spread', 0):.3f} "
-                             f"(max: {config.gesture.max_fingertip_spread:.3f})")
-
-                palm_dists = debug_info.get('palm_distances', [])
-                if palm_dists:
-                    logger.debug(f"  Palm distances: I={palm_dists[0]:.3f}, M={palm_dists[1]:.3f}, "
-                                 f"R={palm_dists[2]:.3f}, P={palm_dists[3]:.3f}")
-                    logger.debug(f"  Max palm distance: {config.gesture.max_palm_distance:.3f}")
-                    logger.debug(f"  Fingers close to palm: {debug_info.get('fingers_close', 0)}/{config.gesture.min_fingers_close}")
-
-                logger.debug(f"  Claw detected: {'YES' if is_claw else 'NO'}")
-
-                if is_claw:
-                    rotation_angle = rotation_calc.calculate_roll(hand)
-                    logger.debug(f"  Rotation angle: {rotation_angle:.1f}°")
-                else:
-                    rotation_angle = None
-                    rotation_calc.reset()
-
-                if is_claw and rotation_angle is not None:
-                    hand_states[idx] = {'is_claw': True, 'rotation': rotation_angle}
-
-                    if hand.handedness == 'Right':
-                        prev_volume_angle = handle_volume_control(
-                            rotation_angle, volume_smoother, volume_ctrl,
-                            volume_limiter, prev_volume_angle
-                        )
-                    elif hand.handedness == 'Left':
-                        prev_brightness_angle = handle_brightness_control(
-                            rotation_angle, brightness_smoother, brightness_ctrl,
-                            brightness_limiter, prev_brightness_angle
-                        )
-                else:
-                    if hand.handedness == 'Right':
-                        volume_smoother.reset()
-                        prev_volume_angle = None
-                    elif hand.handedness == 'Left':
-                        brightness_smoother.reset()
-                        prev_brightness_angle = None
-
-                    hand_states[idx] = {'is_claw': False}
-
-            volume_level = volume_ctrl.get_level()
-            brightness_level = brightness_ctrl.get_level()
-
-            rendered_frame = renderer.render_frame(
-                frame, hands, hand_states, volume_level, brightness_level, camera.fps
-            )
+    frames = 0
+    render_cpu_s = 0.0
+    cpu_start = time.process_time()
 
-            cv2.imshow('HandController', rendered_frame)
+    reporter = None
+    if config.metrics.enabled:
+        reporter = StatsReporter(metrics, config.metrics.log_interval_s,
+                                 config.metrics.socket_path)
+        reporter.start()
 
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+    pipeline.start()
+    try:
+        while not stop_event.is_set():
+            packet = pipeline.get(OUTPUT_POLL_TIMEOUT_S)
+            if packet is None:
+                if not pipeline.running:
+                    break
+                # Keep the window responsive (and 'q' working) while the camera stalls
+                if renderer is not None and cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
+            frames += 1
+
+            if renderer is None:
+                # Headless: only drain finished frames; all work happens in the stages
+                record_output(metrics, packet.timestamp_ms)
+                continue
+
+            render_start = time.thread_time()
+            with metrics.measure(STAGE_RENDER):
+                rendered_frame = renderer.render_frame(
+                    packet.frame, packet.hands, packet.hand_states,
+                    packet.volume_level, packet.brightness_level, packet.fps
+                )
+
+                cv2.imshow('HandController', rendered_frame)
+                key = cv2.waitKey(1)
+            render_cpu_s += time.thread_time() - render_start
+            record_output(metrics, packet.timestamp_ms)
+
+            if key & 0xFF == ord('q'):
                 break
 
     finally:
-        camera.release()
-        tracker.close()
-        cv2.destroyAllWindows()
+        pipeline.stop()
+        pipeline.join()
+        if inference is not None:
+            inference.flush()
+        if reporter is not None:
+            reporter.stop()
+            logger.info(reporter.format_line())
+        log_cpu_usage(logger, frames, time.process_time() - cpu_start,
+                      render_cpu_s, config.ui.headless)
+        logger.info(f"Pipeline queue drops: {pipeline.dropped}")
+        if scheduler is not None:
+            logger.info(f"Adaptive inference: {scheduler.inferred_frames} inferred, "
+                        f"{scheduler.skipped_frames} extrapolated frames")
+        if tracker is not None:
+            if tracker.dropped_frames:
+                logger.info(f"Inference busy, frames skipped: {tracker.dropped_frames}")
+            tracker.close()
+        if camera is not None:
+            if camera.threaded:
+                logger.info(f"Capture: {camera.dropped_frames} dropped, "
+                            f"{camera.duplicate_frames} duplicate frames")
+            camera.release()
+        if recorder is not None:
+            recorder.close()
+        for name, ctrl in (('volume', volume_ctrl), ('brightness', brightness_ctrl)):
+            if isinstance(ctrl, RecordingController):
+                logger.info(f"Dry run {name}: {len(ctrl.writes)} writes, "
+                            f"final level {ctrl.get_level()}")
+            ctrl.close()
+        if renderer is not None:
+            cv2.destroyAllWindows()
         logger.info("Hand tracking stopped")
 
 
-def handle_volume_control(
-    rotation_angle: float,
-    smoother: ExponentialMovingAverage,
-    controller: VolumeController,
-    limiter: RateLimiter,
-    prev_angle: Optional[float]
-) -> float:
-    """Process volume changes based on hand rotation delta."""
-    logger = logging.getLogger(__name__)
-    smoothed_angle = smoother.update(rotation_angle)
-    logger.debug(f"  Smoothed angle: {smoothed_angle:.1f}°")
-
-    if prev_angle is not None:
-        angle_delta = smoothed_angle - prev_angle
-        logger.debug(f"  Angle delta: {angle_delta:+.1f}°")
-
-        volume_change = int(angle_delta / DEGREES_PER_10_PERCENT * 10)
-
-        if volume_change != 0:
-            current_volume = controller.get_level()
-            new_volume = max(0, min(100, current_volume + volume_change))
-
-            logger.debug(f"  Volume change: {current_volume}% {volume_change:+d}% -> {new_volume}%")
-
-            if limiter.should_update():
-                logger.debug(f"  -> Setting volume to {new_volume}%")
-                controller.set_level(new_volume)
-                return smoothed_angle
-            else:
-                logger.debug(f"  -> Rate limited (waiting for next update)")
-                return prev_angle
-        else:
-            logger.debug(f"  -> No change (delta too small)")
-    else:
-        logger.debug(f"  -> Baseline set")
-
-    return smoothed_angle
-
-
-def handle_brightness_control(
-    rotation_angle: float,
-    smoother: ExponentialMovingAverage,
-    controller: BrightnessController,
-    limiter: RateLimiter,
-    prev_angle: Optional[float]
-) -> float:
-    """Process brightness changes based on hand rotation delta."""
-    logger = logging.getLogger(__name__)
-    smoothed_angle = smoother.update(rotation_angle)
-    logger.debug(f"  Smoothed angle: {smoothed_angle:.1f}°")
+def record_output(metrics: PipelineMetrics, timestamp_ms: int) -> None:
+    """Record capture-to-output latency and the output frame rate."""
+    now = metrics.clock.now()
+    metrics.record(STAGE_END_TO_END, now - timestamp_ms / 1000.0)
+    metrics.tick(RATE_OUTPUT, now)
 
-    if prev_angle is not None:
-        angle_delta = smoothed_angle - prev_angle
-        logger.debug(f"  Angle delta: {angle_delta:+.1f}°")
 
-        brightness_change = int(angle_delta / DEGREES_PER_10_PERCENT * 10)
-
-        if brightness_change != 0:
-            current_brightness = controller.get_level()
-            new_brightness = max(5, min(100, current_brightness + brightness_change))
-
-            logger.debug(f"  Brightness change: {current_brightness}% {brightness_change:+d}% -> {new_brightness}%")
+def log_cpu_usage(logger: logging.Logger, frames: int, total_cpu_s: float,
+                  render_cpu_s: float, headless: bool) -> None:
+    """Report process CPU time per frame and the share spent on the preview."""
+    if frames == 0:
+        return
 
-            if limiter.should_update():
-                logger.debug(f"  -> Setting brightness to {new_brightness}%")
-                controller.set_level(new_brightness)
-                return smoothed_angle
-            else:
-                logger.debug(f"  -> Rate limited (waiting for next update)")
-                return prev_angle
-        else:
-            logger.debug(f"  -> No change (delta too small)")
+    per_frame_ms = total_cpu_s / frames * 1000
+    if headless:
+        logger.info(f"CPU per frame: {per_frame_ms:.2f} ms (headless, rendering skipped)")
     else:
-        logger.debug(f"  -> Baseline set")
-
-    return smoothed_angle
+        render_ms = render_cpu_s / frames * 1000
+        logger.info(f"CPU per frame: {per_frame_ms:.2f} ms, of which rendering/GUI "
+                    f"{render_ms:.2f} ms ({render_ms / per_frame_ms:.0%}) "
+                    f"would be saved in headless mode")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,130 @@
+"""Asynchronous, coalescing writer between gesture logic and controllers."""
+
+import logging
+import threading
+from typing import Optional
+
+from src.controllers.base_controller import BaseController
+from src.utils.metrics import PipelineMetrics
+
+logger = logging.getLogger(__name__)
+
+THREAD_JOIN_TIMEOUT_S = 2.0
+
+
+class AsyncActuator(BaseController):
+    """
+    Applies set_level() calls on a background thread.
+
+    set_level() only records the target and returns. While a write is in
+    flight, newer targets replace the pending one, so a burst of updates
+    collapses into at most one write in flight plus one queued.
+    """
+
+    def __init__(self, controller: BaseController,
+                 metrics: Optional[PipelineMetrics] = None,
+                 metrics_name: str = "controller_io") -> None:
+        """
+        Initialize actuator and start its worker thread.
+
+        Args:
+            controller: Controller that performs the actual system writes
+            metrics: Records the duration of each write
+            metrics_name: Histogram name for the write durations
+        """
+        self._controller = controller
+        self._metrics = metrics or PipelineMetrics(enabled=False)
+        self._metrics_name = metrics_name
+        self._cond = threading.Condition()
+        self._pending: Optional[int] = None
+        self._in_flight: Optional[int] = None
+        self._closed = False
+
+        self.writes = 0     # Levels actually written to the controller
+        self.coalesced = 0  # Targets dropped because a newer one replaced them
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"{type(controller).__name__}-actuator",
+            daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def controller(self) -> BaseController:
+        """The wrapped controller."""
+        return self._controller
+
+    @property
+    def min_level(self) -> int:
+        """Lowest level the wrapped controller applies."""
+        return self._controller.min_level
+
+    @property
+    def max_level(self) -> int:
+        """Highest level the wrapped controller applies."""
+        return self._controller.max_level
+
+    def set_level(self, level: int) -> None:
+        """Queue a target level without waiting for the write."""
+        with self._cond:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = self._controller.clamp(level)
+            self._cond.notify_all()
+
+    def get_level(self) -> int:
+        """Return the newest target not yet applied, else the controller level."""
+        with self._cond:
+            if self._pending is not None:
+                return self._pending
+            if self._in_flight is not None:
+                return self._in_flight
+        return self._controller.get_level()
+
+    def is_available(self) -> bool:
+        """Check if the wrapped controller is available."""
+        return self._controller.is_available()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued target has been written.
+
+        Returns:
+            True if idle, False if the timeout expired first
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._pending is None and self._in_flight is None,
+                timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                self._in_flight = self._pending
+                self._pending = None
+                level = self._in_flight
+
+            try:
+                with self._metrics.measure(self._metrics_name):
+                    self._controller.set_level(level)
+                self.writes += 1
+            except Exception as e:
+                logger.error(f"Failed to apply level {level}: {e}")
+
+            with self._cond:
+                self._in_flight = None
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """Apply the last queued target, stop the worker and close the controller."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=THREAD_JOIN_TIMEOUT_S)
+        self._controller.close()
@@ -1,11 +1,16 @@
 """Base controller interface."""
 
+import time
 from abc import ABC, abstractmethod
 
 
 class BaseController(ABC):
     """Abstract interface for system controllers."""
 
+    # Range set_level() applies; levels outside it are clamped
+    min_level = 0
+    max_level = 100
+
     @abstractmethod
     def set_level(self, level: int):
         """
@@ -35,3 +40,27 @@ class BaseController(ABC):
             True if available, False otherwise
         """
         pass
+
+    def clamp(self, level: int) -> int:
+        """The level set_level() actually applies for a requested one."""
+        return max(self.min_level, min(self.max_level, level))
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """
+        Block until the level may have changed outside this controller.
+
+        The default implementation has no change notification and simply
+        sleeps, so callers fall back to polling every `timeout` seconds.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the level should be re-read, False on timeout
+        """
+        time.sleep(timeout)
+        return True
+
+    def close(self) -> None:
+        """Release any system resources held by the controller."""
+        pass
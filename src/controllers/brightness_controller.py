@@ -1,9 +1,13 @@
-"""Brightness control using brightnessctl."""
+"""Brightness control via sysfs backlight, brightnessctl or logind."""
 
 import logging
+import os
+import shutil
 import subprocess
+from typing import List, Optional
 
 from src.controllers.base_controller import BaseController
+from src.utils.inotify import FileWatcher, IN_MODIFY
 
 logger = logging.getLogger(__name__)
 
@@ -12,18 +16,63 @@ MIN_BRIGHTNESS_PERCENT = 5
 MAX_BRIGHTNESS_PERCENT = 100
 DEFAULT_BRIGHTNESS_LEVEL = 50
 DEFAULT_MAX_BRIGHTNESS_VALUE = 100
+BACKLIGHT_SYSFS_DIR = '/sys/class/backlight'
+SYSFS_READ_SIZE = 32
 
+# Backend selection
+BACKEND_AUTO = "auto"
+BACKEND_SYSFS = "sysfs"
+BACKEND_BRIGHTNESSCTL = "brightnessctl"
 
-class BrightnessController(BaseController):
-    """Controls screen brightness via brightnessctl."""
 
-    def __init__(self) -> None:
-        self._max_brightness = self._get_max_brightness()
+def find_backlight_device(sysfs_root: str = BACKLIGHT_SYSFS_DIR,
+                          device: Optional[str] = None) -> str:
+    """
+    Locate a backlight device directory.
+
+    Args:
+        sysfs_root: Directory holding backlight devices
+        device: Device name, or None for the first one (brightnessctl's default)
+
+    Returns:
+        Path to the device directory
+
+    Raises:
+        OSError: If no matching device exists
+    """
+    if device is None:
+        devices = sorted(os.listdir(sysfs_root))
+        if not devices:
+            raise OSError(f"No backlight device under {sysfs_root}")
+        device = devices[0]
+
+    device_dir = os.path.join(sysfs_root, device)
+    if not os.path.isfile(os.path.join(device_dir, 'max_brightness')):
+        raise OSError(f"Not a backlight device: {device_dir}")
+    return device_dir
+
+
+def _to_percent(raw: int, max_raw: int) -> int:
+    if max_raw <= 0:
+        return DEFAULT_BRIGHTNESS_LEVEL
+    return int(round(raw / max_raw * 100))  # Rounds like _to_raw so levels round-trip
 
-    def set_level(self, level: int) -> None:
-        """Set brightness to a percentage between 5 and 100."""
-        level = max(MIN_BRIGHTNESS_PERCENT, min(MAX_BRIGHTNESS_PERCENT, level))
 
+def _to_raw(level: int, max_raw: int) -> int:
+    return int(round(level / 100.0 * max_raw))
+
+
+class BrightnessctlBackend:
+    """Brightness access by spawning brightnessctl per call (fallback path)."""
+
+    name = BACKEND_BRIGHTNESSCTL
+
+    def __init__(self, sysfs_root: str = BACKLIGHT_SYSFS_DIR) -> None:
+        self._sysfs_root = sysfs_root
+        self._max_brightness = self._get_max_brightness()
+
+    def set_percent(self, level: int) -> None:
+        """Set brightness to a percentage."""
         try:
             result = subprocess.run(
                 ['brightnessctl', 'set', f'{level}%'],
@@ -38,8 +87,8 @@ class BrightnessController(BaseController):
         except subprocess.SubprocessError as e:
             logger.error(f"Failed to set brightness: {e}")
 
-    def get_level(self) -> int:
-        """Get current brightness level as a percentage."""
+    def get_percent(self) -> Optional[int]:
+        """Get brightness as a percentage, or None if it cannot be read."""
         try:
             result = subprocess.run(
                 ['brightnessctl', 'get'],
@@ -47,16 +96,13 @@ class BrightnessController(BaseController):
                 text=True,
                 check=True
             )
-            current = int(result.stdout.strip())
-
-            if self._max_brightness > 0:
-                return int((current / self._max_brightness) * 100)
+            return _to_percent(int(result.stdout.strip()), self._max_brightness)
         except FileNotFoundError:
             logger.error("brightnessctl command not found. Is it installed?")
         except (ValueError, subprocess.SubprocessError) as e:
             logger.error(f"Failed to get brightness level: {e}")
 
-        return DEFAULT_BRIGHTNESS_LEVEL
+        return None
 
     def is_available(self) -> bool:
         """Check if brightnessctl is installed."""
@@ -71,6 +117,18 @@ class BrightnessController(BaseController):
             logger.debug(f"brightnessctl not available: {e}")
             return False
 
+    def watch_files(self) -> List[str]:
+        """Sysfs files that change when the brightness changes."""
+        device_dir = find_backlight_device(self._sysfs_root)
+        return [
+            os.path.join(device_dir, 'brightness'),
+            os.path.join(device_dir, 'actual_brightness'),
+        ]
+
+    def close(self) -> None:
+        """Nothing to release; every call is a separate process."""
+        pass
+
     def _get_max_brightness(self) -> int:
         """Get maximum brightness value from system."""
         try:
@@ -87,3 +145,203 @@ class BrightnessController(BaseController):
             logger.warning(f"Failed to get max brightness, using default: {e}")
 
         return DEFAULT_MAX_BRIGHTNESS_VALUE
+
+
+class LogindBrightnessWriter:
+    """Writes brightness through logind's Session.SetBrightness D-Bus call."""
+
+    def __init__(self, device_name: str) -> None:
+        self._device_name = device_name
+
+    def set_raw(self, value: int) -> None:
+        """Ask logind to set the raw brightness value for this session."""
+        try:
+            result = subprocess.run(
+                ['busctl', 'call', 'org.freedesktop.login1',
+                 '/org/freedesktop/login1/session/auto',
+                 'org.freedesktop.login1.Session', 'SetBrightness',
+                 'ssu', 'backlight', self._device_name, str(value)],
+                check=False,
+                capture_output=True,
+                text=True
+            )
+            if result.returncode != 0:
+                logger.error(f"Failed to set brightness via logind: {result.stderr.strip()}")
+        except FileNotFoundError:
+            logger.error("busctl command not found. Is systemd-logind available?")
+        except subprocess.SubprocessError as e:
+            logger.error(f"Failed to set brightness via logind: {e}")
+
+
+class SysfsBacklightBackend:
+    """
+    Brightness access through the backlight sysfs files.
+
+    max_brightness is read once and the brightness file descriptor stays
+    open, so each get/set is a single pread/pwrite syscall. Without write
+    permission on the brightness file, writes go through brightnessctl or
+    logind instead while reads stay on sysfs.
+    """
+
+    name = BACKEND_SYSFS
+
+    def __init__(self, sysfs_root: str = BACKLIGHT_SYSFS_DIR,
+                 device: Optional[str] = None) -> None:
+        """
+        Open the backlight device.
+
+        Args:
+            sysfs_root: Directory holding backlight devices (overridable for tests)
+            device: Device name, or None for the first device
+
+        Raises:
+            OSError: If no device is found or its files cannot be read
+        """
+        self._device_dir = find_backlight_device(sysfs_root, device)
+        self._brightness_path = os.path.join(self._device_dir, 'brightness')
+
+        with open(os.path.join(self._device_dir, 'max_brightness')) as f:
+            self._max_brightness = int(f.read().strip())
+
+        self._fallback_writer = None
+        try:
+            self._fd = os.open(self._brightness_path, os.O_RDWR | os.O_CLOEXEC)
+        except PermissionError:
+            self._fd = os.open(self._brightness_path, os.O_RDONLY | os.O_CLOEXEC)
+            self._fallback_writer = self._create_fallback_writer()
+
+    def _create_fallback_writer(self):
+        """Pick a privileged writer when the brightness file is read-only."""
+        if shutil.which('brightnessctl'):
+            logger.info("No write access to backlight, writing via brightnessctl")
+            return BrightnessctlBackend(os.path.dirname(self._device_dir))
+        logger.info("No write access to backlight, writing via logind")
+        return LogindBrightnessWriter(os.path.basename(self._device_dir))
+
+    @property
+    def writer_name(self) -> str:
+        """How writes are applied ("sysfs", "brightnessctl" or "logind")."""
+        if self._fallback_writer is None:
+            return BACKEND_SYSFS
+        if isinstance(self._fallback_writer, BrightnessctlBackend):
+            return BACKEND_BRIGHTNESSCTL
+        return "logind"
+
+    def set_percent(self, level: int) -> None:
+        """Set brightness to a percentage."""
+        if isinstance(self._fallback_writer, BrightnessctlBackend):
+            self._fallback_writer.set_percent(level)
+            return
+
+        raw = _to_raw(level, self._max_brightness)
+        if self._fallback_writer is not None:
+            self._fallback_writer.set_raw(raw)
+            return
+
+        try:
+            os.pwrite(self._fd, f"{raw}\n".encode(), 0)
+        except OSError as e:
+            logger.error(f"Failed to set brightness: {e}")
+
+    def get_percent(self) -> Optional[int]:
+        """Get brightness as a percentage, or None if it cannot be read."""
+        try:
+            raw = int(os.pread(self._fd, SYSFS_READ_SIZE, 0).strip())
+            return _to_percent(raw, self._max_brightness)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to get brightness level: {e}")
+            return None
+
+    def is_available(self) -> bool:
+        """Check if the brightness file is open."""
+        return self._fd >= 0
+
+    def watch_files(self) -> List[str]:
+        """Sysfs files that change when the brightness changes."""
+        return [
+            self._brightness_path,
+            os.path.join(self._device_dir, 'actual_brightness'),
+        ]
+
+    def close(self) -> None:
+        """Close the brightness file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class BrightnessController(BaseController):
+    """Controls screen brightness via the backlight device."""
+
+    min_level = MIN_BRIGHTNESS_PERCENT  # Never switch the backlight off
+    max_level = MAX_BRIGHTNESS_PERCENT
+
+    def __init__(self, backend: str = BACKEND_AUTO,
+                 sysfs_root: str = BACKLIGHT_SYSFS_DIR,
+                 device: Optional[str] = None) -> None:
+        """
+        Initialize brightness controller.
+
+        Args:
+            backend: "sysfs" (direct file access), "brightnessctl" (subprocess
+                per call) or "auto" (sysfs, falling back to brightnessctl)
+            sysfs_root: Directory holding backlight devices
+            device: Backlight device name, or None for the first device
+        """
+        self._backend = self._create_backend(backend, sysfs_root, device)
+        self._watcher: Optional[FileWatcher] = None
+        self._watch_failed = False
+        logger.debug(f"Brightness backend: {self._backend.name}")
+
+    @staticmethod
+    def _create_backend(backend: str, sysfs_root: str, device: Optional[str]):
+        if backend not in (BACKEND_AUTO, BACKEND_SYSFS, BACKEND_BRIGHTNESSCTL):
+            raise ValueError(f"Unknown brightness backend: {backend}")
+
+        if backend in (BACKEND_AUTO, BACKEND_SYSFS):
+            try:
+                return SysfsBacklightBackend(sysfs_root, device)
+            except (OSError, ValueError) as e:
+                if backend == BACKEND_SYSFS:
+                    raise
+                logger.info(f"Sysfs backlight unavailable, using brightnessctl: {e}")
+
+        return BrightnessctlBackend(sysfs_root)
+
+    @property
+    def backend_name(self) -> str:
+        """Name of the active backend ("sysfs" or "brightnessctl")."""
+        return self._backend.name
+
+    def set_level(self, level: int) -> None:
+        """Set brightness to a percentage between 5 and 100."""
+        self._backend.set_percent(self.clamp(level))
+
+    def get_level(self) -> int:
+        """Get current brightness level as a percentage."""
+        level = self._backend.get_percent()
+        return DEFAULT_BRIGHTNESS_LEVEL if level is None else level
+
+    def is_available(self) -> bool:
+        """Check if the backlight can be controlled."""
+        return self._backend.is_available()
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Wait for an inotify event on the backlight sysfs files."""
+        if self._watcher is None and not self._watch_failed:
+            try:
+                self._watcher = FileWatcher(self._backend.watch_files(), IN_MODIFY)
+            except OSError as e:
+                logger.debug(f"Backlight inotify unavailable, polling: {e}")
+                self._watch_failed = True
+
+        if self._watcher is None:
+            return super().wait_for_change(timeout)
+        return self._watcher.wait(timeout)
+
+    def close(self) -> None:
+        """Stop watching the backlight device and release its files."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        self._backend.close()
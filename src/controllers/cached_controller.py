@@ -0,0 +1,99 @@
+"""Cached level layer that keeps controller reads off the system."""
+
+import logging
+import threading
+
+from src.controllers.base_controller import BaseController
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long the watcher blocks before re-checking for shutdown
+DEFAULT_WAIT_TIMEOUT_S = 0.5
+THREAD_JOIN_TIMEOUT_S = 2.0
+
+
+class CachedController(BaseController):
+    """
+    Wraps a controller so get_level() is an O(1) read of a cached value.
+
+    The cache is updated optimistically on set_level() and refreshed by a
+    background thread whenever the wrapped controller reports an external
+    change (sound server events, backlight inotify, or periodic polling).
+    """
+
+    def __init__(self, controller: BaseController,
+                 wait_timeout_s: float = DEFAULT_WAIT_TIMEOUT_S) -> None:
+        """
+        Initialize cache and start the watcher thread.
+
+        Args:
+            controller: Controller to wrap
+            wait_timeout_s: Poll interval for controllers without change events
+        """
+        self._controller = controller
+        self._wait_timeout = wait_timeout_s
+        self._level = controller.get_level()
+        # Bumped on every set_level so a refresh that raced with a local
+        # write does not overwrite the newer optimistic value
+        self._generation = 0
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._watch,
+            name=f"{type(controller).__name__}-watcher",
+            daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def controller(self) -> BaseController:
+        """The wrapped controller."""
+        return self._controller
+
+    @property
+    def min_level(self) -> int:
+        """Lowest level the wrapped controller applies."""
+        return self._controller.min_level
+
+    @property
+    def max_level(self) -> int:
+        """Highest level the wrapped controller applies."""
+        return self._controller.max_level
+
+    def set_level(self, level: int) -> None:
+        """Record the new level immediately, then apply it to the system."""
+        self._generation += 1
+        self._level = self._controller.clamp(level)
+        self._controller.set_level(level)
+
+    def get_level(self) -> int:
+        """Return the cached level without touching the system."""
+        return self._level
+
+    def is_available(self) -> bool:
+        """Check if the wrapped controller is available."""
+        return self._controller.is_available()
+
+    def refresh(self) -> int:
+        """Re-read the level from the system and update the cache."""
+        generation = self._generation
+        level = self._controller.get_level()
+        if generation == self._generation:
+            self._level = level
+        return self._level
+
+    def _watch(self) -> None:
+        while not self._stop.is_set():
+            try:
+                changed = self._controller.wait_for_change(self._wait_timeout)
+                if changed and not self._stop.is_set():
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"Level watcher error: {e}")
+                self._stop.wait(self._wait_timeout)
+
+    def close(self) -> None:
+        """Stop the watcher thread and close the wrapped controller."""
+        self._stop.set()
+        self._thread.join(timeout=THREAD_JOIN_TIMEOUT_S)
+        self._controller.close()
@@ -0,0 +1,172 @@
+"""Generic gesture-to-controller dispatch driven by a binding table."""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.controllers.base_controller import BaseController
+from src.filters.smoothing import FILTER_EMA, ExponentialMovingAverage, RateLimiter, create_filter
+from src.utils.clock import Clock
+from src.utils.config import BindingConfig, FilterConfig
+
+logger = logging.getLogger(__name__)
+
+# Control axes, in the order GestureStage stores them per hand
+AXES = ('roll', 'pitch')
+AXIS_INDEX = {name: idx for idx, name in enumerate(AXES)}
+
+HANDEDNESS = ('Left', 'Right')
+HANDEDNESS_INDEX = {name: idx for idx, name in enumerate(HANDEDNESS)}
+
+
+class Binding:
+    """Runtime state of one binding: turns axis deltas into level changes."""
+
+    def __init__(self, config: BindingConfig, controller: BaseController,
+                 gesture_index: int, update_interval_ms: int,
+                 filter_config: FilterConfig, clock: Optional[Clock] = None):
+        self.config = config
+        self.controller = controller
+        self.gesture_index = gesture_index
+        self.axis_index = AXIS_INDEX[config.axis]
+        self._min = config.min_level
+        self._max = config.max_level
+        self._gain = config.gain
+        if config.filter == FILTER_EMA:
+            self._smoother = ExponentialMovingAverage(config.smoothing_alpha)
+        else:
+            self._smoother = create_filter(config.filter, filter_config)
+        self._limiter = RateLimiter(update_interval_ms, clock)
+        self._prev_value: Optional[float] = None
+
+    def update(self, value: float, timestamp: float) -> None:
+        """Process one axis sample (timestamp in seconds) while the bound gesture is active."""
+        smoothed = float(self._smoother.update(value, timestamp))
+        logger.debug(f"  [{self.config.controller}] Smoothed {self.config.axis}: {smoothed:.1f}°")
+
+        if self._prev_value is None:
+            logger.debug(f"  -> Baseline set")
+            self._prev_value = smoothed
+            return
+
+        delta = smoothed - self._prev_value
+        change = int(delta * self._gain)
+        if change == 0:
+            logger.debug(f"  -> No change (delta {delta:+.1f}° too small)")
+            self._prev_value = smoothed
+            return
+
+        current = self.controller.get_level()
+        new_level = max(self._min, min(self._max, current + change))
+        logger.debug(f"  {self.config.controller}: {current}% {change:+d}% -> {new_level}%")
+
+        if self._limiter.should_update(timestamp):
+            self.controller.set_level(new_level)
+            self._prev_value = smoothed
+        else:
+            logger.debug(f"  -> Rate limited (waiting for next update)")
+
+    def reset(self) -> None:
+        """Forget the baseline once the gesture ends."""
+        if self._prev_value is not None:
+            self._smoother.reset()
+            self._prev_value = None
+
+
+class ControlDispatcher:
+    """
+    Runs the binding table against each frame's gesture results.
+
+    Bindings are resolved at construction into a per-handedness list of
+    (gesture index, axis index, controller) entries, so dispatch is
+    integer indexing only.
+    """
+
+    def __init__(self,
+                 bindings: List[BindingConfig],
+                 controllers: Dict[str, BaseController],
+                 gesture_index: Dict[str, int],
+                 update_interval_ms: int,
+                 filter_config: Optional[FilterConfig] = None,
+                 clock: Optional[Clock] = None):
+        """
+        Resolve the binding table.
+
+        Args:
+            bindings: Binding definitions from the configuration
+            controllers: Controller instances by name
+            gesture_index: Gesture column by name (CompiledGestureEvaluator.index)
+            update_interval_ms: Minimum interval between writes per binding
+            filter_config: Parameters for bindings using adaptive filters
+            clock: Time source for rate limiting
+
+        Raises:
+            ValueError: If a binding references an unknown name
+        """
+        filter_config = filter_config or FilterConfig()
+        self._num_gestures = len(gesture_index)
+        self._by_side: List[List[Binding]] = [[] for _ in HANDEDNESS]
+        # Hand ID whose samples each side's binding state was built from
+        self._side_hand: List[Optional[int]] = [None] * len(HANDEDNESS)
+        for config in bindings:
+            if config.handedness not in HANDEDNESS_INDEX:
+                raise ValueError(f"Unknown handedness in binding: {config.handedness}")
+            if config.gesture not in gesture_index:
+                raise ValueError(f"Unknown gesture in binding: {config.gesture}")
+            if config.axis not in AXIS_INDEX:
+                raise ValueError(f"Unknown axis in binding: {config.axis}")
+            if config.controller not in controllers:
+                raise ValueError(f"Unknown controller in binding: {config.controller}")
+
+            self._by_side[HANDEDNESS_INDEX[config.handedness]].append(Binding(
+                config, controllers[config.controller],
+                gesture_index[config.gesture], update_interval_ms, filter_config, clock
+            ))
+
+    @property
+    def bindings(self) -> List[Binding]:
+        """All resolved bindings."""
+        return [binding for side in self._by_side for binding in side]
+
+    def bound_gestures(self, axis: Optional[str] = None) -> np.ndarray:
+        """
+        Gestures that drive a binding, per handedness.
+
+        Args:
+            axis: Only count bindings on this axis; None for any axis
+
+        Returns:
+            Boolean (len(HANDEDNESS), num_gestures) mask
+        """
+        mask = np.zeros((len(HANDEDNESS), self._num_gestures), dtype=bool)
+        for side, bindings in enumerate(self._by_side):
+            for binding in bindings:
+                if axis is None or binding.config.axis == axis:
+                    mask[side, binding.gesture_index] = True
+        return mask
+
+    def dispatch(self, side: int, active: np.ndarray, axes: np.ndarray,
+                 timestamp: float, hand_id: Optional[int] = None) -> None:
+        """
+        Apply every binding of one hand.
+
+        Args:
+            side: Index into HANDEDNESS
+            active: Active flag per gesture for this hand
+            axes: Axis values for this hand, ordered as AXES
+            timestamp: Frame time in seconds
+            hand_id: Tracked identity of the hand (HandIdTracker); when another
+                hand takes over the side, its bindings drop their baseline and
+                smoother state instead of taking a delta across the two hands
+        """
+        if hand_id != self._side_hand[side]:
+            self._side_hand[side] = hand_id
+            for binding in self._by_side[side]:
+                binding.reset()
+
+        for binding in self._by_side[side]:
+            if active[binding.gesture_index]:
+                binding.update(float(axes[binding.axis_index]), timestamp)
+            else:
+                binding.reset()
@@ -0,0 +1,42 @@
+"""In-memory controller for replays and dry runs."""
+
+import threading
+from typing import List
+
+from src.controllers.base_controller import BaseController
+
+
+class RecordingController(BaseController):
+    """
+    Keeps the level in memory and records every write instead of touching the system.
+
+    Lets a replay exercise the full binding path without changing the
+    machine's volume or backlight, and on hosts that have neither.
+    """
+
+    def __init__(self, level: int = 50, min_level: int = 0, max_level: int = 100) -> None:
+        """
+        Args:
+            level: Starting level
+            min_level: Lowest level set_level() applies
+            max_level: Highest level set_level() applies
+        """
+        self.min_level = min_level
+        self.max_level = max_level
+        self._level = self.clamp(level)
+        self._lock = threading.Lock()
+        self.writes: List[int] = []  # Every level applied, in order
+
+    def set_level(self, level: int) -> None:
+        """Record the clamped level as the current one."""
+        with self._lock:
+            self._level = self.clamp(level)
+            self.writes.append(self._level)
+
+    def get_level(self) -> int:
+        """Return the last recorded level."""
+        return self._level
+
+    def is_available(self) -> bool:
+        """Always available."""
+        return True
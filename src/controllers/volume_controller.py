@@ -1,10 +1,19 @@
-"""Volume control using PulseAudio pactl command."""
+"""Volume control using PulseAudio (native pulsectl connection or pactl)."""
 
 import logging
+import os
 import re
+import select
 import subprocess
+import threading
+import time
 from typing import Optional
 
+try:
+    import pulsectl
+except ImportError:
+    pulsectl = None
+
 from src.controllers.base_controller import BaseController
 
 logger = logging.getLogger(__name__)
@@ -12,17 +21,30 @@ logger = logging.getLogger(__name__)
 # PulseAudio sink configuration
 DEFAULT_SINK_ID = "0"
 DEFAULT_VOLUME_LEVEL = 50
+DEFAULT_SINK_ALIAS = "@DEFAULT_SINK@"
+PULSE_CLIENT_NAME = "linuxhandcontroller"
+SUBSCRIBE_READ_SIZE = 4096
+# pactl subscribe line for a sink volume/mute change; the trailing " #" keeps
+# sink-input (per-stream) events from matching
+SINK_CHANGE_EVENT = b"'change' on sink #"
 
+# Backend selection
+BACKEND_AUTO = "auto"
+BACKEND_NATIVE = "native"
+BACKEND_PACTL = "pactl"
 
-class VolumeController(BaseController):
-    """Controls system volume via PulseAudio."""
+
+class PactlVolumeBackend:
+    """Volume access by spawning a pactl process per call (fallback path)."""
+
+    name = BACKEND_PACTL
 
     def __init__(self, sink_id: str = DEFAULT_SINK_ID) -> None:
         self.sink_id = sink_id
+        self._subscriber: Optional[subprocess.Popen] = None
 
-    def set_level(self, level: int) -> None:
-        """Set volume to a percentage between 0 and 100."""
-        level = max(0, min(100, level))
+    def set_volume(self, level: int) -> None:
+        """Set sink volume to a percentage."""
         try:
             subprocess.call(["pactl", "set-sink-volume", self.sink_id, f"{level}%"])
         except FileNotFoundError:
@@ -30,8 +52,8 @@ class VolumeController(BaseController):
         except subprocess.SubprocessError as e:
             logger.error(f"Failed to set volume: {e}")
 
-    def get_level(self) -> int:
-        """Get current volume level as a percentage."""
+    def get_volume(self) -> Optional[int]:
+        """Get sink volume as a percentage, or None if it cannot be read."""
         try:
             result = subprocess.run(
                 ["pactl", "get-sink-volume", self.sink_id],
@@ -47,13 +69,252 @@ class VolumeController(BaseController):
         except subprocess.SubprocessError as e:
             logger.error(f"Failed to get volume level: {e}")
 
-        return DEFAULT_VOLUME_LEVEL
+        return None
 
     def is_available(self) -> bool:
-        """Check if PulseAudio is running."""
+        """Check if pactl can reach the sound server."""
         try:
             subprocess.run(['pactl', 'info'], capture_output=True, check=True)
             return True
         except (subprocess.CalledProcessError, FileNotFoundError) as e:
             logger.debug(f"PulseAudio not available: {e}")
             return False
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Wait for a sink event reported by a long-running `pactl subscribe`."""
+        if self._subscriber is None:
+            try:
+                self._subscriber = subprocess.Popen(
+                    ["pactl", "subscribe"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+            except (FileNotFoundError, subprocess.SubprocessError) as e:
+                logger.debug(f"pactl subscribe unavailable, polling: {e}")
+                time.sleep(timeout)
+                return True
+
+        fd = self._subscriber.stdout.fileno()
+        readable, _, _ = select.select([fd], [], [], timeout)
+        if not readable:
+            return False
+
+        data = os.read(fd, SUBSCRIBE_READ_SIZE)
+        if not data:
+            # Subscriber exited (sound server restart); respawn on next call
+            self._stop_subscriber()
+            return True
+        return SINK_CHANGE_EVENT in data
+
+    def _stop_subscriber(self) -> None:
+        if self._subscriber is not None:
+            self._subscriber.terminate()
+            self._subscriber.wait()
+            self._subscriber = None
+
+    def close(self) -> None:
+        """Stop the event subscriber process, if any."""
+        self._stop_subscriber()
+
+
+class PulseVolumeBackend:
+    """
+    Volume access over one long-lived libpulse connection via pulsectl.
+
+    The sink is resolved once at connect time; get/set are then a single
+    round trip on the existing socket instead of a process spawn.
+    """
+
+    name = BACKEND_NATIVE
+
+    def __init__(self, sink_id: str = DEFAULT_SINK_ID) -> None:
+        if pulsectl is None:
+            raise RuntimeError("pulsectl is not installed")
+
+        self.sink_id = sink_id
+        self._lock = threading.Lock()
+        self._pulse = None
+        self._events = None
+        self._sink_index: Optional[int] = None
+        self._connect()
+
+    def _connect(self) -> None:
+        """Open the connection and resolve the configured sink to an index."""
+        try:
+            self._pulse = pulsectl.Pulse(PULSE_CLIENT_NAME)
+            self._sink_index = self._resolve_sink().index
+        except pulsectl.PulseError as e:
+            self._release()
+            raise RuntimeError(f"Failed to connect to PulseAudio: {e}") from e
+
+    def _resolve_sink(self):
+        """Find the sink object matching sink_id (index, name or default alias)."""
+        if self.sink_id == DEFAULT_SINK_ALIAS:
+            default_name = self._pulse.server_info().default_sink_name
+            return self._pulse.get_sink_by_name(default_name)
+
+        if self.sink_id.isdigit():
+            return self._pulse.sink_info(int(self.sink_id))
+
+        return self._pulse.get_sink_by_name(self.sink_id)
+
+    def _reconnect(self) -> bool:
+        """Re-establish a dropped connection (e.g. sound server restart)."""
+        self._release()
+        try:
+            self._connect()
+            logger.info("Reconnected to PulseAudio")
+            return True
+        except RuntimeError as e:
+            logger.error(str(e))
+            return False
+
+    def _release(self) -> None:
+        if self._pulse is not None:
+            self._pulse.close()
+        self._pulse = None
+        self._sink_index = None
+
+    def set_volume(self, level: int) -> None:
+        """Set sink volume to a percentage on all channels."""
+        with self._lock:
+            for attempt in range(2):
+                if self._pulse is None and not self._reconnect():
+                    return
+                try:
+                    sink = self._pulse.sink_info(self._sink_index)
+                    self._pulse.volume_set_all_chans(sink, level / 100.0)
+                    return
+                except pulsectl.PulseDisconnected:
+                    if attempt == 0 and self._reconnect():
+                        continue
+                    logger.error("Failed to set volume: PulseAudio disconnected")
+                    return
+                except pulsectl.PulseError as e:
+                    logger.error(f"Failed to set volume: {e}")
+                    return
+
+    def get_volume(self) -> Optional[int]:
+        """Get sink volume as a percentage, or None if it cannot be read."""
+        with self._lock:
+            for attempt in range(2):
+                if self._pulse is None and not self._reconnect():
+                    return None
+                try:
+                    sink = self._pulse.sink_info(self._sink_index)
+                    return int(round(sink.volume.value_flat * 100))
+                except pulsectl.PulseDisconnected:
+                    if attempt == 0 and self._reconnect():
+                        continue
+                    logger.error("Failed to get volume level: PulseAudio disconnected")
+                    return None
+                except pulsectl.PulseError as e:
+                    logger.error(f"Failed to get volume level: {e}")
+                    return None
+        return None
+
+    def is_available(self) -> bool:
+        """Check if the connection to the sound server is alive."""
+        with self._lock:
+            return self._pulse is not None
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """
+        Wait for a change event on the resolved sink.
+
+        Events are read on a second connection so a blocking listen never
+        holds up get/set calls on the control connection.
+        """
+        if self._events is None:
+            try:
+                self._events = pulsectl.Pulse(PULSE_CLIENT_NAME + "-events")
+                self._events.event_mask_set('sink')
+            except pulsectl.PulseError as e:
+                logger.debug(f"PulseAudio event subscription failed, polling: {e}")
+                self._events = None
+                time.sleep(timeout)
+                return True
+
+        sink_index = self._sink_index
+        changed = False
+
+        def on_event(event) -> None:
+            nonlocal changed
+            if event.index == sink_index:
+                changed = True
+                raise pulsectl.PulseLoopStop
+
+        self._events.event_callback_set(on_event)
+        try:
+            self._events.event_listen(timeout=timeout)
+        except pulsectl.PulseDisconnected:
+            self._events.close()
+            self._events = None
+            return True
+        return changed
+
+    def close(self) -> None:
+        """Close the sound server connections."""
+        with self._lock:
+            self._release()
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+
+
+class VolumeController(BaseController):
+    """Controls system volume via PulseAudio."""
+
+    def __init__(self, sink_id: str = DEFAULT_SINK_ID, backend: str = BACKEND_AUTO) -> None:
+        """
+        Initialize volume controller.
+
+        Args:
+            sink_id: Sink index, sink name or "@DEFAULT_SINK@"
+            backend: "native" (pulsectl connection), "pactl" (subprocess per
+                call) or "auto" (native, falling back to pactl)
+        """
+        self.sink_id = sink_id
+        self._backend = self._create_backend(sink_id, backend)
+        logger.debug(f"Volume backend: {self._backend.name}")
+
+    @staticmethod
+    def _create_backend(sink_id: str, backend: str):
+        if backend not in (BACKEND_AUTO, BACKEND_NATIVE, BACKEND_PACTL):
+            raise ValueError(f"Unknown volume backend: {backend}")
+
+        if backend in (BACKEND_AUTO, BACKEND_NATIVE):
+            try:
+                return PulseVolumeBackend(sink_id)
+            except RuntimeError as e:
+                if backend == BACKEND_NATIVE:
+                    raise
+                logger.info(f"Native PulseAudio backend unavailable, using pactl: {e}")
+
+        return PactlVolumeBackend(sink_id)
+
+    @property
+    def backend_name(self) -> str:
+        """Name of the active backend ("native" or "pactl")."""
+        return self._backend.name
+
+    def set_level(self, level: int) -> None:
+        """Set volume to a percentage between 0 and 100."""
+        self._backend.set_volume(self.clamp(level))
+
+    def get_level(self) -> int:
+        """Get current volume level as a percentage."""
+        level = self._backend.get_volume()
+        return DEFAULT_VOLUME_LEVEL if level is None else level
+
+    def is_available(self) -> bool:
+        """Check if PulseAudio is running."""
+        return self._backend.is_available()
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Wait for a sink change notification from the sound server."""
+        return self._backend.wait_for_change(timeout)
+
+    def close(self) -> None:
+        """Release the sound server connection."""
+        self._backend.close()
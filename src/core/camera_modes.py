@@ -0,0 +1,188 @@
+"""Camera mode discovery and negotiation (resolution, frame rate, pixel format)."""
+
+import logging
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import List, Optional
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# Capture backends
+BACKEND_V4L2 = "v4l2"
+BACKEND_ANY = "any"
+CAPTURE_BACKENDS = {
+    BACKEND_V4L2: cv2.CAP_V4L2,
+    BACKEND_ANY: cv2.CAP_ANY,
+}
+
+# Pixel formats that need no decoding on the host
+UNCOMPRESSED_FOURCCS = ('YUYV', 'YUY2', 'UYVY', 'NV12', 'GREY')
+
+# Probed through OpenCV when v4l2-ctl is not installed
+FALLBACK_FOURCCS = ('MJPG', 'YUYV')
+FALLBACK_SIZES = ((320, 240), (640, 480), (800, 600), (1280, 720), (1920, 1080))
+FALLBACK_FPS = 60.0  # Requested so the driver reports its highest rate for the size
+
+V4L2_CTL_TIMEOUT_S = 5.0
+
+_FORMAT_RE = re.compile(r"\[\d+\]:\s+'(\w{4})'")
+_SIZE_RE = re.compile(r"Size:\s+\w+\s+(\d+)x(\d+)")
+_INTERVAL_RE = re.compile(r"Interval:.*\(([\d.]+) fps\)")
+
+
+@dataclass(frozen=True)
+class CameraMode:
+    """One capture mode a device supports (or was configured with)."""
+    width: int
+    height: int
+    fps: float
+    fourcc: str
+
+    @property
+    def compressed(self) -> bool:
+        """True if frames must be decoded (e.g. MJPEG) before use."""
+        return self.fourcc not in UNCOMPRESSED_FOURCCS
+
+    def __str__(self) -> str:
+        return f"{self.width}x{self.height} @ {self.fps:.1f} FPS {self.fourcc}"
+
+
+def capture_backend(name: str) -> int:
+    """
+    OpenCV API preference for a backend name.
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if name not in CAPTURE_BACKENDS:
+        raise ValueError(f"Unknown capture backend: {name}")
+    return CAPTURE_BACKENDS[name]
+
+
+def fourcc_to_str(value: float) -> str:
+    """Decode CAP_PROP_FOURCC's numeric value."""
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00')
+
+
+def parse_v4l2_formats(output: str) -> List[CameraMode]:
+    """Modes listed by `v4l2-ctl --list-formats-ext`."""
+    modes = []
+    fourcc = None
+    size = None
+    for line in output.splitlines():
+        match = _FORMAT_RE.search(line)
+        if match:
+            fourcc, size = match.group(1), None
+            continue
+        match = _SIZE_RE.search(line)
+        if match:
+            size = (int(match.group(1)), int(match.group(2)))
+            continue
+        match = _INTERVAL_RE.search(line)
+        if match and fourcc is not None and size is not None:
+            modes.append(CameraMode(size[0], size[1], float(match.group(1)), fourcc))
+    return modes
+
+
+def _probe_v4l2_ctl(index: int) -> Optional[List[CameraMode]]:
+    """Modes reported by v4l2-ctl, or None if it cannot be run."""
+    try:
+        result = subprocess.run(
+            ['v4l2-ctl', '-d', f'/dev/video{index}', '--list-formats-ext'],
+            capture_output=True,
+            text=True,
+            timeout=V4L2_CTL_TIMEOUT_S
+        )
+    except FileNotFoundError:
+        logger.debug("v4l2-ctl not found, probing modes through OpenCV")
+        return None
+    except subprocess.SubprocessError as e:
+        logger.warning(f"v4l2-ctl failed: {e}")
+        return None
+
+    if result.returncode != 0:
+        logger.warning(f"v4l2-ctl failed: {result.stderr.strip()}")
+        return None
+    return parse_v4l2_formats(result.stdout)
+
+
+def _probe_opencv(cap: cv2.VideoCapture) -> List[CameraMode]:
+    """Request common modes one by one and keep what the driver accepts."""
+    modes = set()
+    for fourcc in FALLBACK_FOURCCS:
+        for width, height in FALLBACK_SIZES:
+            mode = apply_mode(cap, CameraMode(width, height, FALLBACK_FPS, fourcc))
+            if mode.width == width and mode.height == height and mode.fourcc == fourcc:
+                modes.add(mode)
+    return sorted(modes, key=lambda m: (m.fourcc, m.width * m.height, m.fps))
+
+
+def probe_modes(index: int, cap: Optional[cv2.VideoCapture] = None) -> List[CameraMode]:
+    """
+    List the modes a camera supports.
+
+    Uses v4l2-ctl when installed. Otherwise common modes are requested
+    through `cap` (which changes its current mode); without `cap` the
+    result is then empty.
+    """
+    modes = _probe_v4l2_ctl(index)
+    if modes is None:
+        modes = _probe_opencv(cap) if cap is not None else []
+    for mode in modes:
+        logger.debug(f"  Camera mode: {mode}")
+    return modes
+
+
+def select_mode(modes: List[CameraMode], width: int, height: int) -> Optional[CameraMode]:
+    """
+    Pick the lowest-latency mode at least width x height.
+
+    Latency is dominated by the frame interval, so the highest frame rate
+    wins; then the fewest pixels (less to transfer and convert); then an
+    uncompressed format (no decode). If no mode is large enough, the
+    largest one is returned.
+
+    Returns:
+        The chosen mode, or None if there are no modes
+    """
+    if not modes:
+        return None
+    large_enough = [m for m in modes if m.width >= width and m.height >= height]
+    if not large_enough:
+        return max(modes, key=lambda m: (m.width * m.height, m.fps, not m.compressed))
+    return min(large_enough, key=lambda m: (-m.fps, m.width * m.height, m.compressed))
+
+
+def apply_mode(cap: cv2.VideoCapture, mode: CameraMode,
+               buffer_size: Optional[int] = None) -> CameraMode:
+    """
+    Request a mode and read back what the device accepted.
+
+    The pixel format is set first, since it limits the available sizes
+    and rates. Fields set to a false value (0, "") are left at the
+    driver's current setting.
+
+    Returns:
+        The mode actually in effect
+    """
+    if mode.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode.fourcc))
+    if mode.width:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    if mode.height:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    if mode.fps:
+        cap.set(cv2.CAP_PROP_FPS, mode.fps)
+    if buffer_size:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+    return CameraMode(
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        float(cap.get(cv2.CAP_PROP_FPS)),
+        fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC))
+    )
@@ -0,0 +1,115 @@
+"""Colour conversion and mirroring into preallocated frame buffers."""
+
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Mirror modes
+MIRROR_NONE = "none"            # Frames and landmarks as the camera sees them
+MIRROR_PIXELS = "pixels"        # Flip the image itself (selfie view)
+MIRROR_LANDMARKS = "landmarks"  # Leave pixels alone; HandTracker mirrors landmark x
+
+
+class BufferRing:
+    """
+    Fixed set of equally shaped buffers handed out round-robin.
+
+    A buffer is reused `count` frames later, so count must exceed the
+    number of frames that can be in flight downstream at once.
+    """
+
+    def __init__(self, count: int):
+        self._count = count
+        self._buffers: List[np.ndarray] = []
+        self._next = 0
+
+    def next(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """The next buffer, (re)allocated only when the frame shape changes."""
+        if not self._buffers or self._buffers[0].shape != shape:
+            self._buffers = [np.empty(shape, dtype=dtype) for _ in range(self._count)]
+            self._next = 0
+        buffer = self._buffers[self._next]
+        self._next = (self._next + 1) % self._count
+        return buffer
+
+
+class FramePreparer:
+    """
+    Turns a raw BGR camera frame into the model input and the display frame.
+
+    The model input is RGB, converted and mirrored with OpenCV's vectorized
+    kernels (a numpy strided copy does the same in one pass but is several
+    times slower). The display frame (BGR, mirrored for the selfie view)
+    is only produced when something renders it.
+    Both outputs are written into preallocated ring buffers, so steady
+    state does no per-frame allocation.
+    """
+
+    def __init__(self, mirror: str = MIRROR_PIXELS, display: bool = True,
+                 ring_size: int = 8, inference_width: Optional[int] = None):
+        """
+        Args:
+            mirror: MIRROR_PIXELS, MIRROR_LANDMARKS or MIRROR_NONE
+            display: Also produce the BGR display frame
+            ring_size: Buffers per output; must exceed the frames in flight
+            inference_width: Downscale the model input to this width
+                (aspect ratio kept, never upscaled); None for full resolution.
+                Landmarks are normalized, so they still map onto the
+                full-resolution display frame.
+
+        Raises:
+            ValueError: If the mirror mode is unknown
+        """
+        if mirror not in (MIRROR_NONE, MIRROR_PIXELS, MIRROR_LANDMARKS):
+            raise ValueError(f"Unknown mirror mode: {mirror}")
+        self.mirror = mirror
+        self.display = display
+        self.inference_width = inference_width
+        self._rgb = BufferRing(ring_size)
+        self._bgr = BufferRing(ring_size)
+
+    @property
+    def mirror_landmarks(self) -> bool:
+        """True when mirroring is left to landmark space."""
+        return self.mirror == MIRROR_LANDMARKS
+
+    def prepare(self, frame: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Convert one frame.
+
+        Args:
+            frame: Raw BGR frame; only read, so it may be a reused capture buffer
+
+        Returns:
+            (rgb, display): model input (possibly downscaled), and the
+            full-resolution BGR display frame or None
+        """
+        height, width = frame.shape[:2]
+        scaled = self.inference_width is not None and self.inference_width < width
+        if scaled:
+            # Downscale first so conversion and flip touch only the small image
+            size = (self.inference_width, max(1, round(height * self.inference_width / width)))
+            rgb = self._rgb.next((size[1], size[0]) + frame.shape[2:])
+            cv2.resize(frame, size, dst=rgb, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(rgb, cv2.COLOR_BGR2RGB, dst=rgb)
+        else:
+            rgb = self._rgb.next(frame.shape)
+            # One pass reads the (possibly uncached) source frame; the flip then
+            # runs in place on the freshly written, cache-hot buffer
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        if self.mirror == MIRROR_PIXELS:
+            cv2.flip(rgb, 1, dst=rgb)
+
+        display = None
+        if self.display:
+            display = self._bgr.next(frame.shape)
+            if self.mirror == MIRROR_NONE:
+                np.copyto(display, frame)
+            elif self.mirror == MIRROR_PIXELS and not scaled:
+                # Already mirrored; swapping channels back is cheaper than flipping
+                cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=display)
+            else:
+                # The selfie view is mirrored on screen either way
+                cv2.flip(frame, 1, dst=display)
+        return rgb, display
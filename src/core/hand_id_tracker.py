@@ -0,0 +1,141 @@
+"""Stable per-hand identities across frames."""
+
+from typing import List
+
+import numpy as np
+
+from src.gestures.features import WRIST
+
+# Matching thresholds
+DEFAULT_MAX_MATCH_DISTANCE = 0.25   # Normalized wrist movement allowed between frames
+DEFAULT_MAX_MISSED_FRAMES = 3       # Frames a slot survives without its hand
+HANDEDNESS_MISMATCH_PENALTY = 0.1   # Handedness can flicker, so prefer but do not require it
+
+
+class HandIdTracker:
+    """
+    Assigns each detected hand a slot that stays the same while it is tracked.
+
+    Hands are matched to the previous frame's hands by wrist position
+    (greedy nearest match, with a small penalty for a handedness change).
+    A slot is released once its hand has been missing for a few frames
+    and is then reused. All state lives in fixed-size arrays indexed by
+    slot, so per-hand state elsewhere can use the same slot indices.
+    """
+
+    def __init__(self, num_slots: int = 2,
+                 max_match_distance: float = DEFAULT_MAX_MATCH_DISTANCE,
+                 max_missed_frames: int = DEFAULT_MAX_MISSED_FRAMES):
+        """
+        Args:
+            num_slots: Maximum hands tracked at once (at least num_hands)
+            max_match_distance: Largest wrist movement still treated as the same hand
+            max_missed_frames: Frames a slot is kept for a hand that dropped out
+        """
+        self.num_slots = num_slots
+        self._max_match_distance = max_match_distance
+        self._max_missed_frames = max_missed_frames
+
+        self._ids = np.full(num_slots, -1, dtype=np.int64)    # -1 = free
+        self._wrists = np.zeros((num_slots, 2), dtype=np.float32)
+        self._right = np.zeros(num_slots, dtype=bool)
+        self._missed = np.zeros(num_slots, dtype=np.int32)
+        self._next_id = 0
+
+        # Reused per-frame buffers
+        self._cost = np.empty((num_slots, num_slots), dtype=np.float32)
+        self._dy = np.empty((num_slots, num_slots), dtype=np.float32)
+        self._mismatch = np.empty((num_slots, num_slots), dtype=bool)
+        self._hand_right = np.empty(num_slots, dtype=bool)
+        self._slots = np.empty(num_slots, dtype=np.intp)
+        self._started = np.empty(num_slots, dtype=bool)
+        self._matched = np.empty(num_slots, dtype=bool)
+        self._last_n = 0
+
+    def update(self, points: np.ndarray, handedness: List[str]) -> np.ndarray:
+        """
+        Match this frame's hands to slots.
+
+        Args:
+            points: (n, 21, 3) landmarks of this frame's hands
+            handedness: "Left"/"Right" per hand
+
+        Returns:
+            Slot index per hand, reused by the next call. Hands beyond
+            num_slots are not tracked, so it may be shorter than the input.
+        """
+        n = min(points.shape[0], self.num_slots)
+        self._last_n = n
+        slots = self._slots[:n]
+        started = self._started[:n]
+        matched = self._matched
+        slots.fill(-1)
+        started.fill(False)
+        matched.fill(False)
+
+        if n:
+            wrists = points[:n, WRIST, :2]
+            right = self._hand_right[:n]
+            for hand in range(n):
+                right[hand] = handedness[hand] == 'Right'
+
+            cost = self._cost[:n]
+            dy = self._dy[:n]
+            np.subtract(wrists[:, 0, np.newaxis], self._wrists[np.newaxis, :, 0], out=cost)
+            np.subtract(wrists[:, 1, np.newaxis], self._wrists[np.newaxis, :, 1], out=dy)
+            np.hypot(cost, dy, out=cost)
+            mismatch = np.not_equal(right[:, np.newaxis], self._right[np.newaxis],
+                                    out=self._mismatch[:n])
+            np.add(cost, HANDEDNESS_MISMATCH_PENALTY, out=cost, where=mismatch)
+            cost[:, self._ids < 0] = np.inf
+            cost[cost > self._max_match_distance] = np.inf
+
+            # Greedy: repeatedly take the closest remaining (hand, slot) pair
+            for _ in range(n):
+                flat = int(np.argmin(cost))
+                hand, slot = divmod(flat, self.num_slots)
+                if not np.isfinite(cost[hand, slot]):
+                    break
+                slots[hand] = slot
+                matched[slot] = True
+                cost[hand, :] = np.inf
+                cost[:, slot] = np.inf
+
+            for hand in np.flatnonzero(slots < 0):
+                slot = self._allocate()
+                slots[hand] = slot
+                started[hand] = True
+                matched[slot] = True
+
+            self._wrists[slots] = wrists
+            self._right[slots] = right
+
+        # Age out slots whose hand was not seen this frame
+        active = self._ids >= 0
+        self._missed[matched] = 0
+        self._missed[active & ~matched] += 1
+        self._ids[active & ~matched & (self._missed > self._max_missed_frames)] = -1
+        return slots
+
+    def _allocate(self) -> int:
+        """Take a free slot, or evict the longest-missing unmatched one."""
+        free = np.flatnonzero((self._ids < 0) & ~self._matched)
+        if free.size:
+            slot = int(free[0])
+        else:
+            candidates = np.where(self._matched, -1, self._missed)
+            slot = int(np.argmax(candidates))
+
+        self._ids[slot] = self._next_id
+        self._next_id += 1
+        self._missed[slot] = 0
+        return slot
+
+    @property
+    def started(self) -> np.ndarray:
+        """Per hand of the last update: True if it got a new ID (its slot state is stale)."""
+        return self._started[:self._last_n]
+
+    def hand_id(self, slot: int) -> int:
+        """ID of the hand currently owning a slot, or -1 if free."""
+        return int(self._ids[slot])
@@ -1,20 +1,44 @@
 """Hand tracking using MediaPipe."""
 
-from dataclasses import dataclass
-from typing import List, Optional
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import cv2
 import mediapipe as mp
+import numpy as np
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
+from src.utils.geometry import landmarks_to_array
+
+# Running modes
+RUNNING_MODE_VIDEO = "video"              # Blocking detect_for_video per frame
+RUNNING_MODE_LIVE_STREAM = "live_stream"  # detect_async with result callback
+
+# Region-of-interest defaults
+DEFAULT_ROI_SIZE = 256           # Side of the square crop fed to the model (px)
+DEFAULT_ROI_PADDING = 0.5        # Padding around the hands, fraction of box size
+DEFAULT_ROI_REFRESH_FRAMES = 30  # Full-frame detection at least this often
+
+# Pixel box (x0, y0, x1, y1) in full-frame coordinates
+Box = Tuple[int, int, int, int]
+
 
 @dataclass
 class Hand:
     """Represents a detected hand with landmarks and metadata."""
-    landmarks: List  # List of 21 MediaPipe landmarks
-    handedness: str  # "Left" or "Right"
+    points: np.ndarray  # (21, 3) float32 normalized [x, y, z] per landmark
+    handedness: str     # "Left" or "Right"
     confidence: float = 1.0
 
 
+@dataclass
+class HandResult:
+    """Hands detected in one frame, tagged with that frame's timestamp."""
+    timestamp_ms: int
+    hands: List[Hand] = field(default_factory=list)
+
+
 class HandTracker:
     """Wrapper around MediaPipe HandLandmarker."""
 
@@ -22,7 +46,14 @@ class HandTracker:
                  model_path: str = 'hand_landmarker.task',
                  num_hands: int = 2,
                  min_detection_confidence: float = 0.5,
-                 min_tracking_confidence: float = 0.5):
+                 min_tracking_confidence: float = 0.5,
+                 running_mode: str = RUNNING_MODE_VIDEO,
+                 result_callback: Optional[Callable[[HandResult], None]] = None,
+                 roi_enabled: bool = False,
+                 roi_size: int = DEFAULT_ROI_SIZE,
+                 roi_padding: float = DEFAULT_ROI_PADDING,
+                 roi_refresh_frames: int = DEFAULT_ROI_REFRESH_FRAMES,
+                 mirror_landmarks: bool = False):
         """
         Initialize hand tracker.
 
@@ -31,15 +62,47 @@ class HandTracker:
             num_hands: Maximum number of hands to detect
             min_detection_confidence: Minimum confidence for detection
             min_tracking_confidence: Minimum confidence for tracking
+            running_mode: "video" (synchronous, deterministic) or
+                "live_stream" (asynchronous; frames arriving while inference
+                is busy are dropped)
+            result_callback: Called with each HandResult in live_stream mode
+            roi_enabled: Crop around the previous frame's hands before inference
+            roi_size: Side length the crop is resized to
+            roi_padding: Padding added around the hands' bounding box
+            roi_refresh_frames: Run full-frame detection at least this often
+            mirror_landmarks: Frames are not flipped; mirror landmark x
+                instead so hands come out as on a mirrored frame
         """
+        if running_mode not in (RUNNING_MODE_VIDEO, RUNNING_MODE_LIVE_STREAM):
+            raise ValueError(f"Unknown running mode: {running_mode}")
+
+        self.running_mode = running_mode
+        self._result_callback = result_callback
+        self._lock = threading.Lock()
+        self._in_flight = False
+        self._latest = HandResult(timestamp_ms=-1)
+        self.dropped_frames = 0
+
+        self.roi_enabled = roi_enabled
+        self._roi_size = roi_size
+        self._roi_padding = roi_padding
+        self._roi_refresh_frames = roi_refresh_frames
+        self._roi: Optional[Box] = None
+        self._frames_since_full = 0
+        self._pending_boxes: Dict[int, Tuple] = {}  # timestamp -> (box, frame shape)
+        self._roi_buffer: Optional[np.ndarray] = None  # Reused crop resize output
+        self.mirror_landmarks = mirror_landmarks
+
+        live = running_mode == RUNNING_MODE_LIVE_STREAM
         base_options = python.BaseOptions(model_asset_path=model_path)
         options = vision.HandLandmarkerOptions(
             base_options=base_options,
-            running_mode=vision.RunningMode.VIDEO,
+            running_mode=vision.RunningMode.LIVE_STREAM if live else vision.RunningMode.VIDEO,
             num_hands=num_hands,
             min_hand_detection_confidence=min_detection_confidence,
             min_hand_presence_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result if live else None
         )
 
         self.landmarker = vision.HandLandmarker.create_from_options(options)
@@ -48,31 +111,166 @@ class HandTracker:
         """
         Process frame and return detected hands.
 
+        In live_stream mode the frame is submitted for asynchronous inference
+        and the most recent completed result is returned immediately; check
+        latest_result.timestamp_ms for the frame it belongs to.
+
         Args:
-            frame: Video frame (numpy array)
+            frame: RGB video frame (numpy array)
             timestamp_ms: Timestamp in milliseconds
 
         Returns:
             List of Hand objects
         """
-        mp_frame = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame)
+        if self.running_mode == RUNNING_MODE_LIVE_STREAM:
+            self.submit(frame, timestamp_ms)
+            return self._latest.hands
+
+        image, box = self._prepare_input(frame)
+        mp_frame = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
         results = self.landmarker.detect_for_video(mp_frame, timestamp_ms)
+        hands = self._to_hands(results, box, frame.shape)
+        self._update_roi(hands, frame.shape)
+        self._latest = HandResult(timestamp_ms, hands)
+        return self._latest.hands
+
+    def submit(self, frame, timestamp_ms: int) -> bool:
+        """
+        Start asynchronous inference on a frame (live_stream mode only).
+
+        Returns:
+            False if the frame was dropped because inference is still busy
+        """
+        with self._lock:
+            if self._in_flight:
+                self.dropped_frames += 1
+                return False
+            self._in_flight = True
 
+        image, box = self._prepare_input(frame)
+        self._pending_boxes[timestamp_ms] = (box, frame.shape)
+        mp_frame = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
+        try:
+            self.landmarker.detect_async(mp_frame, timestamp_ms)
+        except Exception:
+            self._pending_boxes.pop(timestamp_ms, None)
+            with self._lock:
+                self._in_flight = False
+            raise
+        return True
+
+    def _on_result(self, results, output_image, timestamp_ms: int) -> None:
+        """MediaPipe live-stream callback."""
+        box, frame_shape = self._pending_boxes.pop(timestamp_ms, (None, None))
+        hands = self._to_hands(results, box, frame_shape)
+        if frame_shape is not None:
+            self._update_roi(hands, frame_shape)
+        result = HandResult(timestamp_ms, hands)
+        with self._lock:
+            self._latest = result
+            self._in_flight = False
+
+        if self._result_callback is not None:
+            self._result_callback(result)
+
+    @property
+    def latest_result(self) -> HandResult:
+        """Most recent completed detection result."""
+        return self._latest
+
+    def _prepare_input(self, frame) -> Tuple:
+        """
+        Choose the image to run inference on.
+
+        Returns:
+            (image, box) where box is the crop region in frame pixels, or None
+            when the full frame is used
+        """
+        use_roi = (self.roi_enabled and self._roi is not None and
+                   self._frames_since_full < self._roi_refresh_frames)
+        if not use_roi:
+            self._frames_since_full = 0
+            return frame, None
+
+        self._frames_since_full += 1
+        x0, y0, x1, y1 = self._roi
+        shape = (self._roi_size, self._roi_size) + frame.shape[2:]
+        if self._roi_buffer is None or self._roi_buffer.shape != shape:
+            self._roi_buffer = np.empty(shape, dtype=frame.dtype)
+        # mp.Image copies its input, so the buffer can be reused next frame
+        crop = cv2.resize(frame[y0:y1, x0:x1], (self._roi_size, self._roi_size),
+                          dst=self._roi_buffer, interpolation=cv2.INTER_AREA)
+        return crop, self._roi
+
+    def _update_roi(self, hands: List[Hand], frame_shape) -> None:
+        """Compute the next crop from these hands; drop it when tracking is lost."""
+        if not self.roi_enabled:
+            return
+        if not hands:
+            self._roi = None
+            return
+
+        height, width = frame_shape[:2]
+        points = np.concatenate([hand.points[:, :2] for hand in hands])
+        min_x, min_y = points.min(axis=0)
+        max_x, max_y = points.max(axis=0)
+        if self.mirror_landmarks:
+            # The crop is taken from the unmirrored frame
+            min_x, max_x = 1.0 - max_x, 1.0 - min_x
+        min_x, max_x = min_x * width, max_x * width
+        min_y, max_y = min_y * height, max_y * height
+
+        # Square box so the resize to roi_size keeps the aspect ratio
+        side = max(max_x - min_x, max_y - min_y) * (1 + 2 * self._roi_padding)
+        side = int(min(side, width, height))
+        if side < 2:
+            self._roi = None
+            return
+
+        # Shift (rather than clip) the box to stay inside the frame
+        center_x = (min_x + max_x) / 2
+        center_y = (min_y + max_y) / 2
+        x0 = int(min(max(center_x - side / 2, 0), width - side))
+        y0 = int(min(max(center_y - side / 2, 0), height - side))
+        self._roi = (x0, y0, x0 + side, y0 + side)
+
+    def _to_hands(self, results, box: Optional[Box] = None, frame_shape=None) -> List[Hand]:
+        """Convert a HandLandmarkerResult to Hand objects in full-frame coordinates."""
         hands = []
         if results.hand_landmarks:
             for idx in range(len(results.hand_landmarks)):
-                # Swap handedness because frame is horizontally flipped for mirror mode
                 detected_hand = results.handedness[idx][0].category_name
-                corrected_hand = "Right" if detected_hand == "Left" else "Left"
+                if self.mirror_landmarks:
+                    # Unflipped input already yields the mirrored-view label
+                    corrected_hand = detected_hand
+                else:
+                    # Swap handedness because frame is horizontally flipped for mirror mode
+                    corrected_hand = "Right" if detected_hand == "Left" else "Left"
+
+                points = landmarks_to_array(results.hand_landmarks[idx])
+                if box is not None:
+                    HandTracker._crop_to_frame(points, box, frame_shape)
+                if self.mirror_landmarks:
+                    np.subtract(1.0, points[:, 0], out=points[:, 0])
 
                 hands.append(Hand(
-                    landmarks=results.hand_landmarks[idx],
+                    points=points,
                     handedness=corrected_hand,
                     confidence=results.handedness[idx][0].score
                 ))
 
         return hands
 
+    @staticmethod
+    def _crop_to_frame(points: np.ndarray, box: Box, frame_shape) -> None:
+        """Map crop-normalized points back to full-frame normalized coordinates in place."""
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = box
+        scale_x = (x1 - x0) / width
+        # MediaPipe z shares the x scale
+        points *= (scale_x, (y1 - y0) / height, scale_x)
+        points += (x0 / width, y0 / height, 0.0)
+
     def close(self):
         """Clean up resources."""
         self.landmarker.close()
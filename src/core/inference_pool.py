@@ -0,0 +1,346 @@
+"""Hand landmark inference in worker processes with shared-memory frame transport."""
+
+import logging
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.core.hand_tracker import RUNNING_MODE_VIDEO, Hand, HandResult, HandTracker
+from src.core.landmark_recording import HANDEDNESS_CODES, NUM_LANDMARKS
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration
+TASKS_PER_WORKER = 2          # One running plus one queued keeps a worker busy
+MAX_WORKER_RESTARTS = 3       # Per worker, before the pool gives up
+SLOT_WAIT_POLL_S = 0.005      # Result polling while blocked on a free slot
+WORKER_JOIN_TIMEOUT_S = 2.0
+
+# Worker -> parent: (worker, seq, slot, timestamp_ms, points (n, 21, 3), handedness codes, confidences)
+WorkerResult = Tuple[int, int, int, int, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _worker_main(worker: int, shm_name: str, slot_shape: Tuple[int, ...], num_slots: int,
+                 tasks: Any, results: Any, tracker_kwargs: Dict[str, Any]) -> None:
+    """
+    Worker process: run the landmarker on frames placed in shared-memory slots.
+
+    Tasks are (seq, slot, timestamp_ms) tuples; None ends the worker.
+    """
+    shm = SharedMemory(name=shm_name, track=False)
+    frames = np.ndarray((num_slots,) + slot_shape, dtype=np.uint8, buffer=shm.buf)
+    tracker = HandTracker(**tracker_kwargs, running_mode=RUNNING_MODE_VIDEO)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot, timestamp_ms = task
+            hands = tracker.process_frame(frames[slot], timestamp_ms)
+
+            points = np.empty((len(hands), NUM_LANDMARKS, 3), dtype=np.float32)
+            codes = np.empty(len(hands), dtype=np.uint8)
+            confidences = np.empty(len(hands), dtype=np.float32)
+            for idx, hand in enumerate(hands):
+                points[idx] = hand.points
+                codes[idx] = HANDEDNESS_CODES.index(hand.handedness)
+                confidences[idx] = hand.confidence
+            results.put((worker, seq, slot, timestamp_ms, points, codes, confidences))
+    finally:
+        tracker.close()
+        del frames
+        shm.close()
+
+
+class InferencePool:
+    """
+    Runs HandTracker instances in worker processes.
+
+    Frames are copied into slots of one shared-memory block, so only a
+    small (seq, slot, timestamp) tuple is pickled per frame; results come
+    back as landmark arrays. Each worker has its own task queue, so frames
+    reach a worker in timestamp order as MediaPipe's VIDEO mode requires.
+    Results from different workers are reordered by sequence number
+    before they are published.
+
+    Without `block`, behaves like HandTracker in live_stream mode:
+    process_frame() submits a frame and returns a completed result of an
+    earlier frame. Every in-order result is handed out, one per call, so
+    none is skipped. With `block`, process_frame() waits for the frame's
+    own result, which keeps file input lossless and exactly matched at the
+    cost of running one frame at a time.
+
+    Each worker has its own task and result queues, recreated when it is
+    restarted, so a worker killed mid-write cannot corrupt a pipe another
+    worker uses. A worker that dies is restarted and its frames are
+    skipped, so an inference crash does not take down the control loop.
+
+    Each worker keeps its own tracking (and ROI) state from the frames it
+    sees, which are every num_workers-th frame.
+    """
+
+    def __init__(self, num_workers: int = 2, tracker_kwargs: Optional[Dict[str, Any]] = None,
+                 block: bool = False):
+        """
+        Args:
+            num_workers: Worker processes, each with its own landmarker
+            tracker_kwargs: HandTracker arguments (running_mode is always "video")
+            block: Wait for each frame's result instead of dropping frames
+                when all workers are busy (for lossless file input)
+        """
+        if num_workers < 1:
+            raise ValueError("Inference pool needs at least one worker")
+
+        self.num_workers = num_workers
+        self._tracker_kwargs = dict(tracker_kwargs or {})
+        self._tracker_kwargs.pop('running_mode', None)
+        self._block = block
+        self._context = mp.get_context('spawn')  # MediaPipe is not fork-safe
+
+        self._num_slots = num_workers * TASKS_PER_WORKER
+        self._shm: Optional[SharedMemory] = None
+        self._frames: Optional[np.ndarray] = None
+        self._free_slots: Deque[int] = deque(range(self._num_slots))
+
+        self._workers: List[Optional[mp.Process]] = [None] * num_workers
+        self._task_queues: List[Any] = [None] * num_workers
+        self._result_queues: List[Any] = [None] * num_workers
+        self._pending: List[Deque[Tuple[int, int]]] = [deque() for _ in range(num_workers)]
+        self._restarts = [0] * num_workers
+
+        # Reorder buffer: results are published strictly in submission order
+        self._next_seq = 0                                 # Next sequence number to assign
+        self._publish_seq = 0                              # Next sequence number to publish
+        self._ready: Dict[int, HandResult] = {}
+        self._lost: Set[int] = set()                       # Frames of crashed workers
+        self._published: Deque[HandResult] = deque()       # In order, not yet handed out
+        self._latest = HandResult(timestamp_ms=-1)
+        self._last_timestamp_ms = -1
+
+        self.dropped_frames = 0
+        self.lost_frames = 0
+
+    def _start(self, frame: np.ndarray) -> None:
+        """Size the shared slots from the first frame and start the workers."""
+        slot_shape = frame.shape
+        self._shm = SharedMemory(create=True, size=self._num_slots * frame.nbytes)
+        self._frames = np.ndarray((self._num_slots,) + slot_shape, dtype=np.uint8,
+                                  buffer=self._shm.buf)
+        for worker in range(self.num_workers):
+            self._spawn(worker)
+        logger.info(f"Inference pool: {self.num_workers} workers, {self._num_slots} "
+                    f"shared slots of {slot_shape[1]}x{slot_shape[0]}")
+
+    def _spawn(self, worker: int) -> None:
+        tasks = self._context.Queue()
+        results = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker, self._shm.name, self._frames.shape[1:], self._num_slots,
+                  tasks, results, self._tracker_kwargs),
+            name=f"inference-{worker}",
+            daemon=True
+        )
+        process.start()
+        self._workers[worker] = process
+        self._task_queues[worker] = tasks
+        self._result_queues[worker] = results
+
+    def process_frame(self, frame: np.ndarray, timestamp_ms: int) -> List[Hand]:
+        """
+        Submit a frame and return the next in-order result.
+
+        Args:
+            frame: RGB video frame; copied into a shared slot
+            timestamp_ms: Timestamp in milliseconds
+
+        Returns:
+            Hands of the result handed out by this call, or of the previous
+            one if none is ready (check latest_result for its frame)
+
+        Raises:
+            ValueError: If the frame shape differs from the first frame's
+            RuntimeError: If a worker keeps crashing
+        """
+        if self._shm is None:
+            self._start(frame)
+        if frame.shape != self._frames.shape[1:]:
+            raise ValueError(f"Frame shape {frame.shape} differs from the pool's "
+                             f"{self._frames.shape[1:]}")
+
+        self._collect()
+        self._check_workers()
+        if timestamp_ms > self._last_timestamp_ms and self.submit(frame, timestamp_ms):
+            if self._block:
+                self._wait_for(self._next_seq)
+        if self._published:
+            self._latest = self._published.popleft()
+        return self._latest.hands
+
+    def submit(self, frame: np.ndarray, timestamp_ms: int) -> bool:
+        """
+        Hand a frame to the least busy worker.
+
+        Returns:
+            False if the frame was dropped because every worker is busy
+        """
+        worker = self._idle_worker()
+        while worker is None or not self._free_slots:
+            if not self._block:
+                self.dropped_frames += 1
+                return False
+            self._wait_for_result()
+            worker = self._idle_worker()
+
+        slot = self._free_slots.popleft()
+        np.copyto(self._frames[slot], frame)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._last_timestamp_ms = timestamp_ms
+        self._pending[worker].append((seq, slot))
+        self._task_queues[worker].put((seq, slot, timestamp_ms))
+        return True
+
+    def _idle_worker(self) -> Optional[int]:
+        """Worker with the fewest queued frames, or None if all are full."""
+        worker = min(range(self.num_workers), key=lambda w: len(self._pending[w]))
+        if len(self._pending[worker]) >= TASKS_PER_WORKER:
+            return None
+        return worker
+
+    def _wait_for(self, end_seq: int) -> None:
+        """Wait until every frame before end_seq has been published or lost."""
+        while self._publish_seq < end_seq:
+            self._wait_for_result()
+
+    def _wait_for_result(self) -> None:
+        """Poll until at least one result arrives or a worker is restarted."""
+        while not self._collect():
+            if self._check_workers():
+                return
+            time.sleep(SLOT_WAIT_POLL_S)
+
+    def _collect(self) -> int:
+        """
+        Take finished results off the workers' queues and publish those now in order.
+
+        Returns:
+            Number of results taken
+        """
+        taken = 0
+        for worker, results in enumerate(self._result_queues):
+            if results is None:
+                continue
+            while True:
+                try:
+                    item: WorkerResult = results.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+
+                _, seq, slot, timestamp_ms, points, codes, confidences = item
+                self._pending[worker].remove((seq, slot))
+                self._free_slots.append(slot)
+                self._ready[seq] = HandResult(timestamp_ms, [
+                    Hand(points=points[idx], handedness=HANDEDNESS_CODES[codes[idx]],
+                         confidence=float(confidences[idx]))
+                    for idx in range(len(codes))
+                ])
+        self._publish()
+        return taken
+
+    def _publish(self) -> None:
+        while True:
+            seq = self._publish_seq
+            if seq in self._lost:
+                self._lost.discard(seq)
+            elif seq in self._ready:
+                self._published.append(self._ready.pop(seq))
+            else:
+                break
+            self._publish_seq += 1
+
+    def _check_workers(self) -> bool:
+        """
+        Restart dead workers and skip the frames they held.
+
+        Returns:
+            True if any worker was restarted
+        """
+        restarted = False
+        for worker, process in enumerate(self._workers):
+            if process is None or process.exitcode is None:
+                continue
+
+            logger.error(f"Inference worker {worker} died (exit code {process.exitcode})")
+            # Its result queue is not read again: a write cut short would
+            # leave a partial message that blocks the reader
+            self._result_queues[worker] = None
+            for seq, slot in self._pending[worker]:
+                self._lost.add(seq)
+                self._free_slots.append(slot)
+                self.lost_frames += 1
+            self._pending[worker].clear()
+            self._publish()
+
+            if self._restarts[worker] >= MAX_WORKER_RESTARTS:
+                self._workers[worker] = None
+                raise RuntimeError(f"Inference worker {worker} crashed "
+                                   f"{MAX_WORKER_RESTARTS + 1} times")
+            self._restarts[worker] += 1
+            self._spawn(worker)
+            restarted = True
+        return restarted
+
+    @property
+    def latest_result(self) -> HandResult:
+        """Most recent result published in submission order."""
+        return self._latest
+
+    def drain(self, timeout: float = WORKER_JOIN_TIMEOUT_S) -> List[HandResult]:
+        """
+        Wait for frames still in flight and take every result not yet handed out.
+
+        Returns:
+            Remaining results in submission order
+        """
+        deadline = time.monotonic() + timeout
+        while self._publish_seq < self._next_seq and time.monotonic() < deadline:
+            if not self._collect():
+                self._check_workers()
+                time.sleep(SLOT_WAIT_POLL_S)
+        results = list(self._published)
+        self._published.clear()
+        return results
+
+    def close(self) -> None:
+        """Drain results, stop the workers and free the shared memory."""
+        # Workers cannot exit while their result queues hold unread data
+        discarded = len(self.drain()) if self._shm is not None else 0
+        if discarded:
+            logger.info(f"Inference pool: {discarded} results discarded at shutdown")
+        for worker, process in enumerate(self._workers):
+            if process is not None and process.is_alive():
+                self._task_queues[worker].put(None)
+        deadline = time.monotonic() + WORKER_JOIN_TIMEOUT_S
+        for process in self._workers:
+            if process is None:
+                continue
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Terminating unresponsive {process.name}")
+                process.terminate()
+                process.join()
+
+        if self._shm is not None:
+            self._frames = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        if self.lost_frames:
+            logger.info(f"Inference pool: {self.lost_frames} frames lost to worker crashes")
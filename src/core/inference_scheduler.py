@@ -0,0 +1,93 @@
+"""Adaptive inference frame-skipping with landmark extrapolation."""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.hand_tracker import Hand
+
+# Inference intervals per activity level
+DEFAULT_IDLE_INTERVAL_MS = 250      # No hands in view
+DEFAULT_TRACKING_INTERVAL_MS = 50   # Hands in view, no gesture active
+DEFAULT_MAX_EXTRAPOLATION_MS = 100  # Beyond this, hold the last landmarks still
+
+
+class AdaptiveInferenceScheduler:
+    """
+    Decides per frame whether to run the landmarker.
+
+    Inference runs on every frame while a gesture is active, at a reduced
+    rate while hands are visible but idle, and at a low idle rate when no
+    hands are in view. Skipped frames get landmarks extrapolated from the
+    velocity between the last two inferred results.
+    """
+
+    def __init__(self,
+                 idle_interval_ms: int = DEFAULT_IDLE_INTERVAL_MS,
+                 tracking_interval_ms: int = DEFAULT_TRACKING_INTERVAL_MS,
+                 max_extrapolation_ms: int = DEFAULT_MAX_EXTRAPOLATION_MS):
+        self._idle_interval_ms = idle_interval_ms
+        self._tracking_interval_ms = tracking_interval_ms
+        self._max_extrapolation_ms = max_extrapolation_ms
+
+        self._gesture_active = False
+        self._last_infer_ms: Optional[int] = None
+        self._last_hands: List[Hand] = []
+        # handedness -> (21, 3) landmark velocity per millisecond
+        self._velocities: Dict[str, np.ndarray] = {}
+
+        self.inferred_frames = 0
+        self.skipped_frames = 0
+
+    def set_gesture_active(self, active: bool) -> None:
+        """Report whether any gesture is currently active (from the gesture stage)."""
+        self._gesture_active = active
+
+    def should_infer(self, timestamp_ms: int) -> bool:
+        """Check if this frame should go through the landmarker."""
+        if self._gesture_active or self._last_infer_ms is None:
+            return True
+
+        interval = self._tracking_interval_ms if self._last_hands else self._idle_interval_ms
+        return timestamp_ms - self._last_infer_ms >= interval
+
+    def observe(self, timestamp_ms: int, hands: List[Hand]) -> None:
+        """Record an inferred result and update per-hand landmark velocities."""
+        if self._last_infer_ms is not None and timestamp_ms <= self._last_infer_ms:
+            return  # Result already observed (e.g. reused while the pool is busy)
+
+        velocities = {}
+        if self._last_infer_ms is not None:
+            dt = timestamp_ms - self._last_infer_ms
+            previous = {hand.handedness: hand for hand in self._last_hands}
+            for hand in hands:
+                prev = previous.get(hand.handedness)
+                if prev is None:
+                    continue
+                velocities[hand.handedness] = (hand.points - prev.points) / dt
+
+        self._velocities = velocities
+        self._last_hands = hands
+        self._last_infer_ms = timestamp_ms
+        self.inferred_frames += 1
+
+    def extrapolate(self, timestamp_ms: int) -> List[Hand]:
+        """Predict hands for a skipped frame from the last result and its velocity."""
+        self.skipped_frames += 1
+        if self._last_infer_ms is None:
+            return []
+
+        dt = min(timestamp_ms - self._last_infer_ms, self._max_extrapolation_ms)
+        hands = []
+        for hand in self._last_hands:
+            velocity = self._velocities.get(hand.handedness)
+            if velocity is None or dt <= 0:
+                hands.append(hand)
+                continue
+
+            hands.append(Hand(
+                points=hand.points + velocity * dt,
+                handedness=hand.handedness,
+                confidence=hand.confidence
+            ))
+        return hands
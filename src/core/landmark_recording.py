@@ -0,0 +1,173 @@
+"""Record hand landmark streams to a compact memory-mappable file and read them back."""
+
+import logging
+import os
+from typing import BinaryIO, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.hand_tracker import Hand
+
+logger = logging.getLogger(__name__)
+
+FILE_MAGIC = b"HCLMK\x00\x00\x01"
+FORMAT_VERSION = 1
+
+NUM_LANDMARKS = 21
+HANDEDNESS_CODES = ('Left', 'Right')
+HANDEDNESS_CODE = {name: code for code, name in enumerate(HANDEDNESS_CODES)}
+
+# Fixed 32-byte file header
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('record_size', '<u4'),
+    ('frame_width', '<u4'),
+    ('frame_height', '<u4'),
+    ('reserved', '<u4', (2,)),
+])
+
+# One record per hand. A frame with no hands is one record with
+# hand_count == 0, so empty frames keep their place in the timeline.
+RECORD_DTYPE = np.dtype([
+    ('timestamp_ms', '<i8'),
+    ('frame', '<u4'),             # Sequential frame number
+    ('hand_count', 'u1'),         # Hands in this frame
+    ('handedness', 'u1'),         # Index into HANDEDNESS_CODES
+    ('reserved', 'u1', (2,)),
+    ('confidence', '<f4'),
+    ('points', '<f4', (NUM_LANDMARKS, 3)),
+])
+
+
+class LandmarkRecorder:
+    """
+    Appends timestamped hand landmarks to a recording file.
+
+    Records are fixed-size and written as they arrive, so a recording cut
+    short by a crash is still readable up to its last complete record.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Output file (overwritten)
+        """
+        self.path = path
+        self._file: Optional[BinaryIO] = None
+        self._frame = 0
+        self._last_timestamp_ms = -1
+        self.frames_written = 0
+
+    def write(self, timestamp_ms: int, hands: List[Hand], frame_shape: Tuple[int, ...]) -> None:
+        """
+        Append one inference result.
+
+        Results with a timestamp not newer than the previous one (live_stream
+        mode re-reporting the latest result) are skipped.
+
+        Args:
+            timestamp_ms: Timestamp of the frame the hands were detected in
+            hands: Detected hands
+            frame_shape: Shape of the source frame (stored in the header)
+        """
+        if timestamp_ms <= self._last_timestamp_ms:
+            return
+        self._last_timestamp_ms = timestamp_ms
+
+        if self._file is None:
+            self._open(frame_shape)
+
+        records = np.zeros(max(1, len(hands)), dtype=RECORD_DTYPE)
+        records['timestamp_ms'] = timestamp_ms
+        records['frame'] = self._frame
+        records['hand_count'] = len(hands)
+        for idx, hand in enumerate(hands):
+            records[idx]['handedness'] = HANDEDNESS_CODE.get(hand.handedness, 0)
+            records[idx]['confidence'] = hand.confidence
+            records[idx]['points'] = hand.points
+
+        self._file.write(records.tobytes())
+        self._frame += 1
+        self.frames_written += 1
+
+    def _open(self, frame_shape: Tuple[int, ...]) -> None:
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header['magic'] = FILE_MAGIC
+        header['version'] = FORMAT_VERSION
+        header['record_size'] = RECORD_DTYPE.itemsize
+        header['frame_height'] = frame_shape[0]
+        header['frame_width'] = frame_shape[1]
+
+        self._file = open(self.path, 'wb')
+        self._file.write(header.tobytes())
+        logger.info(f"Recording landmarks to {self.path}")
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Recorded {self.frames_written} frames to {self.path}")
+
+
+class LandmarkRecording:
+    """Read-only, memory-mapped view of a recording file."""
+
+    def __init__(self, path: str):
+        """
+        Open a recording.
+
+        Raises:
+            ValueError: If the file is not a landmark recording of this version
+        """
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if (len(header) == 0 or header['magic'][0] != FILE_MAGIC
+                or header['version'][0] != FORMAT_VERSION
+                or header['record_size'][0] != RECORD_DTYPE.itemsize):
+            raise ValueError(f"Not a landmark recording (version {FORMAT_VERSION}): {path}")
+
+        self.frame_shape = (int(header['frame_height'][0]), int(header['frame_width'][0]), 3)
+
+        # Ignore a trailing partial record from an interrupted recording
+        count = (os.path.getsize(path) - HEADER_DTYPE.itemsize) // RECORD_DTYPE.itemsize
+        if count > 0:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                                     offset=HEADER_DTYPE.itemsize, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+        # First record of every frame, plus the end
+        frame_ids = self.records['frame']
+        starts = np.flatnonzero(np.diff(frame_ids, prepend=-1) != 0) if count else np.zeros(0, int)
+        self._bounds = np.append(starts, count)
+
+    def __len__(self) -> int:
+        """Number of frames."""
+        return len(self._bounds) - 1
+
+    def timestamp_ms(self, index: int) -> int:
+        """Timestamp of frame `index`."""
+        return int(self.records['timestamp_ms'][self._bounds[index]])
+
+    def hands(self, index: int) -> List[Hand]:
+        """Hands of frame `index`."""
+        rows = self.records[self._bounds[index]:self._bounds[index + 1]]
+        if rows['hand_count'][0] == 0:
+            return []
+        return [
+            Hand(
+                points=np.array(row['points']),
+                handedness=HANDEDNESS_CODES[row['handedness']],
+                confidence=float(row['confidence'])
+            )
+            for row in rows
+        ]
+
+    @property
+    def duration_ms(self) -> int:
+        """Time between the first and last frame."""
+        if len(self) == 0:
+            return 0
+        return self.timestamp_ms(len(self) - 1) - self.timestamp_ms(0)
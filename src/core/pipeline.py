@@ -0,0 +1,211 @@
+"""Multi-stage frame processing pipeline with bounded queues."""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Backpressure policies
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+DEFAULT_QUEUE_SIZE = 2
+THREAD_JOIN_TIMEOUT_S = 2.0
+
+
+def max_items_in_flight(num_stages: int, queue_size: int = DEFAULT_QUEUE_SIZE) -> int:
+    """
+    Upper bound on items alive at once between the source and the consumer.
+
+    Every queue may be full while each stage, the source and the consumer
+    each hold one more. Reusable per-item buffers need more slots than this.
+    """
+    return (num_stages + 1) * queue_size + num_stages + 2
+
+
+class StageQueue:
+    """Bounded FIFO between two stages with a configurable full-queue policy."""
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE, policy: str = DROP_OLDEST):
+        if policy not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        if maxsize < 1:
+            raise ValueError("Queue size must be at least 1")
+
+        self._items: Deque[Any] = deque()
+        self._maxsize = maxsize
+        self._policy = policy
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: Any) -> bool:
+        """
+        Enqueue an item, dropping the oldest or blocking when full.
+
+        Returns:
+            False if the queue was closed, True otherwise
+        """
+        with self._cond:
+            if self._policy == BLOCK:
+                self._cond.wait_for(lambda: len(self._items) < self._maxsize or self._closed)
+            if self._closed:
+                return False
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Dequeue the oldest item.
+
+        Returns:
+            The item, or None on timeout or once the queue is closed and empty
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Stop accepting items; consumers drain what is left, then get None."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """True once close() has been called."""
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class Stage:
+    """A named processing step; returns the item to forward, or None to drop it."""
+
+    def __init__(self, name: str, func: Callable[[Any], Optional[Any]]):
+        self.name = name
+        self._func = func
+
+    def process(self, item: Any) -> Optional[Any]:
+        """Run the stage on one item."""
+        return self._func(item)
+
+
+class Pipeline:
+    """
+    Runs a source and a chain of stages, each on its own thread.
+
+    Stages are connected by bounded StageQueues, so stage N+1 can work on
+    frame k while stage N works on frame k+1. Items leaving the last stage
+    are collected with get(), typically on the main (GUI) thread.
+    """
+
+    def __init__(self,
+                 source: Callable[[], Optional[Any]],
+                 stages: List[Stage],
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 policy: str = DROP_OLDEST):
+        """
+        Build the pipeline.
+
+        Args:
+            source: Produces the next item, or None at end of stream
+            stages: Processing stages in order
+            queue_size: Capacity of each inter-stage queue
+            policy: "drop_oldest" (favour freshness) or "block" (lossless)
+        """
+        self._source = source
+        self._stages = stages
+        self._queues = [StageQueue(queue_size, policy) for _ in range(len(stages) + 1)]
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def start(self) -> None:
+        """Start the source and stage threads."""
+        self._threads = [threading.Thread(target=self._run_source, name="source", daemon=True)]
+        for idx, stage in enumerate(self._stages):
+            self._threads.append(threading.Thread(
+                target=self._run_stage,
+                args=(stage, self._queues[idx], self._queues[idx + 1]),
+                name=stage.name,
+                daemon=True
+            ))
+        for thread in self._threads:
+            thread.start()
+
+    def _run_source(self) -> None:
+        out_queue = self._queues[0]
+        try:
+            while not self._stop.is_set():
+                item = self._source()
+                if item is None:
+                    break
+                if not out_queue.put(item):
+                    break
+        except Exception as e:
+            self._fail("source", e)
+        finally:
+            out_queue.close()
+
+    def _run_stage(self, stage: Stage, in_queue: StageQueue, out_queue: StageQueue) -> None:
+        try:
+            while True:
+                item = in_queue.get()
+                if item is None:
+                    break
+                result = stage.process(item)
+                if result is not None and not out_queue.put(result):
+                    break
+        except Exception as e:
+            self._fail(stage.name, e)
+        finally:
+            out_queue.close()
+
+    def _fail(self, name: str, error: Exception) -> None:
+        logger.exception(f"Pipeline stage '{name}' failed: {error}")
+        self.error = error
+        self.stop()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Take the next fully processed item.
+
+        Returns:
+            The item, or None on timeout or after the pipeline has finished
+        """
+        return self._queues[-1].get(timeout)
+
+    @property
+    def running(self) -> bool:
+        """True until the output queue is closed and drained."""
+        return not (self._queues[-1].closed and len(self._queues[-1]) == 0)
+
+    @property
+    def dropped(self) -> List[int]:
+        """Items dropped by each queue (source output first)."""
+        return [q.dropped for q in self._queues]
+
+    def stop(self) -> None:
+        """Signal all threads to finish and close every queue."""
+        self._stop.set()
+        for q in self._queues:
+            q.close()
+
+    def join(self) -> None:
+        """Wait for all threads to exit."""
+        current = threading.current_thread()
+        for thread in self._threads:
+            if thread is not current:
+                thread.join(timeout=THREAD_JOIN_TIMEOUT_S)
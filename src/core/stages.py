@@ -0,0 +1,423 @@
+"""Frame processing stages for the gesture control pipeline."""
+
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.controllers.base_controller import BaseController
+from src.controllers.dispatcher import (AXES, AXIS_INDEX, HANDEDNESS, HANDEDNESS_INDEX,
+                                        ControlDispatcher)
+from src.core.frame_preparer import MIRROR_NONE, FramePreparer
+from src.core.hand_id_tracker import HandIdTracker
+from src.core.hand_tracker import Hand, HandTracker
+from src.core.inference_pool import InferencePool
+from src.core.inference_scheduler import AdaptiveInferenceScheduler
+from src.core.landmark_recording import LandmarkRecorder, LandmarkRecording
+from src.core.video_capture import VideoCapture
+from src.filters.smoothing import create_filter
+from src.gestures.features import NUM_LANDMARKS, FeatureExtractor, HandFeatures, stack_hands
+from src.gestures.registry import CompiledGestureEvaluator
+from src.gestures.rotation_calculator import RotationCalculator
+from src.utils.clock import Clock, MonotonicClock
+from src.utils.config import FilterConfig, GestureConfig
+from src.utils.metrics import (RATE_CAPTURE, STAGE_CAPTURE, STAGE_CONTROL, STAGE_FEATURES,
+                               STAGE_GESTURES, STAGE_INFERENCE, STAGE_PREPARE,
+                               PipelineMetrics)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FramePacket:
+    """Everything known about one frame as it moves through the pipeline."""
+    frame: Optional[np.ndarray]  # BGR display frame (None when nothing renders)
+    timestamp_ms: int
+    rgb: Optional[np.ndarray] = None  # Model input, possibly downscaled (None on replay)
+    frame_shape: Tuple[int, ...] = ()  # Full-resolution camera frame shape
+    fps: float = 0.0
+    hands: List[Hand] = field(default_factory=list)
+    hands_timestamp_ms: int = -1  # Frame the hands were detected in
+    features: Optional[HandFeatures] = None  # Shared per-frame gesture features
+    hand_states: Dict[int, Dict] = field(default_factory=dict)
+    volume_level: int = 0
+    brightness_level: int = 0
+
+
+class CaptureSource:
+    """
+    Pipeline source that reads frames from the camera.
+
+    Each frame is converted by a FramePreparer into buffers of its own,
+    so packets never alias the camera's reused capture buffers.
+    """
+
+    def __init__(self, camera: VideoCapture, metrics: Optional[PipelineMetrics] = None,
+                 preparer: Optional[FramePreparer] = None):
+        """
+        Args:
+            camera: Frame source
+            metrics: Records capture timings and rate
+            preparer: Produces the model input and display frame; its ring
+                must outlast the frames in flight in the pipeline
+        """
+        self._camera = camera
+        self._metrics = metrics or PipelineMetrics(enabled=False)
+        self._preparer = preparer or FramePreparer(MIRROR_NONE)
+
+    def __call__(self) -> Optional[FramePacket]:
+        with self._metrics.measure(STAGE_CAPTURE):
+            frame = self._camera.read_frame()
+        if frame is None:
+            if self._camera.is_file:
+                logger.info("End of input")
+            else:
+                logger.error("Failed to grab frame")
+            return None
+
+        with self._metrics.measure(STAGE_PREPARE):
+            rgb, display = self._preparer.prepare(frame)
+
+        self._metrics.tick(RATE_CAPTURE, self._camera.frame_timestamp_ms / 1000.0)
+        return FramePacket(
+            frame=display,
+            rgb=rgb,
+            frame_shape=frame.shape,
+            timestamp_ms=self._camera.frame_timestamp_ms,
+            fps=self._camera.fps
+        )
+
+
+class ReplaySource:
+    """
+    Pipeline source that feeds a recording in place of camera + inference.
+
+    Packets arrive with hands already attached, so the pipeline is built
+    without an inference stage.
+    """
+
+    def __init__(self, recording: LandmarkRecording, realtime: bool = True,
+                 clock: Optional[Clock] = None, loop: bool = False):
+        """
+        Args:
+            recording: Recording to play
+            realtime: Pace frames at their recorded intervals; otherwise
+                deliver them as fast as the pipeline accepts them
+            clock: Time source for pacing
+            loop: Start over at the end instead of ending the stream
+        """
+        self._recording = recording
+        self._realtime = realtime
+        self._clock = clock or MonotonicClock()
+        self._loop = loop
+        self._index = 0
+        self._offset_ms = 0      # Added to recorded stamps so looped passes stay monotonic
+        self._base_s: Optional[float] = None
+        self._prev_timestamp_ms: Optional[int] = None
+
+    def __call__(self) -> Optional[FramePacket]:
+        recording = self._recording
+        if self._index >= len(recording):
+            if not self._loop or len(recording) == 0:
+                return None
+            self._offset_ms += recording.duration_ms + 1
+            self._index = 0
+
+        # Recorded intervals are kept exactly; stamps are rebased onto the
+        # clock so latency measured downstream is meaningful in realtime mode
+        if self._base_s is None:
+            self._base_s = self._clock.now()
+        elapsed_ms = recording.timestamp_ms(self._index) - recording.timestamp_ms(0) + self._offset_ms
+        timestamp_ms = int(self._base_s * 1000) + elapsed_ms
+        if self._realtime:
+            delay = self._base_s + elapsed_ms / 1000.0 - self._clock.now()
+            if delay > 0:
+                self._clock.sleep(delay)
+
+        fps = 0.0
+        if self._prev_timestamp_ms is not None and timestamp_ms > self._prev_timestamp_ms:
+            fps = 1000.0 / (timestamp_ms - self._prev_timestamp_ms)
+        self._prev_timestamp_ms = timestamp_ms
+
+        packet = FramePacket(
+            frame=np.zeros(recording.frame_shape, dtype=np.uint8),
+            frame_shape=recording.frame_shape,
+            timestamp_ms=timestamp_ms,
+            fps=fps,
+            hands=recording.hands(self._index),
+            hands_timestamp_ms=timestamp_ms
+        )
+        self._index += 1
+        return packet
+
+
+class InferenceStage:
+    """
+    Runs the hand landmarker on each frame.
+
+    In live_stream mode, or with an InferencePool, the hands attached to a
+    packet may come from an earlier frame; hands_timestamp_ms records which one. With a scheduler,
+    frames it skips get extrapolated hands instead of running inference.
+    """
+
+    def __init__(self, tracker: Union[HandTracker, InferencePool],
+                 scheduler: Optional[AdaptiveInferenceScheduler] = None,
+                 metrics: Optional[PipelineMetrics] = None,
+                 recorder: Optional[LandmarkRecorder] = None):
+        self._tracker = tracker
+        self._scheduler = scheduler
+        self._metrics = metrics or PipelineMetrics(enabled=False)
+        self._recorder = recorder
+        self._last_sent_ms = -1  # Newest frame timestamp given to the tracker
+        self._frame_shape: Tuple[int, ...] = ()
+
+    def __call__(self, packet: FramePacket) -> FramePacket:
+        if packet.timestamp_ms <= self._last_sent_ms:
+            # The landmarker rejects timestamps that do not increase; reuse the last result
+            latest = self._tracker.latest_result
+            packet.hands = latest.hands
+            packet.hands_timestamp_ms = latest.timestamp_ms
+            return packet
+
+        if self._scheduler is not None and not self._scheduler.should_infer(packet.timestamp_ms):
+            packet.hands = self._scheduler.extrapolate(packet.timestamp_ms)
+            packet.hands_timestamp_ms = packet.timestamp_ms
+            return packet
+
+        self._last_sent_ms = packet.timestamp_ms
+        self._frame_shape = packet.frame_shape
+        with self._metrics.measure(STAGE_INFERENCE):
+            packet.hands = self._tracker.process_frame(packet.rgb, packet.timestamp_ms)
+        packet.hands_timestamp_ms = self._tracker.latest_result.timestamp_ms
+        if self._recorder is not None and packet.hands_timestamp_ms >= 0:
+            self._recorder.write(packet.hands_timestamp_ms, packet.hands, packet.frame_shape)
+        if self._scheduler is not None:
+            self._scheduler.observe(packet.hands_timestamp_ms, packet.hands)
+        return packet
+
+    def flush(self) -> None:
+        """Record the results an InferencePool still had in flight when the input ended."""
+        drain = getattr(self._tracker, 'drain', None)
+        if drain is None:
+            return
+        for result in drain():
+            if self._recorder is not None:
+                self._recorder.write(result.timestamp_ms, result.hands, self._frame_shape)
+
+
+class GestureStage:
+    """Evaluates all registered gestures and palm rotation for every hand."""
+
+    def __init__(self, evaluator: CompiledGestureEvaluator, rotation_calc: RotationCalculator,
+                 gesture_config: GestureConfig,
+                 scheduler: Optional[AdaptiveInferenceScheduler] = None,
+                 landmark_filter: Optional[FilterConfig] = None,
+                 metrics: Optional[PipelineMetrics] = None,
+                 hand_ids: Optional[HandIdTracker] = None,
+                 control_gestures: Optional[np.ndarray] = None,
+                 roll_gestures: Optional[np.ndarray] = None):
+        """
+        Args:
+            evaluator: Compiled gesture rules
+            rotation_calc: Roll unwrapping with at least hand_ids.num_slots slots
+            gesture_config: Gesture thresholds and landmark filter kind
+            scheduler: Receives gesture activity to pace inference
+            landmark_filter: Parameters for the landmark filter
+            metrics: Records feature and gesture timings
+            hand_ids: Assigns each hand the slot that owns its state
+            control_gestures: Gestures that drive a control, per handedness
+                (ControlDispatcher.bound_gestures()); only these keep the
+                scheduler at full rate. Defaults to claw for both hands.
+            roll_gestures: Gestures bound to the roll axis, per handedness
+                (ControlDispatcher.bound_gestures('roll')); roll is only
+                unwrapped while one of them is held. Defaults to claw.
+        """
+        self._evaluator = evaluator
+        self._claw_index = evaluator.index['claw']
+        # What the rules read, plus the axes the bindings use
+        self._extract_features = FeatureExtractor(evaluator.fields | {'roll', 'pitch'})
+        claw_only = np.zeros((len(HANDEDNESS), len(evaluator)), dtype=bool)
+        claw_only[:, self._claw_index] = True
+        self._control_gestures = claw_only if control_gestures is None else control_gestures
+        self._roll_gestures = claw_only if roll_gestures is None else roll_gestures
+        self._rotation_calc = rotation_calc
+        self._config = gesture_config
+        self._scheduler = scheduler
+        self._metrics = metrics or PipelineMetrics(enabled=False)
+        self._hand_ids = hand_ids or HandIdTracker()
+
+        # Per-slot state: active gestures from the previous frame (for
+        # hysteresis) and the optional landmark filter
+        num_slots = self._hand_ids.num_slots
+        self._slot_gestures = evaluator.initial_state(num_slots)
+        self._landmark_filter_kind = gesture_config.landmark_filter
+        self._landmark_filter_config = landmark_filter or FilterConfig()
+        self._landmark_filters: List[Optional[object]] = [None] * num_slots
+        # Last filter output per slot and the hands timestamp it was computed for
+        self._filtered_points = np.zeros((num_slots, NUM_LANDMARKS, 3), dtype=np.float32)
+        self._filtered_ms = np.full(num_slots, -1, dtype=np.int64)
+
+    def _reset_slot(self, slot: int) -> None:
+        """Clear the state left in a slot by the hand that owned it before."""
+        self._slot_gestures[slot] = False
+        self._rotation_calc.reset(slot)
+        if self._landmark_filters[slot] is not None:
+            self._landmark_filters[slot].reset()
+        self._filtered_ms[slot] = -1
+
+    def _smooth_landmarks(self, hands: List[Hand], points: np.ndarray, slots: np.ndarray,
+                          timestamp_ms: int) -> List[Hand]:
+        """
+        Filter each hand's (21, 3) points in place with its slot's filter.
+
+        A result republished while inference is busy keeps its hands
+        timestamp; it is not fed to the filter again (as a sample 1 ms
+        later) but gets the slot's previous output.
+        """
+        for idx, hand in enumerate(hands):
+            slot = slots[idx]
+            if timestamp_ms <= self._filtered_ms[slot]:
+                points[idx] = self._filtered_points[slot]
+                continue
+            landmark_filter = self._landmark_filters[slot]
+            if landmark_filter is None:
+                landmark_filter = create_filter(self._landmark_filter_kind,
+                                                self._landmark_filter_config)
+                self._landmark_filters[slot] = landmark_filter
+            points[idx] = landmark_filter.update(hand.points, timestamp_ms / 1000.0)
+            self._filtered_points[slot] = points[idx]
+            self._filtered_ms[slot] = timestamp_ms
+        return [replace(hand, points=points[idx]) for idx, hand in enumerate(hands)]
+
+    def __call__(self, packet: FramePacket) -> FramePacket:
+        hands = packet.hands
+        if hands:
+            logger.debug("="*60)
+
+        points = stack_hands(hands)
+        slots = self._hand_ids.update(points, [hand.handedness for hand in hands])
+        if len(slots) < len(hands):
+            hands = packet.hands = hands[:len(slots)]
+            points = points[:len(slots)]
+        for idx in np.flatnonzero(self._hand_ids.started):
+            self._reset_slot(slots[idx])
+
+        if self._landmark_filter_kind != 'none':
+            hands = packet.hands = self._smooth_landmarks(
+                hands, points, slots, packet.hands_timestamp_ms
+            )
+
+        # Geometry for all hands is computed once and shared by all gestures
+        with self._metrics.measure(STAGE_FEATURES):
+            features = self._extract_features(points)
+            matrix = self._evaluator.feature_matrix(features)
+        packet.features = features
+
+        with self._metrics.measure(STAGE_GESTURES):
+            hand_states = self._evaluate(hands, slots, features, matrix)
+
+        packet.hand_states = hand_states
+        return packet
+
+    def _evaluate(self, hands: List[Hand], slots: np.ndarray, features: HandFeatures,
+                  matrix: np.ndarray) -> Dict[int, dict]:
+        """Run the gesture rules and build the per-hand state."""
+        hand_states = {}
+        active = self._evaluator.evaluate(matrix, self._slot_gestures[slots])
+        self._slot_gestures[slots] = active
+        controlling = False
+
+        for idx, hand in enumerate(hands):
+            slot = int(slots[idx])
+            side = HANDEDNESS_INDEX.get(hand.handedness)
+            if side is not None:
+                controlling |= bool((active[idx] & self._control_gestures[side]).any())
+            is_claw = bool(active[idx, self._claw_index])
+            self._log_detection(hand, features, idx, active[idx])
+
+            # Axis values for the control bindings; roll is unwrapped while
+            # a roll-bound gesture is held and restarts from zero after release
+            axes = np.zeros(len(AXES), dtype=np.float32)
+            axes[AXIS_INDEX['pitch']] = features.pitch[idx]
+            state = {
+                'hand_id': self._hand_ids.hand_id(slot),
+                'is_claw': is_claw,
+                'gestures': active[idx],
+                'axes': axes,
+            }
+
+            if side is not None and (active[idx] & self._roll_gestures[side]).any():
+                rotation_angle = self._rotation_calc.calculate_roll_from_features(
+                    features, idx, hand.handedness, slot
+                )
+                axes[AXIS_INDEX['roll']] = rotation_angle
+                logger.debug(f"  Rotation angle: {rotation_angle:.1f}°")
+                if is_claw:
+                    state['rotation'] = rotation_angle
+            else:
+                self._rotation_calc.reset(slot)
+
+            hand_states[idx] = state
+
+        if self._scheduler is not None:
+            self._scheduler.set_gesture_active(controlling)
+        return hand_states
+
+    def _log_detection(self, hand: Hand, features: HandFeatures, idx: int,
+                       active: np.ndarray) -> None:
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        logger.debug(f"{hand.handedness} hand:")
+        # Only the features the registered rules read were extracted
+        if features.fingertip_spread is not None:
+            logger.debug(f"  Fingertip spread: {features.fingertip_spread[idx]:.3f} "
+                         f"(max: {self._config.max_fingertip_spread:.3f})")
+
+        if features.palm_distances is not None:
+            palm_dists = features.palm_distances[idx]
+            fingers_close = int(np.count_nonzero(palm_dists < self._config.max_palm_distance))
+            logger.debug(f"  Palm distances: I={palm_dists[0]:.3f}, M={palm_dists[1]:.3f}, "
+                         f"R={palm_dists[2]:.3f}, P={palm_dists[3]:.3f}")
+            logger.debug(f"  Max palm distance: {self._config.max_palm_distance:.3f}")
+            logger.debug(f"  Fingers close to palm: "
+                         f"{fingers_close}/{self._config.min_fingers_close}")
+
+        logger.debug(f"  Claw detected: {'YES' if active[self._claw_index] else 'NO'}")
+        names = [name for name, on in zip(self._evaluator.names, active) if on]
+        logger.debug(f"  Active gestures: {', '.join(names) or 'none'}")
+
+
+class ControlStage:
+    """Runs the gesture-to-controller bindings and samples levels for display."""
+
+    def __init__(self, dispatcher: ControlDispatcher, volume_ctrl: BaseController,
+                 brightness_ctrl: BaseController,
+                 metrics: Optional[PipelineMetrics] = None):
+        self._dispatcher = dispatcher
+        self._volume_ctrl = volume_ctrl
+        self._brightness_ctrl = brightness_ctrl
+        self._metrics = metrics or PipelineMetrics(enabled=False)
+        self._last_dispatched_ms = -1  # Hands timestamp of the last dispatched result
+
+    def __call__(self, packet: FramePacket) -> FramePacket:
+        with self._metrics.measure(STAGE_CONTROL):
+            # A result republished while inference is busy is not a new sample
+            # for the axis filters and level deltas
+            if packet.hands_timestamp_ms > self._last_dispatched_ms:
+                self._last_dispatched_ms = packet.hands_timestamp_ms
+                self._dispatch(packet)
+
+        packet.volume_level = self._volume_ctrl.get_level()
+        packet.brightness_level = self._brightness_ctrl.get_level()
+        return packet
+
+    def _dispatch(self, packet: FramePacket) -> None:
+        for idx, hand in enumerate(packet.hands):
+            side = HANDEDNESS_INDEX.get(hand.handedness)
+            state = packet.hand_states.get(idx)
+            if side is None or state is None:
+                continue
+            self._dispatcher.dispatch(side, state['gestures'], state['axes'],
+                                      packet.hands_timestamp_ms / 1000.0, state['hand_id'])
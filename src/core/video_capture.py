@@ -1,37 +1,404 @@
 """Video capture management."""
 
-from typing import Optional
+import logging
+import os
+import queue
+import threading
+from typing import List, Optional, Tuple, Union
 import cv2
-import time
+import numpy as np
+
+from src.core.camera_modes import (BACKEND_ANY, CameraMode, apply_mode, capture_backend,
+                                   probe_modes, select_mode)
+from src.utils.clock import Clock, MonotonicClock
+
+logger = logging.getLogger(__name__)
+
+# Threaded capture configuration
+DEFAULT_RING_SIZE = 3
+MIN_RING_SIZE = 3  # latest + consumer-held + one being written
+FRAME_WAIT_TIMEOUT_S = 1.0
+THREAD_JOIN_TIMEOUT_S = 2.0
+
+# File and image-sequence input
+DEFAULT_DECODE_AHEAD = 8        # Decoded frames buffered ahead of the consumer
+DEFAULT_FILE_FPS = 30.0         # For image sequences and files without a frame rate
+IMAGE_EXTENSIONS = ('.bmp', '.jpeg', '.jpg', '.png', '.tif', '.tiff', '.webp')
+
+# Backend (driver) timestamps further than this from the clock are ignored;
+# some backends report stream position or an unrelated epoch instead
+MAX_BACKEND_SKEW_MS = 1000
+
+# Accepted frame rate may be reported slightly off the requested one (e.g. 29.97)
+FPS_TOLERANCE = 0.5
+
+
+class FileFrameReader:
+    """
+    Decodes a video file or a directory of images on a background thread.
+
+    Frames go through a bounded queue, so decoding runs at most
+    `decode_ahead` frames ahead and no frame is ever dropped. Each frame
+    carries its media time (frame index / fps).
+    """
+
+    def __init__(self, path: str, decode_ahead: int = DEFAULT_DECODE_AHEAD,
+                 fps: Optional[float] = None):
+        """
+        Open the input and start decoding.
+
+        Args:
+            path: Video file, or directory of images read in name order
+            decode_ahead: Capacity of the decoded-frame queue
+            fps: Frame rate for image sequences, or to override the file's
+
+        Raises:
+            RuntimeError: If the input cannot be opened or has no frames
+        """
+        self.path = path
+        self._cap: Optional[cv2.VideoCapture] = None
+        self._images: List[str] = []
+
+        if os.path.isdir(path):
+            self._images = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            if not self._images:
+                raise RuntimeError(f"No images found in {path}")
+            self.fps = fps or DEFAULT_FILE_FPS
+        else:
+            self._cap = cv2.VideoCapture(path)
+            if not self._cap.isOpened():
+                raise RuntimeError(f"Failed to open video file {path}")
+            self.fps = fps or self._cap.get(cv2.CAP_PROP_FPS) or DEFAULT_FILE_FPS
+
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, float]]]" = queue.Queue(
+            maxsize=max(1, decode_ahead))
+        self._running = True
+        self._finished = False
+        self.frames_decoded = 0
+        self._thread = threading.Thread(target=self._decode_loop, name="decode", daemon=True)
+        self._thread.start()
+
+    def _decode(self, index: int) -> Optional[np.ndarray]:
+        if self._cap is not None:
+            success, frame = self._cap.read()
+            return frame if success else None
+        if index >= len(self._images):
+            return None
+        frame = cv2.imread(self._images[index], cv2.IMREAD_COLOR)
+        if frame is None:
+            logger.warning(f"Skipping unreadable image {self._images[index]}")
+            return np.empty((0, 0, 3), dtype=np.uint8)
+        return frame
+
+    def _decode_loop(self) -> None:
+        index = 0
+        while self._running:
+            frame = self._decode(index)
+            if frame is None:
+                break
+            media_s = index / self.fps
+            index += 1
+            if frame.size == 0:
+                continue
+            if not self._put((frame, media_s)):
+                return
+            self.frames_decoded += 1
+        self._put(None)
+
+    def _put(self, item) -> bool:
+        """Block until there is room, giving up once stopped."""
+        while self._running:
+            try:
+                self._queue.put(item, timeout=FRAME_WAIT_TIMEOUT_S)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read(self) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Next decoded frame and its media time in seconds.
+
+        Returns:
+            (frame, media_s), or None at the end of the input
+        """
+        if self._finished:
+            return None
+        item = self._queue.get()
+        if item is None:
+            self._finished = True
+        return item
+
+    def release(self) -> None:
+        """Stop decoding and close the input."""
+        self._running = False
+        # Unblock a decoder waiting on a full queue
+        while not self._queue.empty():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join(timeout=THREAD_JOIN_TIMEOUT_S)
+        if self._cap is not None:
+            self._cap.release()
 
 
 class VideoCapture:
     """Manages camera capture with error handling and frame preprocessing."""
 
-    def __init__(self, camera_index: int = 2, flip_horizontal: bool = True):
+    def __init__(self, camera_index: Union[int, str] = 2, flip_horizontal: bool = True,
+                 threaded: bool = False, ring_size: int = DEFAULT_RING_SIZE,
+                 clock: Optional[Clock] = None, backend_timestamps: bool = True,
+                 decode_ahead: int = DEFAULT_DECODE_AHEAD, paced: bool = True,
+                 file_fps: Optional[float] = None, backend: str = BACKEND_ANY,
+                 mode: Optional[CameraMode] = None, buffer_size: Optional[int] = None,
+                 probe: bool = False):
+        """
+        Open the camera, or a video file or image directory.
+
+        Args:
+            camera_index: OpenCV camera index, or a path to a video file or
+                a directory of images
+            flip_horizontal: Mirror frames for a natural "selfie" view
+            threaded: Grab frames on a dedicated thread into a ring buffer so
+                read_frame() always returns the newest frame
+            ring_size: Number of preallocated frame slots in threaded mode
+            clock: Monotonic time source for frame timestamps
+            backend_timestamps: Prefer the driver's buffer timestamp when it
+                agrees with the clock (V4L2 stamps with CLOCK_MONOTONIC)
+            decode_ahead: Frames decoded ahead of the consumer (file input)
+            paced: Deliver file frames at their frame rate; otherwise as
+                fast as they are read (file input)
+            file_fps: Frame rate for image sequences or to override a file's
+            backend: Capture API ("v4l2" or "any")
+            mode: Requested resolution, frame rate and pixel format; zero or
+                empty fields keep the driver default
+            buffer_size: Driver-side frame buffer (1 = lowest latency)
+            probe: List the supported modes and use the lowest-latency one
+                at least mode's resolution
+
+        Raises:
+            RuntimeError: If the camera or file cannot be opened
+            ValueError: If the backend is unknown
+        """
         self.camera_index = camera_index
         self.flip_horizontal = flip_horizontal
-        self.cap = cv2.VideoCapture(camera_index)
+        self._clock = clock or MonotonicClock()
 
-        if not self.cap.isOpened():
-            raise RuntimeError(f"Failed to open camera at index {camera_index}")
+        # File input replaces the camera and its capture thread
+        self._file: Optional[FileFrameReader] = None
+        self._paced = paced
+        self._file_start_s: Optional[float] = None
+        if isinstance(camera_index, str):
+            self._file = FileFrameReader(camera_index, decode_ahead, file_fps)
+            threaded = False
+            logger.info(f"Reading frames from {camera_index} at {self._file.fps:.1f} FPS"
+                        f"{'' if paced else ' (unpaced)'}")
 
-        self._prev_time = 0
+        self.threaded = threaded
+        self.cap = None
+        self.mode: Optional[CameraMode] = None  # Mode the camera accepted
+        if self._file is None:
+            self.cap = cv2.VideoCapture(camera_index, capture_backend(backend))
+            if not self.cap.isOpened():
+                raise RuntimeError(f"Failed to open camera at index {camera_index}")
+            self._negotiate(mode, buffer_size, probe)
+
+        self._backend_timestamps = backend_timestamps
+        self._last_stamp_ms = -1
+        self._frame_timestamp_ms = -1
+        self._prev_time_ms = -1
         self._fps = 0.0
+        self._flipped: Optional[np.ndarray] = None  # Reused flip output
 
-    def read_frame(self) -> Optional[any]:
-        """Read and preprocess frame from camera."""
-        success, frame = self.cap.read()
+        # Threaded capture state
+        self._ring: List[np.ndarray] = []
+        self._ring_stamps: List[int] = []
+        self._cond = threading.Condition()
+        self._latest_idx = -1      # Slot holding the newest complete frame
+        self._reading_idx = -1     # Slot last handed to the consumer
+        self._latest_seq = 0       # Frames captured so far
+        self._consumed_seq = 0     # Sequence number of the last frame returned
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.dropped_frames = 0    # Captured but replaced before being read
+        self.duplicate_frames = 0  # Returned again because nothing newer arrived
+
+        if threaded:
+            self._start_capture_thread(max(MIN_RING_SIZE, ring_size))
+
+    def _negotiate(self, mode: Optional[CameraMode], buffer_size: Optional[int],
+                   probe: bool) -> None:
+        """Apply the requested (or probed) mode and log what the device accepted."""
+        requested = mode or CameraMode(0, 0, 0.0, "")
+        if probe:
+            modes = probe_modes(self.camera_index, self.cap)
+            if requested.fourcc:
+                # A configured pixel format restricts the choice to its modes
+                modes = [m for m in modes if m.fourcc == requested.fourcc] or modes
+            chosen = select_mode(modes, requested.width, requested.height)
+            if chosen is not None:
+                logger.info(f"Lowest-latency camera mode: {chosen}")
+                requested = chosen
+            else:
+                logger.warning("Camera mode probe found no modes, using the configured one")
+
+        self.mode = apply_mode(self.cap, requested, buffer_size)
+        accepted_buffer = int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE))
+        logger.info(f"Camera mode: {self.mode}, driver buffer {accepted_buffer}")
+
+        if ((requested.width and requested.width != self.mode.width)
+                or (requested.height and requested.height != self.mode.height)
+                or (requested.fourcc and requested.fourcc != self.mode.fourcc)
+                or (requested.fps and abs(requested.fps - self.mode.fps) > FPS_TOLERANCE)):
+            logger.warning(f"Camera did not accept the requested mode {requested}")
+        if buffer_size and accepted_buffer != buffer_size:
+            logger.warning(f"Camera did not accept driver buffer size {buffer_size}")
+
+    def _start_capture_thread(self, ring_size: int) -> None:
+        """Allocate the ring from the first frame and start grabbing."""
+        success, first = self.cap.read()
         if not success:
+            raise RuntimeError(f"Failed to read from camera at index {self.camera_index}")
+
+        self._ring = [np.empty_like(first) for _ in range(ring_size)]
+        self._ring_stamps = [-1] * ring_size
+        self._ring[0][...] = first
+        self._ring_stamps[0] = self._stamp()
+        self._latest_idx = 0
+        self._latest_seq = 1
+
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="capture", daemon=True)
+        self._thread.start()
+
+    def _next_write_slot(self) -> int:
+        """Pick a slot that is neither the newest frame nor held by the consumer."""
+        for offset in range(1, len(self._ring) + 1):
+            idx = (self._latest_idx + offset) % len(self._ring)
+            if idx != self._latest_idx and idx != self._reading_idx:
+                return idx
+        return (self._latest_idx + 1) % len(self._ring)
+
+    def _capture_loop(self) -> None:
+        while self._running:
+            with self._cond:
+                slot = self._next_write_slot()
+
+            success, _ = self.cap.read(self._ring[slot])
+            if not success:
+                logger.error("Capture thread failed to grab frame")
+                break
+            stamp = self._stamp()
+
+            with self._cond:
+                self._ring_stamps[slot] = stamp
+                if self._latest_seq > self._consumed_seq:
+                    self.dropped_frames += 1
+                self._latest_idx = slot
+                self._latest_seq += 1
+                self._cond.notify_all()
+
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def _stamp(self) -> int:
+        """
+        Timestamp the frame just grabbed, in clock milliseconds.
+
+        Uses the driver's buffer timestamp when it is on the same clock,
+        otherwise the time of the grab. Stamps are strictly increasing, as
+        MediaPipe's VIDEO mode requires.
+        """
+        now_ms = self._clock.now_ms()
+        stamp = now_ms
+        if self._backend_timestamps:
+            backend_ms = int(self.cap.get(cv2.CAP_PROP_POS_MSEC))
+            if backend_ms > 0 and abs(now_ms - backend_ms) <= MAX_BACKEND_SKEW_MS:
+                stamp = backend_ms
+
+        stamp = max(stamp, self._last_stamp_ms + 1)
+        self._last_stamp_ms = stamp
+        return stamp
+
+    def _read_latest(self) -> Optional[np.ndarray]:
+        """Return the newest ring-buffer frame, waiting briefly for a fresh one."""
+        with self._cond:
+            fresh = self._cond.wait_for(
+                lambda: self._latest_seq > self._consumed_seq or not self._running,
+                FRAME_WAIT_TIMEOUT_S
+            )
+            if not self._running and self._latest_seq <= self._consumed_seq:
+                return None
+            if not fresh:
+                self.duplicate_frames += 1
+
+            self._reading_idx = self._latest_idx
+            self._consumed_seq = self._latest_seq
+            # A repeated frame is restamped just after the previous one, so
+            # stamps handed out stay strictly increasing (MediaPipe VIDEO mode)
+            self._frame_timestamp_ms = max(self._ring_stamps[self._reading_idx],
+                                           self._frame_timestamp_ms + 1)
+            return self._ring[self._reading_idx]
+
+    def _read_file(self) -> Optional[np.ndarray]:
+        """Next file frame, stamped with its media time on the clock."""
+        item = self._file.read()
+        if item is None:
             return None
+        frame, media_s = item
+
+        now = self._clock.now()
+        if self._file_start_s is None:
+            self._file_start_s = now - media_s
+        due = self._file_start_s + media_s
+        if self._paced and due > now:
+            self._clock.sleep(due - now)
+
+        stamp = max(int(due * 1000), self._last_stamp_ms + 1)
+        self._last_stamp_ms = stamp
+        self._frame_timestamp_ms = stamp
+        return frame
+
+    @property
+    def is_file(self) -> bool:
+        """True when reading a video file or image directory."""
+        return self._file is not None
+
+    def read_frame(self) -> Optional[any]:
+        """
+        Read and preprocess frame from camera.
+
+        The returned array is reused by later reads (a ring slot, or the
+        flip buffer), so callers that keep frames must copy or convert them.
+        """
+        if self._file is not None:
+            frame = self._read_file()
+            if frame is None:
+                return None
+        elif self.threaded:
+            frame = self._read_latest()
+            if frame is None:
+                return None
+        else:
+            success, frame = self.cap.read()
+            if not success:
+                return None
+            self._frame_timestamp_ms = self._stamp()
 
         if self.flip_horizontal:
-            frame = cv2.flip(frame, 1)
+            if self._flipped is None or self._flipped.shape != frame.shape:
+                self._flipped = np.empty_like(frame)
+            frame = cv2.flip(frame, 1, dst=self._flipped)
 
-        current_time = time.time()
-        if self._prev_time != 0:
-            self._fps = 1 / (current_time - self._prev_time)
-        self._prev_time = current_time
+        current_ms = self._frame_timestamp_ms
+        if self._prev_time_ms >= 0 and current_ms > self._prev_time_ms:
+            self._fps = 1000.0 / (current_ms - self._prev_time_ms)
+        self._prev_time_ms = current_ms
 
         return frame
 
@@ -40,6 +407,18 @@ class VideoCapture:
         """Get current FPS."""
         return self._fps
 
+    @property
+    def frame_timestamp_ms(self) -> int:
+        """Monotonic capture time of the frame last returned by read_frame()."""
+        return self._frame_timestamp_ms
+
     def release(self):
         """Release camera resources."""
-        self.cap.release()
+        if self._thread is not None:
+            self._running = False
+            self._thread.join(timeout=THREAD_JOIN_TIMEOUT_S)
+            self._thread = None
+        if self._file is not None:
+            self._file.release()
+        if self.cap is not None:
+            self.cap.release()
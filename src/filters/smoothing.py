@@ -1,6 +1,21 @@
 """Smoothing and filtering for gesture control."""
 
-import time
+import math
+from typing import Optional, Union
+
+import numpy as np
+
+from src.utils.clock import Clock, MonotonicClock
+
+# Filter kinds for create_filter()
+FILTER_EMA = "ema"
+FILTER_ONE_EURO = "one_euro"
+FILTER_KALMAN = "kalman"
+
+# Used when two samples share a timestamp
+MIN_DT_S = 1e-3
+
+Signal = Union[float, np.ndarray]
 
 
 class ExponentialMovingAverage:
@@ -11,8 +26,8 @@ class ExponentialMovingAverage:
         self._alpha = alpha
         self._value = None
 
-    def update(self, new_value: float) -> float:
-        """Apply EMA smoothing to the new value."""
+    def update(self, new_value: float, timestamp: Optional[float] = None) -> float:
+        """Apply EMA smoothing to the new value (timestamp is accepted but unused)."""
         if self._value is None:
             self._value = new_value
         else:
@@ -24,25 +39,185 @@ class ExponentialMovingAverage:
         self._value = None
 
 
+class OneEuroFilter:
+    """
+    Adaptive low-pass filter (Casiez et al., "1€ Filter").
+
+    The cutoff frequency rises with the signal's speed: heavy smoothing
+    while the value is held still, little lag during fast motion. Works on
+    scalars or element-wise on arrays such as (21, 3) landmarks.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.007, d_cutoff: float = 1.0):
+        """
+        Initialize filter.
+
+        Args:
+            min_cutoff: Cutoff frequency (Hz) at rest; lower means less jitter
+            beta: Speed coefficient; higher means less lag when moving
+            d_cutoff: Cutoff frequency (Hz) for the derivative estimate
+        """
+        self._min_cutoff = min_cutoff
+        self._beta = beta
+        self._d_cutoff = d_cutoff
+        self._value: Optional[Signal] = None
+        self._derivative: Optional[Signal] = None
+        self._timestamp: Optional[float] = None
+
+    @staticmethod
+    def _alpha(cutoff: Signal, dt: float) -> Signal:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, new_value: Signal, timestamp: float) -> Signal:
+        """
+        Filter one sample.
+
+        Args:
+            new_value: Scalar or array sample
+            timestamp: Sample time in seconds
+        """
+        if self._value is None:
+            self._value = new_value
+            self._derivative = new_value * 0.0
+            self._timestamp = timestamp
+            return self._value
+
+        dt = max(timestamp - self._timestamp, MIN_DT_S)
+        self._timestamp = timestamp
+
+        derivative = (new_value - self._value) / dt
+        a_d = self._alpha(self._d_cutoff, dt)
+        self._derivative = a_d * derivative + (1 - a_d) * self._derivative
+
+        cutoff = self._min_cutoff + self._beta * np.abs(self._derivative)
+        a = self._alpha(cutoff, dt)
+        self._value = a * new_value + (1 - a) * self._value
+        return self._value
+
+    def reset(self):
+        """Reset to initial state."""
+        self._value = None
+        self._derivative = None
+        self._timestamp = None
+
+
+class KalmanFilter:
+    """
+    Constant-velocity Kalman filter, independent per element.
+
+    Tracks position and velocity for a scalar or every element of an
+    array, so the estimate keeps up with steady motion instead of lagging
+    behind it like a fixed low-pass filter.
+    """
+
+    def __init__(self, process_noise: float = 50.0, measurement_noise: float = 1.0):
+        """
+        Initialize filter.
+
+        Args:
+            process_noise: Acceleration variance; higher follows changes faster
+            measurement_noise: Measurement variance; higher smooths more
+        """
+        self._q = process_noise
+        self._r = measurement_noise
+        self._timestamp: Optional[float] = None
+        self._x = self._v = None
+        self._p00 = self._p01 = self._p11 = None
+
+    def update(self, new_value: Signal, timestamp: float) -> Signal:
+        """
+        Filter one sample.
+
+        Args:
+            new_value: Scalar or array measurement
+            timestamp: Sample time in seconds
+        """
+        if self._x is None:
+            zeros = new_value * 0.0
+            self._x = new_value
+            self._v = zeros
+            self._p00 = zeros + self._r
+            self._p01 = zeros
+            self._p11 = zeros + self._q
+            self._timestamp = timestamp
+            return self._x
+
+        dt = max(timestamp - self._timestamp, MIN_DT_S)
+        self._timestamp = timestamp
+
+        # Predict with white-noise acceleration
+        x = self._x + self._v * dt
+        p00 = self._p00 + dt * (2 * self._p01 + dt * self._p11) + self._q * dt ** 4 / 4
+        p01 = self._p01 + dt * self._p11 + self._q * dt ** 3 / 2
+        p11 = self._p11 + self._q * dt ** 2
+
+        # Correct with the measurement
+        s = p00 + self._r
+        k0 = p00 / s
+        k1 = p01 / s
+        innovation = new_value - x
+        self._x = x + k0 * innovation
+        self._v = self._v + k1 * innovation
+        self._p00 = (1 - k0) * p00
+        self._p01 = (1 - k0) * p01
+        self._p11 = p11 - k1 * p01
+        return self._x
+
+    def reset(self):
+        """Reset to initial state."""
+        self._timestamp = None
+        self._x = self._v = None
+        self._p00 = self._p01 = self._p11 = None
+
+
+def create_filter(kind: str, config):
+    """
+    Build a smoothing filter by name.
+
+    Args:
+        kind: "ema", "one_euro" or "kalman"
+        config: FilterConfig with the parameters for each kind
+
+    Returns:
+        Filter with update(value, timestamp) and reset()
+    """
+    if kind == FILTER_EMA:
+        return ExponentialMovingAverage(config.ema_alpha)
+    if kind == FILTER_ONE_EURO:
+        return OneEuroFilter(config.one_euro_min_cutoff, config.one_euro_beta,
+                             config.one_euro_d_cutoff)
+    if kind == FILTER_KALMAN:
+        return KalmanFilter(config.kalman_process_noise, config.kalman_measurement_noise)
+    raise ValueError(f"Unknown filter kind: {kind}")
+
+
 class RateLimiter:
     """Limits rate of system control updates."""
 
-    def __init__(self, min_interval_ms: int = 150):
+    def __init__(self, min_interval_ms: int = 150, clock: Optional[Clock] = None):
         """Initialize with minimum interval between updates in milliseconds."""
         self._min_interval = min_interval_ms / 1000.0
-        self._last_update = 0
-
-    def should_update(self) -> bool:
-        """Check if enough time has passed since last update."""
-        current_time = time.time()
-        if current_time - self._last_update >= self._min_interval:
+        self._clock = clock or MonotonicClock()
+        self._last_update: Optional[float] = None
+
+    def should_update(self, timestamp: Optional[float] = None) -> bool:
+        """
+        Check if enough time has passed since last update.
+
+        Args:
+            timestamp: Time of the sample in seconds (frame time); None reads
+                the clock. Frame time keeps replays independent of their speed.
+        """
+        current_time = self._clock.now() if timestamp is None else timestamp
+        if self._last_update is None or current_time - self._last_update >= self._min_interval:
             self._last_update = current_time
             return True
         return False
 
     def reset(self):
         """Reset timer."""
-        self._last_update = 0
+        self._last_update = None
 
 
 def map_angle_to_level(angle: float, current_level: int, deadzone: float = 10.0) -> int:
@@ -1,16 +1,19 @@
 """Claw gesture detection using distance-based approach."""
 
-from typing import List, Dict, Any
+from typing import Any, Dict, Optional
 
 import numpy as np
 
 from src.core.hand_tracker import Hand
-from src.utils.geometry import distance_3d
+from src.gestures.features import FeatureExtractor, HandFeatures
 
 # Hysteresis multipliers
 HYSTERESIS_SPREAD_MULTIPLIER = 1.2
 HYSTERESIS_FINGER_REDUCTION = 1
 
+# The two quantities the claw test reads
+_CLAW_FEATURES = FeatureExtractor(('fingertip_spread', 'palm_distances'))
+
 
 class ClawDetector:
     """Detects claw gesture by checking if fingertips are clustered together."""
@@ -28,40 +31,36 @@ class ClawDetector:
         self,
         max_fingertip_spread: float = 0.15,
         max_palm_distance: float = 0.20,
-        min_fingers_close: int = 3
+        min_fingers_close: int = 3,
+        num_slots: int = 1
     ) -> None:
         self.max_fingertip_spread = max_fingertip_spread
         self.max_palm_distance = max_palm_distance
         self.min_fingers_close = min_fingers_close
-        self._is_claw = False
+        # Hysteresis state per hand slot (see HandIdTracker)
+        self._is_claw = np.zeros(num_slots, dtype=bool)
         self._debug_info: Dict[str, Any] = {}
 
-    def detect(self, hand: Hand) -> bool:
+    def detect(self, hand: Hand, slot: int = 0) -> bool:
         """
         Detect claw gesture with hysteresis to prevent rapid toggling.
 
         Uses looser thresholds when already in claw state to maintain stability.
         """
-        landmarks = hand.landmarks
-
-        fingertips = [
-            landmarks[self.INDEX_TIP],
-            landmarks[self.MIDDLE_TIP],
-            landmarks[self.RING_TIP],
-            landmarks[self.PINKY_TIP],
-        ]
-
-        palm_center = landmarks[self.MIDDLE_MCP]
+        return self.detect_features(_CLAW_FEATURES(hand.points[np.newaxis]), 0, slot)
 
-        fingertip_spread = self._calculate_average_fingertip_distance(fingertips)
+    def detect_features(self, features: HandFeatures, index: int, slot: int = 0) -> bool:
+        """
+        Detect claw gesture for one hand of a precomputed feature table.
 
-        fingers_close_to_palm = 0
-        palm_distances = []
-        for tip in fingertips:
-            dist = distance_3d(tip, palm_center)
-            palm_distances.append(dist)
-            if dist < self.max_palm_distance:
-                fingers_close_to_palm += 1
+        Args:
+            features: Features of all hands in the frame
+            index: Row of the hand to evaluate
+            slot: Hand slot whose hysteresis state to use
+        """
+        fingertip_spread = float(features.fingertip_spread[index])
+        palm_distances = features.palm_distances[index]
+        fingers_close_to_palm = int(np.count_nonzero(palm_distances < self.max_palm_distance))
 
         self._debug_info = {
             'fingertip_spread': fingertip_spread,
@@ -69,7 +68,7 @@ class ClawDetector:
             'fingers_close': fingers_close_to_palm
         }
 
-        if self._is_claw:
+        if self._is_claw[slot]:
             spread_threshold = self.max_fingertip_spread * HYSTERESIS_SPREAD_MULTIPLIER
             fingers_threshold = max(2, self.min_fingers_close - HYSTERESIS_FINGER_REDUCTION)
         else:
@@ -79,17 +78,15 @@ class ClawDetector:
         is_claw = (fingertip_spread < spread_threshold and
                    fingers_close_to_palm >= fingers_threshold)
 
-        self._is_claw = is_claw
+        self._is_claw[slot] = is_claw
         return is_claw
 
-    def _calculate_average_fingertip_distance(self, fingertips: List) -> float:
-        """Calculate average distance between all pairs of fingertips."""
-        distances = [
-            distance_3d(fingertips[i], fingertips[j])
-            for i in range(len(fingertips))
-            for j in range(i + 1, len(fingertips))
-        ]
-        return float(np.mean(distances)) if distances else 0.0
+    def reset(self, slot: Optional[int] = None) -> None:
+        """Forget the claw state of one slot, or of all slots."""
+        if slot is None:
+            self._is_claw[:] = False
+        else:
+            self._is_claw[slot] = False
 
     def get_debug_info(self) -> Dict[str, Any]:
         """Returns debug information from the last detection."""
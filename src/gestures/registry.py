@@ -0,0 +1,246 @@
+"""Declarative gesture rules compiled into one vectorized evaluator."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.gestures.claw_detector import HYSTERESIS_FINGER_REDUCTION, HYSTERESIS_SPREAD_MULTIPLIER
+from src.gestures.features import HandFeatures
+from src.utils.config import GestureConfig
+
+# Scalar per-hand feature columns that rules can reference
+FEATURE_NAMES = [
+    'fingertip_spread',      # Mean distance between non-thumb fingertip pairs
+    'palm_distance_1',       # k-th smallest fingertip-to-palm distance, so
+    'palm_distance_2',       # "at least k fingers close to the palm" is
+    'palm_distance_3',       # palm_distance_k < threshold
+    'palm_distance_4',
+    'thumb_index_distance',
+    'thumb_middle_distance',
+    'curl_thumb',
+    'curl_index',
+    'curl_middle',
+    'curl_ring',
+    'curl_pinky',
+    'curl_mean',             # Mean curl of the four non-thumb fingers
+    'pitch',
+    'palm_facing',           # Palm normal z component (towards/away from camera)
+]
+FEATURE_INDEX = {name: idx for idx, name in enumerate(FEATURE_NAMES)}
+
+# Comparison operators
+LESS = '<'
+GREATER = '>'
+
+
+@dataclass
+class Condition:
+    """
+    One threshold test with hysteresis.
+
+    While the gesture is inactive, `feature op enter` must hold to activate
+    it; while active, `exit_feature op exit` must hold to keep it active.
+    """
+    feature: str
+    op: str
+    enter: float
+    exit: Optional[float] = None          # Defaults to enter (no hysteresis)
+    exit_feature: Optional[str] = None    # Defaults to feature
+
+
+@dataclass
+class GestureRule:
+    """A named gesture: active when all of its conditions hold."""
+    name: str
+    conditions: List[Condition] = field(default_factory=list)
+
+
+# HandFeatures field each column is derived from
+COLUMN_FIELDS = {
+    'fingertip_spread': 'fingertip_spread',
+    'palm_distance_1': 'palm_distances',
+    'palm_distance_2': 'palm_distances',
+    'palm_distance_3': 'palm_distances',
+    'palm_distance_4': 'palm_distances',
+    'thumb_index_distance': 'thumb_distances',
+    'thumb_middle_distance': 'thumb_distances',
+    'curl_thumb': 'curl',
+    'curl_index': 'curl',
+    'curl_middle': 'curl',
+    'curl_ring': 'curl',
+    'curl_pinky': 'curl',
+    'curl_mean': 'curl',
+    'pitch': 'pitch',
+    'palm_facing': 'palm_normal',
+}
+
+
+def _column(features: HandFeatures, name: str) -> np.ndarray:
+    """One FEATURE_NAMES column for every hand."""
+    if name == 'fingertip_spread':
+        return features.fingertip_spread
+    if name.startswith('palm_distance_'):
+        rank = int(name[len('palm_distance_'):]) - 1
+        return np.partition(features.palm_distances, rank, axis=1)[:, rank]
+    if name == 'thumb_index_distance':
+        return features.thumb_distances[:, 0]
+    if name == 'thumb_middle_distance':
+        return features.thumb_distances[:, 1]
+    if name == 'curl_mean':
+        return features.curl[:, 1:].mean(axis=1)
+    if name.startswith('curl_'):
+        return features.curl[:, FEATURE_INDEX[name] - FEATURE_INDEX['curl_thumb']]
+    if name == 'pitch':
+        return features.pitch
+    if name == 'palm_facing':
+        return features.palm_normal[:, 2]
+    raise ValueError(f"Unknown gesture feature: {name}")
+
+
+def feature_matrix(features: HandFeatures, columns: Sequence[str] = FEATURE_NAMES) -> np.ndarray:
+    """
+    Flatten a feature table into one (n_hands, len(columns)) matrix.
+
+    Args:
+        features: Feature table holding every field the columns read
+        columns: FEATURE_NAMES entries, in matrix column order
+    """
+    return np.column_stack([
+        _column(features, name) for name in columns
+    ]).astype(np.float32, copy=False)
+
+
+class CompiledGestureEvaluator:
+    """
+    Evaluates every registered gesture for every hand in a single pass.
+
+    All conditions of all rules are flattened into parallel arrays at
+    compile time, so evaluation is a fixed number of array operations
+    regardless of how many gestures are registered.
+    """
+
+    def __init__(self, rules: List[GestureRule]):
+        for rule in rules:
+            if not rule.conditions:
+                raise ValueError(f"Gesture '{rule.name}' has no conditions")
+
+        self.names = [rule.name for rule in rules]
+        self.index: Dict[str, int] = {name: idx for idx, name in enumerate(self.names)}
+
+        conditions = [(g, c) for g, rule in enumerate(rules) for c in rule.conditions]
+        referenced = set()
+        for _, c in conditions:
+            referenced.update((self._feature_index(c.feature),
+                               self._feature_index(c.exit_feature or c.feature)))
+        # Only the columns the rules read are built, in FEATURE_NAMES order
+        self.columns = [FEATURE_NAMES[idx] for idx in sorted(referenced)]
+        self.fields = frozenset(COLUMN_FIELDS[name] for name in self.columns)
+        column = {name: idx for idx, name in enumerate(self.columns)}
+
+        self._owner = np.array([g for g, _ in conditions], dtype=np.intp)
+        self._enter_feature = np.array([column[c.feature] for _, c in conditions], dtype=np.intp)
+        self._exit_feature = np.array(
+            [column[c.exit_feature or c.feature] for _, c in conditions], dtype=np.intp)
+        self._enter = np.array([c.enter for _, c in conditions], dtype=np.float32)
+        self._exit = np.array(
+            [c.enter if c.exit is None else c.exit for _, c in conditions], dtype=np.float32)
+        self._sign = np.array([self._op_sign(c.op) for _, c in conditions], dtype=np.float32)
+        # Conditions are grouped by rule; reduceat ANDs each group
+        self._starts = np.searchsorted(self._owner, np.arange(len(rules)))
+
+    @staticmethod
+    def _feature_index(name: str) -> int:
+        if name not in FEATURE_INDEX:
+            raise ValueError(f"Unknown gesture feature: {name}")
+        return FEATURE_INDEX[name]
+
+    @staticmethod
+    def _op_sign(op: str) -> float:
+        if op == LESS:
+            return 1.0
+        if op == GREATER:
+            return -1.0
+        raise ValueError(f"Unknown comparison operator: {op}")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def feature_matrix(self, features: HandFeatures) -> np.ndarray:
+        """Matrix of the columns the rules read, for evaluate()."""
+        return feature_matrix(features, self.columns)
+
+    def initial_state(self, num_hands: int) -> np.ndarray:
+        """All gestures inactive for num_hands hands."""
+        return np.zeros((num_hands, len(self.names)), dtype=bool)
+
+    def evaluate(self, matrix: np.ndarray, previous: np.ndarray) -> np.ndarray:
+        """
+        Evaluate all gestures for all hands.
+
+        Args:
+            matrix: (n_hands, len(columns)) from self.feature_matrix()
+            previous: (n_hands, n_gestures) active flags from the last frame
+
+        Returns:
+            (n_hands, n_gestures) boolean array of active gestures
+        """
+        if matrix.shape[0] == 0:
+            return self.initial_state(0)
+
+        was_active = previous[:, self._owner]
+        values = np.where(was_active, matrix[:, self._exit_feature], matrix[:, self._enter_feature])
+        thresholds = np.where(was_active, self._exit, self._enter)
+        passed = self._sign * (values - thresholds) < 0
+        return np.logical_and.reduceat(passed, self._starts, axis=1)
+
+
+class GestureRegistry:
+    """Collects gesture rules and compiles them into an evaluator."""
+
+    def __init__(self):
+        self._rules: Dict[str, GestureRule] = {}
+
+    def register(self, rule: GestureRule) -> None:
+        """Add or replace a gesture rule."""
+        self._rules[rule.name] = rule
+
+    @property
+    def names(self) -> List[str]:
+        """Registered gesture names in registration order."""
+        return list(self._rules)
+
+    def compile(self) -> CompiledGestureEvaluator:
+        """Build the vectorized evaluator for all registered rules."""
+        return CompiledGestureEvaluator(list(self._rules.values()))
+
+
+def claw_rule(config: GestureConfig) -> GestureRule:
+    """Claw gesture: fingertips clustered and close to the palm (see ClawDetector)."""
+    return GestureRule('claw', [
+        Condition('fingertip_spread', LESS, config.max_fingertip_spread,
+                  exit=config.max_fingertip_spread * HYSTERESIS_SPREAD_MULTIPLIER),
+        Condition(f'palm_distance_{config.min_fingers_close}', LESS, config.max_palm_distance,
+                  exit_feature=f'palm_distance_'
+                               f'{max(2, config.min_fingers_close - HYSTERESIS_FINGER_REDUCTION)}'),
+    ])
+
+
+def build_default_registry(config: GestureConfig) -> GestureRegistry:
+    """Registry with the built-in claw, pinch, open palm and fist gestures."""
+    registry = GestureRegistry()
+    registry.register(claw_rule(config))
+    registry.register(GestureRule('pinch', [
+        Condition('thumb_index_distance', LESS, config.pinch_distance,
+                  exit=config.pinch_distance * HYSTERESIS_SPREAD_MULTIPLIER),
+    ]))
+    registry.register(GestureRule('open_palm', [
+        Condition('curl_mean', LESS, config.open_palm_max_curl,
+                  exit=config.open_palm_max_curl * HYSTERESIS_SPREAD_MULTIPLIER),
+        Condition('fingertip_spread', GREATER, config.max_fingertip_spread),
+    ]))
+    registry.register(GestureRule('fist', [
+        Condition('curl_mean', GREATER, config.fist_min_curl,
+                  exit=config.fist_min_curl / HYSTERESIS_SPREAD_MULTIPLIER),
+    ]))
+    return registry
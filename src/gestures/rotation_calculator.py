@@ -1,8 +1,10 @@
 """Palm rotation calculation with angle unwrapping."""
 
+from typing import Optional
+
 import numpy as np
 from src.core.hand_tracker import Hand
-from src.utils.geometry import landmark_to_array
+from src.gestures.features import HandFeatures
 
 
 class RotationCalculator:
@@ -13,33 +15,51 @@ class RotationCalculator:
     MIDDLE_MCP = 9
     PINKY_MCP = 17
 
-    def __init__(self):
-        self._accumulated_angle = 0.0
-        self._last_raw_angle = None
-        self._baseline_angle = None
+    def __init__(self, num_slots: int = 1):
+        """
+        Args:
+            num_slots: Independent hands tracked (see HandIdTracker)
+        """
+        self._accumulated_angle = np.zeros(num_slots)
+        self._last_raw_angle = np.full(num_slots, np.nan)
+        self._has_baseline = np.zeros(num_slots, dtype=bool)
 
-    def calculate_roll(self, hand: Hand) -> float:
+    def calculate_roll(self, hand: Hand, slot: int = 0) -> float:
         """
         Calculate palm roll angle with unwrapping to handle boundary crossing.
 
         Returns continuous angle that can exceed ±180°.
         """
-        landmarks = hand.landmarks
+        points = hand.points
 
         # Use the vector across the palm for more stable tracking
-        index_mcp = landmark_to_array(landmarks[self.INDEX_MCP])
-        pinky_mcp = landmark_to_array(landmarks[self.PINKY_MCP])
-        palm_vector = index_mcp - pinky_mcp
+        palm_vector = points[self.INDEX_MCP] - points[self.PINKY_MCP]
 
         # Calculate angle in the image plane
-        raw_angle = np.arctan2(palm_vector[1], palm_vector[0]) * 180.0 / np.pi
+        raw_angle = float(np.degrees(np.arctan2(palm_vector[1], palm_vector[0])))
+        return self.update(raw_angle, hand.handedness, slot)
+
+    def calculate_roll_from_features(self, features: HandFeatures, index: int,
+                                     handedness: str, slot: int = 0) -> float:
+        """Same as calculate_roll, reading the raw angle from a feature table."""
+        return self.update(float(features.roll[index]), handedness, slot)
+
+    def update(self, raw_angle: float, handedness: str, slot: int = 0) -> float:
+        """
+        Unwrap a raw palm angle into the accumulated rotation.
+
+        Args:
+            raw_angle: In-plane palm angle in degrees (-180 to 180)
+            handedness: "Left" or "Right"
+            slot: Hand slot whose rotation state to use
+        """
 
         # First detection establishes the baseline as zero
-        if self._baseline_angle is None:
-            self._baseline_angle = raw_angle
-            self._accumulated_angle = 0.0
-        elif self._last_raw_angle is not None:
-            diff = raw_angle - self._last_raw_angle
+        if not self._has_baseline[slot]:
+            self._has_baseline[slot] = True
+            self._accumulated_angle[slot] = 0.0
+        elif not np.isnan(self._last_raw_angle[slot]):
+            diff = raw_angle - self._last_raw_angle[slot]
 
             # Handle -180/+180 degree boundary crossing
             if diff > 180:
@@ -47,15 +67,18 @@ class RotationCalculator:
             elif diff < -180:
                 diff += 360
 
-            self._accumulated_angle += diff
+            self._accumulated_angle[slot] += diff
 
-        self._last_raw_angle = raw_angle
+        self._last_raw_angle[slot] = raw_angle
+        accumulated = float(self._accumulated_angle[slot])
 
         # Mirror left hand to match right hand rotation direction
-        return -self._accumulated_angle if hand.handedness == 'Left' else self._accumulated_angle
+        return -accumulated if handedness == 'Left' else accumulated
 
-    def reset(self):
-        """Reset all angle tracking state."""
-        self._accumulated_angle = 0.0
-        self._last_raw_angle = None
-        self._baseline_angle = None
+    def reset(self, slot: Optional[int] = None):
+        """Reset angle tracking state of one slot, or of all slots."""
+        if slot is None:
+            slot = slice(None)
+        self._accumulated_angle[slot] = 0.0
+        self._last_raw_angle[slot] = np.nan
+        self._has_baseline[slot] = False
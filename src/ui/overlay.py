@@ -67,8 +67,8 @@ class GestureIndicator:
     def render(self, frame: np.ndarray, hand: Hand, is_claw: bool,
                rotation_angle: float = None):
         """Draw claw status and rotation angle near the wrist."""
-        wrist_x = int(hand.landmarks[0].x * frame.shape[1])
-        wrist_y = int(hand.landmarks[0].y * frame.shape[0])
+        wrist_x = int(hand.points[0, 0] * frame.shape[1])
+        wrist_y = int(hand.points[0, 1] * frame.shape[0])
 
         status_text = "CLAW" if is_claw else "---"
         status_color = (0, 255, 0) if is_claw else (100, 100, 100)
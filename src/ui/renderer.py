@@ -43,16 +43,13 @@ class Renderer:
         for hand in hands:
             color = (0, 255, 0) if hand.handedness == 'Left' else (0, 0, 255)
 
-            for landmark in hand.landmarks:
-                x = int(landmark.x * frame.shape[1])
-                y = int(landmark.y * frame.shape[0])
+            # Scale all normalized points to pixels in one operation
+            pixels = (hand.points[:, :2] * (frame.shape[1], frame.shape[0])).astype(np.int32)
+            for x, y in pixels.tolist():
                 cv2.circle(frame, (x, y), 5, color, -1)
 
-            wrist = hand.landmarks[0]
-            label_pos = (
-                int(wrist.x * frame.shape[1]),
-                int(wrist.y * frame.shape[0]) - 20
-            )
+            wrist_x, wrist_y = pixels[0].tolist()
+            label_pos = (wrist_x, wrist_y - 20)
             cv2.putText(
                 frame,
                 f"{hand.handedness} Hand",
@@ -0,0 +1,64 @@
+"""Injectable time sources."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    """Monotonic time source shared by the pipeline components."""
+
+    @abstractmethod
+    def now(self) -> float:
+        """Current time in seconds (arbitrary epoch, never goes backwards)."""
+        pass
+
+    def now_ms(self) -> int:
+        """Current time in whole milliseconds."""
+        return int(self.now() * 1000)
+
+    def sleep(self, seconds: float) -> None:
+        """Block for `seconds` of this clock's time."""
+        time.sleep(seconds)
+
+
+class MonotonicClock(Clock):
+    """
+    The system monotonic clock (CLOCK_MONOTONIC on Linux).
+
+    Unaffected by NTP steps or manual clock changes, and the same clock
+    V4L2 uses for buffer timestamps.
+    """
+
+    def now(self) -> float:
+        return time.monotonic()
+
+
+class FakeClock(Clock):
+    """Manually advanced clock for tests and replays."""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        with self._lock:
+            return self._now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance instead of blocking."""
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward."""
+        if seconds < 0:
+            raise ValueError("FakeClock cannot go backwards")
+        with self._lock:
+            self._now += seconds
+
+    def set(self, seconds: float) -> None:
+        """Jump to an absolute time, which must not be in the past."""
+        with self._lock:
+            if seconds < self._now:
+                raise ValueError("FakeClock cannot go backwards")
+            self._now = seconds
@@ -1,6 +1,7 @@
 """Configuration dataclasses for the application."""
 
 from dataclasses import dataclass, field
+from typing import List, Optional
 
 
 @dataclass
@@ -8,6 +9,61 @@ class CameraConfig:
     """Camera configuration."""
     index: int = 2
     flip_horizontal: bool = True
+    # With flip_horizontal: mirror landmark x instead of flipping the pixels
+    # the model sees ("pixels" or "landmarks")
+    mirror_mode: str = "pixels"
+    threaded: bool = True   # Grab frames on a dedicated thread (latest-frame ring)
+    ring_size: int = 3      # Preallocated frame slots for threaded capture
+    backend_timestamps: bool = True  # Use driver buffer timestamps when on the monotonic clock
+    # Video file or image directory to read instead of the camera
+    input_path: Optional[str] = None
+    paced: bool = True                 # Play file input at its frame rate
+    decode_ahead: int = 8              # Frames decoded ahead for file input
+    file_fps: Optional[float] = None   # Image sequence rate (default 30) or file override
+
+    # Device negotiation; None keeps the driver default
+    backend: str = "v4l2"              # "v4l2" or "any" (OpenCV picks)
+    width: Optional[int] = 640
+    height: Optional[int] = 480
+    fps: Optional[float] = 30.0
+    # Pixel format; None leaves it to the driver or the probe (which prefers
+    # uncompressed). "MJPG" reaches higher rates on USB 2 at a per-frame decode cost
+    fourcc: Optional[str] = None
+    buffer_size: Optional[int] = 1     # Driver-side frames queued; 1 keeps latency lowest
+    # List the supported modes at startup and take the lowest-latency one
+    # with at least width x height
+    probe_modes: bool = False
+
+
+@dataclass
+class TrackerConfig:
+    """Hand landmarker configuration."""
+    model_path: str = 'hand_landmarker.task'
+    num_hands: int = 2
+    running_mode: str = "video"  # "video" (synchronous) or "live_stream" (async)
+    # Downscale frames to this width for inference (aspect kept); the preview
+    # stays at camera resolution. None infers on the full frame.
+    inference_width: Optional[int] = None
+    # Run the landmarker in this many worker processes (frames go through
+    # shared memory); 0 runs it in-process
+    inference_workers: int = 0
+
+    # Region of interest: infer on a crop around the previous frame's hands
+    roi_enabled: bool = False
+    roi_size: int = 256           # Crop is resized to roi_size x roi_size
+    roi_padding: float = 0.5      # Padding around the hands' bounding box
+    roi_refresh_frames: int = 30  # Full-frame detection at least this often
+
+    # Adaptive inference: full rate while a gesture is active, slower otherwise
+    adaptive_inference: bool = False
+    idle_interval_ms: int = 250       # No hands in view
+    tracking_interval_ms: int = 50    # Hands in view, no gesture
+    max_extrapolation_ms: int = 100   # Landmark prediction horizon on skipped frames
+
+    # Stable hand IDs: each tracked hand owns a slot of gesture/rotation state
+    hand_slots: int = 4               # >= num_hands; spares cover brief dropouts
+    max_hand_match_distance: float = 0.25  # Wrist movement per frame still matched
+    max_missed_frames: int = 3        # Frames a slot is held for a vanished hand
 
 
 @dataclass
@@ -18,29 +74,107 @@ class GestureConfig:
     max_palm_distance: float = 0.20     # Max distance from fingertips to palm
     min_fingers_close: int = 3          # Min fingers that must be close to palm
 
+    # Other registered gestures
+    pinch_distance: float = 0.05      # Max thumb-index tip distance
+    open_palm_max_curl: float = 0.2   # Max mean finger curl (0 = straight)
+    fist_min_curl: float = 0.6        # Min mean finger curl
+
+    # Landmark smoothing before detection: "none", "ema", "one_euro" or "kalman"
+    landmark_filter: str = "none"
+
     # Rotation mapping
     rotation_deadzone: float = 5.0  # degrees
     rotation_range: float = 180.0    # degrees (full range)
 
 
+@dataclass
+class FilterConfig:
+    """Parameters for the adaptive smoothing filters (see src/filters/smoothing.py)."""
+    ema_alpha: float = 0.3
+    one_euro_min_cutoff: float = 1.0       # Hz at rest; lower = less jitter
+    one_euro_beta: float = 0.007           # Speed coefficient; higher = less lag
+    one_euro_d_cutoff: float = 1.0         # Hz for the derivative estimate
+    kalman_process_noise: float = 1e4      # Acceleration variance
+    kalman_measurement_noise: float = 1.0  # Measurement variance
+
+
+def landmark_filter_defaults() -> FilterConfig:
+    """Filter parameters scaled for normalized landmark coordinates."""
+    return FilterConfig(
+        ema_alpha=0.5,
+        one_euro_min_cutoff=1.0,
+        one_euro_beta=20.0,
+        kalman_process_noise=10.0,
+        kalman_measurement_noise=1e-5
+    )
+
+
+@dataclass
+class BindingConfig:
+    """Maps a hand's gesture and rotation axis to a controller."""
+    handedness: str              # "Left" or "Right"
+    gesture: str                 # Registered gesture name, e.g. "claw"
+    axis: str                    # "roll" or "pitch"
+    controller: str              # Controller name, e.g. "volume"
+    min_level: int = 0
+    max_level: int = 100
+    gain: float = 1.0            # Percent per degree of rotation
+    filter: str = "ema"          # Axis smoothing: "ema", "one_euro" or "kalman"
+    smoothing_alpha: float = 0.3  # EMA smoothing of the axis
+
+
+def default_bindings() -> List[BindingConfig]:
+    """Right claw + roll controls volume, left claw + roll controls brightness."""
+    return [
+        BindingConfig('Right', 'claw', 'roll', 'volume', 0, 100),
+        BindingConfig('Left', 'claw', 'roll', 'brightness', 5, 100),  # Never go completely dark
+    ]
+
+
 @dataclass
 class ControlConfig:
     """Control system configuration."""
     update_interval_ms: int = 150  # Rate limit
-    smoothing_alpha: float = 0.3    # EMA smoothing
+    bindings: List[BindingConfig] = field(default_factory=default_bindings)
+    axis_filter: FilterConfig = field(default_factory=FilterConfig)  # Rotation in degrees
+    level_poll_interval_ms: int = 500  # Level refresh when no change events exist
 
     # Volume
-    volume_min: int = 0
-    volume_max: int = 100
+    volume_backend: str = "auto"  # "native" (pulsectl), "pactl" or "auto"
 
     # Brightness
-    brightness_min: int = 5   # Never go completely dark
-    brightness_max: int = 100
+    brightness_backend: str = "auto"  # "sysfs", "brightnessctl" or "auto"
+
+
+@dataclass
+class UIConfig:
+    """Preview window configuration."""
+    headless: bool = False  # Skip rendering and the OpenCV window entirely
+
+
+@dataclass
+class PipelineConfig:
+    """Frame pipeline configuration."""
+    queue_size: int = 2                # Frames buffered between stages
+    backpressure: str = "drop_oldest"  # "drop_oldest" or "block"
+
+
+@dataclass
+class MetricsConfig:
+    """Latency instrumentation and stats reporting."""
+    enabled: bool = True
+    log_interval_s: float = 10.0     # Periodic stats log line; 0 disables
+    socket_path: Optional[str] = None  # Unix socket serving JSON snapshots
 
 
 @dataclass
 class AppConfig:
     """Master application configuration."""
     camera: CameraConfig = field(default_factory=CameraConfig)
+    tracker: TrackerConfig = field(default_factory=TrackerConfig)
     gesture: GestureConfig = field(default_factory=GestureConfig)
+    landmark_filter: FilterConfig = field(default_factory=landmark_filter_defaults)
     control: ControlConfig = field(default_factory=ControlConfig)
+    pipeline: PipelineConfig = field(default_factory=PipelineConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    ui: UIConfig = field(default_factory=UIConfig)
@@ -3,17 +3,17 @@
 import numpy as np
 
 
-def distance_3d(p1, p2) -> float:
+def distance_3d(p1: np.ndarray, p2: np.ndarray) -> float:
     """
-    Calculate 3D Euclidean distance between two landmarks.
+    Calculate 3D Euclidean distance between two points.
 
     Args:
-        p1, p2: Landmarks with x, y, z attributes
+        p1, p2: Points as [x, y, z] arrays
 
     Returns:
         Euclidean distance
     """
-    return np.sqrt((p2.x - p1.x)**2 + (p2.y - p1.y)**2 + (p2.z - p1.z)**2)
+    return float(np.linalg.norm(p2 - p1))
 
 
 def landmark_to_array(landmark) -> np.ndarray:
@@ -29,6 +29,19 @@ def landmark_to_array(landmark) -> np.ndarray:
     return np.array([landmark.x, landmark.y, landmark.z])
 
 
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """
+    Convert a list of MediaPipe landmarks to a compact array.
+
+    Args:
+        landmarks: Sequence of MediaPipe landmark objects
+
+    Returns:
+        (N, 3) float32 array of [x, y, z] rows
+    """
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+
+
 def cross_product(v1: np.ndarray, v2: np.ndarray) -> np.ndarray:
     """
     Calculate cross product of two 3D vectors.
@@ -0,0 +1,90 @@
+"""Minimal inotify file watcher (Linux only, via libc)."""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# inotify flags from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+EVENT_BUFFER_SIZE = 4096
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError) as e:
+        logger.debug(f"inotify not available: {e}")
+        return None
+
+
+_libc = _load_libc()
+
+
+class FileWatcher:
+    """Waits for modifications of one or more files using inotify."""
+
+    def __init__(self, paths: List[str], mask: int = IN_MODIFY) -> None:
+        """
+        Start watching files.
+
+        Args:
+            paths: Files to watch
+            mask: inotify event mask
+
+        Raises:
+            OSError: If inotify is unavailable or a watch cannot be added
+        """
+        if _libc is None:
+            raise OSError("inotify is not available on this system")
+
+        self._fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        for path in paths:
+            wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(errno, os.strerror(errno), path)
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait for an event on any watched file.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if at least one event arrived, False on timeout
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+
+        # Drain everything queued so one burst of writes counts as one change
+        try:
+            while os.read(self._fd, EVENT_BUFFER_SIZE):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        """Stop watching and release the inotify descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
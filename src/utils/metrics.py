@@ -0,0 +1,316 @@
+"""Per-stage latency histograms, rolling frame rates and a stats reporter."""
+
+import json
+import logging
+import os
+import select
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.utils.clock import Clock, MonotonicClock
+
+logger = logging.getLogger(__name__)
+
+# Instrumented stage names
+STAGE_CAPTURE = "capture"
+STAGE_PREPARE = "prepare"  # Colour conversion and mirroring
+STAGE_INFERENCE = "inference"
+STAGE_FEATURES = "features"
+STAGE_GESTURES = "gestures"
+STAGE_CONTROL = "control"
+STAGE_RENDER = "render"
+STAGE_END_TO_END = "end_to_end"  # Frame timestamp to display/drain
+
+# Rolling rates
+RATE_CAPTURE = "capture"
+RATE_OUTPUT = "output"
+
+# Histogram layout: log-spaced buckets, fixed memory regardless of run time
+HISTOGRAM_MIN_S = 1e-5        # 10 us
+HISTOGRAM_MAX_S = 10.0
+HISTOGRAM_BUCKETS_PER_DECADE = 20  # ~12% relative resolution
+
+RATE_WINDOW = 64  # Timestamps kept per rolling rate
+
+PERCENTILES = (50, 95, 99)
+DEFAULT_LOG_INTERVAL_S = 10.0
+STOP_POLL_INTERVAL_S = 0.5
+THREAD_JOIN_TIMEOUT_S = 2.0
+
+
+class LatencyHistogram:
+    """
+    Fixed-size latency histogram with log-spaced buckets.
+
+    Percentiles are reported as the upper edge of the bucket they fall in
+    (capped at the largest sample), so they are never optimistic and at
+    most one bucket width pessimistic.
+    """
+
+    def __init__(self):
+        decades = np.log10(HISTOGRAM_MAX_S / HISTOGRAM_MIN_S)
+        num_edges = int(round(decades * HISTOGRAM_BUCKETS_PER_DECADE)) + 1
+        self._edges = np.geomspace(HISTOGRAM_MIN_S, HISTOGRAM_MAX_S, num_edges)
+        # Bucket i holds values <= edges[i]; the last bucket is overflow
+        self._counts = np.zeros(num_edges + 1, dtype=np.int64)
+        self._total_s = 0.0
+        self._max_s = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add one duration."""
+        bucket = int(np.searchsorted(self._edges, seconds))
+        with self._lock:
+            self._counts[bucket] += 1
+            self._total_s += seconds
+            if seconds > self._max_s:
+                self._max_s = seconds
+
+    def counts(self) -> np.ndarray:
+        """Copy of the bucket counts (for windowed percentiles)."""
+        with self._lock:
+            return self._counts.copy()
+
+    def percentile(self, q: float, counts: Optional[np.ndarray] = None) -> float:
+        """
+        Estimate a percentile in seconds.
+
+        Args:
+            q: Percentile in [0, 100]
+            counts: Bucket counts to use instead of the full history
+
+        Returns:
+            Upper bucket edge at the percentile, or 0.0 with no samples
+        """
+        if counts is None:
+            counts = self.counts()
+        total = int(counts.sum())
+        if total == 0:
+            return 0.0
+
+        rank = max(1, int(np.ceil(total * q / 100.0)))
+        bucket = int(np.searchsorted(np.cumsum(counts), rank))
+        if bucket >= len(self._edges):
+            return self._max_s
+        return min(float(self._edges[bucket]), self._max_s)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, max and PERCENTILES over the full history, in milliseconds."""
+        with self._lock:
+            counts = self._counts.copy()
+            total_s = self._total_s
+            max_s = self._max_s
+
+        count = int(counts.sum())
+        result = {
+            'count': count,
+            'mean_ms': total_s / count * 1000 if count else 0.0,
+            'max_ms': max_s * 1000,
+        }
+        for q in PERCENTILES:
+            result[f'p{q}_ms'] = self.percentile(q, counts) * 1000
+        return result
+
+
+class RollingRate:
+    """Event rate over the last RATE_WINDOW events."""
+
+    def __init__(self, window: int = RATE_WINDOW):
+        self._stamps = np.zeros(window, dtype=np.float64)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def tick(self, timestamp: float) -> None:
+        """Record one event at `timestamp` seconds."""
+        with self._lock:
+            self._stamps[self._count % len(self._stamps)] = timestamp
+            self._count += 1
+
+    @property
+    def rate(self) -> float:
+        """Events per second, or 0.0 until two events have been seen."""
+        with self._lock:
+            n = min(self._count, len(self._stamps))
+            if n < 2:
+                return 0.0
+            newest = self._stamps[(self._count - 1) % len(self._stamps)]
+            oldest = self._stamps[(self._count - n) % len(self._stamps)]
+        span = newest - oldest
+        return (n - 1) / span if span > 0 else 0.0
+
+
+class PipelineMetrics:
+    """
+    Registry of per-stage latency histograms and rolling rates.
+
+    A disabled instance accepts every call and records nothing, so stages
+    can be instrumented unconditionally.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, enabled: bool = True):
+        self.clock = clock or MonotonicClock()
+        self.enabled = enabled
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._rates: Dict[str, RollingRate] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Histogram for a stage, created on first use."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one duration for a stage."""
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Time the enclosed block into the named histogram."""
+        if not self.enabled:
+            yield
+            return
+        start = self.clock.now()
+        try:
+            yield
+        finally:
+            self.record(name, self.clock.now() - start)
+
+    def tick(self, name: str, timestamp: Optional[float] = None) -> None:
+        """Count one event (e.g. a frame) for the named rolling rate."""
+        if not self.enabled:
+            return
+        rate = self._rates.get(name)
+        if rate is None:
+            with self._lock:
+                rate = self._rates.setdefault(name, RollingRate())
+        rate.tick(self.clock.now() if timestamp is None else timestamp)
+
+    def stage_names(self) -> List[str]:
+        """Instrumented stages seen so far."""
+        with self._lock:
+            return list(self._histograms)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Cumulative summary of every histogram plus current rates."""
+        with self._lock:
+            histograms = dict(self._histograms)
+            rates = dict(self._rates)
+        return {
+            'latency': {name: hist.summary() for name, hist in histograms.items()},
+            'fps': {name: rate.rate for name, rate in rates.items()},
+        }
+
+
+class StatsReporter:
+    """
+    Periodically logs windowed latency percentiles and serves snapshots.
+
+    The log line covers samples since the previous line. If a socket path
+    is given, every client connecting to that Unix socket receives the
+    cumulative snapshot as one JSON line.
+    """
+
+    def __init__(self, metrics: PipelineMetrics,
+                 log_interval_s: float = DEFAULT_LOG_INTERVAL_S,
+                 socket_path: Optional[str] = None):
+        """
+        Args:
+            metrics: Metrics to report
+            log_interval_s: Seconds between log lines (0 disables logging)
+            socket_path: Unix socket to serve JSON snapshots on, if any
+        """
+        self._metrics = metrics
+        self._log_interval_s = log_interval_s
+        self._socket_path = socket_path
+        self._server: Optional[socket.socket] = None
+        self._previous: Dict[str, np.ndarray] = {}
+        self._previous_lock = threading.Lock()  # format_line() runs on two threads
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Open the socket (if configured) and start the reporter thread."""
+        if self._socket_path:
+            try:
+                if os.path.exists(self._socket_path):
+                    os.unlink(self._socket_path)
+                server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                server.bind(self._socket_path)
+                server.listen()
+                server.setblocking(False)
+                self._server = server
+                logger.info(f"Stats available on {self._socket_path}")
+            except OSError as e:
+                logger.warning(f"Stats socket unavailable at {self._socket_path}: {e}")
+
+        self._thread = threading.Thread(target=self._run, name="stats", daemon=True)
+        self._thread.start()
+
+    def format_line(self) -> str:
+        """One-line summary of the samples recorded since the last call."""
+        parts = []
+        with self._previous_lock:
+            for name in self._metrics.stage_names():
+                histogram = self._metrics.histogram(name)
+                counts = histogram.counts()
+                window = counts - self._previous.get(name, 0)
+                self._previous[name] = counts
+                if not window.any():
+                    continue
+                p50, p95, p99 = (histogram.percentile(q, window) * 1000 for q in PERCENTILES)
+                parts.append(f"{name} {p50:.1f}/{p95:.1f}/{p99:.1f}")
+
+        fps = self._metrics.snapshot()['fps']
+        rates = ", ".join(f"{name} {value:.1f}" for name, value in fps.items())
+        return f"Latency p50/p95/p99 ms: {' | '.join(parts) or 'no samples'}; FPS: {rates or 'n/a'}"
+
+    def _run(self) -> None:
+        next_log = self._metrics.clock.now() + self._log_interval_s
+        while not self._stop.is_set():
+            timeout = STOP_POLL_INTERVAL_S
+            if self._log_interval_s > 0:
+                timeout = min(timeout, max(0.0, next_log - self._metrics.clock.now()))
+
+            if self._server is not None:
+                readable, _, _ = select.select([self._server], [], [], timeout)
+                if readable:
+                    self._serve_client()
+            else:
+                self._stop.wait(timeout)
+
+            if self._log_interval_s > 0 and self._metrics.clock.now() >= next_log:
+                logger.info(self.format_line())
+                next_log += self._log_interval_s
+
+    def _serve_client(self) -> None:
+        try:
+            client, _ = self._server.accept()
+        except BlockingIOError:
+            return
+        with client:
+            try:
+                client.sendall((json.dumps(self._metrics.snapshot()) + "\n").encode())
+            except OSError as e:
+                logger.debug(f"Stats client went away: {e}")
+
+    def stop(self) -> None:
+        """Stop the reporter thread and remove the socket."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=THREAD_JOIN_TIMEOUT_S)
+            self._thread = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.unlink(self._socket_path)
+            except OSError:
+                pass